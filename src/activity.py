@@ -0,0 +1,129 @@
+import atexit
+import queue
+import threading
+from datetime import datetime, timezone
+from pymongo import InsertOne, UpdateOne
+from database import get_users_collection, get_activity_logs_collection, get_security_events_collection
+
+# Seconds between background flushes
+FLUSH_INTERVAL = 5
+
+# Queued writes that trigger an early flush
+FLUSH_BATCH_SIZE = 100
+
+# Writes held in memory before new events are dropped
+MAX_QUEUED_WRITES = 10000
+
+COLLECTION_GETTERS = {
+    "users": get_users_collection,
+    "activity_logs": get_activity_logs_collection,
+    "security_events": get_security_events_collection,
+}
+
+
+class ActivityBuffer:
+    """Bounded in-process queue of audit writes, flushed as unordered bulk writes"""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, batch_size=FLUSH_BATCH_SIZE,
+                 max_queued=MAX_QUEUED_WRITES):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def put(self, collection_name, operation):
+        """Queue a write; returns False if the buffer is full"""
+        try:
+            self._queue.put_nowait((collection_name, operation))
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self._ensure_started()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def pending(self):
+        """Number of writes waiting to be flushed"""
+        return self._queue.qsize()
+
+    def flush(self):
+        """Write everything queued so far, one bulk write per collection"""
+        with self._flush_lock:
+            batches = {}
+            while True:
+                try:
+                    collection_name, operation = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batches.setdefault(collection_name, []).append(operation)
+
+            written = 0
+            for collection_name, operations in batches.items():
+                try:
+                    collection = COLLECTION_GETTERS[collection_name]()
+                    if collection is None:
+                        self.dropped += len(operations)
+                        continue
+                    # Unordered, so one bad document does not hold up the rest
+                    collection.bulk_write(operations, ordered=False)
+                    written += len(operations)
+                except Exception:
+                    self.dropped += len(operations)
+            return written
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+# Shared by every session in the process
+activity_buffer = ActivityBuffer()
+atexit.register(activity_buffer.flush)
+
+
+def record_login(username, ip_address=None):
+    """Queue the last_login timestamp and a login activity entry"""
+    now = datetime.now(timezone.utc)
+    # $max keeps the newest timestamp even if unordered writes land out of order
+    activity_buffer.put("users", UpdateOne({"username": username}, {"$max": {"last_login": now}}))
+    log_activity(username, "login", ip_address=ip_address, timestamp=now)
+
+
+def log_activity(username, action, status="success", details=None, ip_address=None, timestamp=None):
+    """Queue an entry for the activity_logs collection"""
+    return activity_buffer.put("activity_logs", InsertOne({
+        "user_id": username,
+        "action": action,
+        "ip_address": ip_address,
+        "details": details or {},
+        "timestamp": timestamp or datetime.now(timezone.utc),
+        "status": status,
+    }))
+
+
+def log_security_event(username, event_type, severity="low", metadata=None):
+    """Queue an entry for the security_events collection"""
+    return activity_buffer.put("security_events", InsertOne({
+        "user_id": username,
+        "event_type": event_type,
+        "severity": severity,
+        "metadata": metadata or {},
+        "timestamp": datetime.now(timezone.utc),
+        "resolved": False,
+    }))
@@ -0,0 +1,47 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+MOVING_AVERAGE_WINDOW = 20
+PREDICTION_LOOKBACK_DAYS = 730
+PREDICTION_DAYS = 365
+
+# Trailing closes folded into data_version, so a re-quoted last bar also changes it
+VERSION_CHECK_BARS = 5
+
+
+def data_version(symbol, data):
+    """Identity of a price history: symbol, row count, last bar and a digest of its closes"""
+    # st.cache_data returns a fresh copy of the frame each run, so derived values key on this instead
+    if data is None or len(data) == 0:
+        return f"{symbol}:empty"
+    version = f"{symbol}:{len(data)}:{pd.Timestamp(data.index[-1]).isoformat()}"
+    if "Close" not in data:
+        return version
+
+    # A split or dividend back-adjustment rescales earlier closes but keeps the length and
+    # last date; the first and trailing closes catch it, as symbol_stats rebuilds on revisions
+    closes = data["Close"].to_numpy(dtype=float)
+    sample = np.concatenate([closes[:1], closes[-VERSION_CHECK_BARS:]])
+    return f"{version}:{hashlib.blake2b(sample.tobytes(), digest_size=8).hexdigest()}"
+
+
+def moving_average(data, window=MOVING_AVERAGE_WINDOW):
+    """Rolling mean of the close, or None when there are fewer bars than the window"""
+    if len(data) < window:
+        return None
+    return data['Close'].rolling(window=window).mean()
+
+
+def prediction_frame(closes, prediction, lookback_days=PREDICTION_LOOKBACK_DAYS):
+    """Recent closes followed by the regression's forecast, for the prediction chart"""
+    lookback_days = min(lookback_days, len(closes))
+    recent_data = closes.tail(lookback_days)
+    future_predictions = list(prediction['future_predictions'])
+    future_dates = pd.date_range(start=recent_data.index[-1] + pd.Timedelta(days=1),
+                                 periods=len(future_predictions), freq='D')
+
+    return pd.DataFrame({
+        'Historical Price': list(recent_data.values) + [None] * len(future_predictions),
+        'Predicted Trend': [None] * lookback_days + future_predictions
+    }, index=list(recent_data.index) + list(future_dates))
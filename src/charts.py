@@ -0,0 +1,130 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+
+# Points kept for a full-width chart; about one per horizontal pixel
+CHART_MAX_POINTS = 800
+
+# Points kept for charts in half-width columns
+NARROW_CHART_MAX_POINTS = 400
+
+# Bar size used for each history timeframe; None keeps daily bars
+TIMEFRAME_BAR_RULES = {
+    "All Time": "MS",
+    "Last 10 Years": "W-MON",
+    "Last 5 Years": "W-MON",
+    "Last 2 Years": None,
+}
+
+BAR_LABELS = {"MS": "Monthly", "W-MON": "Weekly", None: "Daily"}
+
+OHLCV_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+
+def lttb_indices(x, y, threshold):
+    """Positions chosen by Largest-Triangle-Three-Buckets for ``threshold`` points"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Interior points are split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < threshold - 1:
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's mean
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+
+    return indices
+
+
+def _x_values(index):
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    return np.arange(len(index), dtype=np.float64)
+
+
+def downsample(data, max_points=CHART_MAX_POINTS):
+    """Reduce a Series or DataFrame to roughly ``max_points`` rows for plotting"""
+    if data is None or len(data) <= max_points:
+        return data
+
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    x = _x_values(frame.index)
+    per_column = max(3, max_points // max(1, len(frame.columns)))
+
+    # Rows picked for any column are kept, plus each column's min and max
+    keep = set()
+    for column in frame.columns:
+        y = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(y))
+        if len(valid) == 0:
+            continue
+        chosen = valid[lttb_indices(x[valid], y[valid], per_column)]
+        keep.update(chosen.tolist())
+        keep.add(int(valid[np.argmin(y[valid])]))
+        keep.add(int(valid[np.argmax(y[valid])]))
+
+    return data.iloc[sorted(keep)]
+
+
+def resample_ohlcv(data, rule):
+    """Aggregate daily OHLCV bars into ``rule`` periods (e.g. "W-MON", "MS")"""
+    if rule is None or data is None or data.empty:
+        return data
+
+    aggregation = {column: how for column, how in OHLCV_AGGREGATION.items() if column in data.columns}
+    bars = data[list(aggregation)].resample(rule, label="left", closed="left").agg(aggregation)
+    # Periods without trading (e.g. a market closure week) produce empty rows
+    return bars.dropna(subset=[column for column in ("Open", "Close") if column in bars.columns])
+
+
+def candlestick_chart(bars, height=400):
+    """Altair candlestick: a high-low rule and an open-close bar per period"""
+    source = bars.reset_index()
+    date_column = source.columns[0]
+    source["Direction"] = np.where(source["Close"] >= source["Open"], "Up", "Down")
+
+    base = alt.Chart(source).encode(
+        x=alt.X(f"{date_column}:T", title=None),
+        color=alt.Color(
+            "Direction:N",
+            scale=alt.Scale(domain=["Up", "Down"], range=["#28a745", "#dc3545"]),
+            legend=None
+        ),
+        tooltip=[
+            alt.Tooltip(f"{date_column}:T", title="Date"),
+            alt.Tooltip("Open:Q", format="$.2f"),
+            alt.Tooltip("High:Q", format="$.2f"),
+            alt.Tooltip("Low:Q", format="$.2f"),
+            alt.Tooltip("Close:Q", format="$.2f"),
+        ],
+    )
+    wicks = base.mark_rule().encode(
+        y=alt.Y("Low:Q", title="Price", scale=alt.Scale(zero=False)),
+        y2="High:Q"
+    )
+    bodies = base.mark_bar().encode(y="Open:Q", y2="Close:Q")
+    return (wicks + bodies).properties(height=height)
@@ -1,4 +1,5 @@
 import os
+import threading
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 import streamlit as st
@@ -9,12 +10,81 @@ from pathlib import Path
 load_dotenv()
 
 
+def get_pool_sizes():
+    """Derive connection pool bounds from the expected number of concurrent sessions"""
+    try:
+        expected_sessions = int(os.getenv("EXPECTED_CONCURRENT_SESSIONS", "20"))
+    except ValueError:
+        expected_sessions = 20
+    expected_sessions = max(1, expected_sessions)
+
+    # A rerun rarely has more than two operations in flight per session
+    max_pool_size = max(10, expected_sessions * 2)
+    min_pool_size = min(max_pool_size, max(2, expected_sessions // 4))
+    return min_pool_size, max_pool_size
+
+
+class SharedConnection:
+    """Process-wide MongoClient together with its background warm-up state"""
+
+    def __init__(self, client):
+        self.client = client
+        self.ready = threading.Event()
+        self.last_error = None
+        self._warm_up_thread = None
+        self._lock = threading.Lock()
+
+    def start_warm_up(self, on_ready=None, retry_interval=5):
+        """Ping the cluster in a background thread until it answers"""
+        with self._lock:
+            if self._warm_up_thread is not None:
+                return
+            self._warm_up_thread = threading.Thread(
+                target=self._warm_up,
+                args=(on_ready, retry_interval),
+                name="mongo-warm-up",
+                daemon=True,
+            )
+            self._warm_up_thread.start()
+
+    def _warm_up(self, on_ready, retry_interval):
+        while not self.ready.is_set():
+            try:
+                # Blocks for up to serverSelectionTimeoutMS; the minPoolSize
+                # sockets are opened by the driver once a server is selected
+                self.client.admin.command("ping")
+                self.last_error = None
+                if on_ready is not None:
+                    on_ready()
+                self.ready.set()
+            except Exception as e:
+                self.last_error = str(e)
+                if self.ready.wait(retry_interval):
+                    break
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_connection(uri):
+    """Create the MongoClient shared by every session in this process"""
+    min_pool_size, max_pool_size = get_pool_sizes()
+    client = MongoClient(
+        uri,
+        serverSelectionTimeoutMS=30000,
+        connectTimeoutMS=20000,
+        socketTimeoutMS=20000,
+        minPoolSize=min_pool_size,
+        maxPoolSize=max_pool_size,
+    )
+    return SharedConnection(client)
+
+
 class DatabaseConfig:
     """Database configuration and connection management"""
 
     def __init__(self):
         self._client = None
         self._db = None
+        self._connection = None
         self.database_name = os.getenv("DATABASE_NAME", "IA")
 
     @property
@@ -39,23 +109,17 @@ class DatabaseConfig:
         return uri
 
     def connect(self):
-        """Establish database connection"""
+        """Attach to the shared client without waiting for the cluster to answer"""
         if self._client is None:
             try:
                 uri = self.connection_string
                 if not uri:
                     return False
 
-                self._client = MongoClient(
-                    uri,
-                    serverSelectionTimeoutMS=30000,
-                    connectTimeoutMS=20000,
-                    socketTimeoutMS=20000,
-                    maxPoolSize=10,
-                )
-
-                # Test the connection
-                self._client.server_info()
+                # MongoClient connects in the background, so this returns
+                # immediately; readiness is tracked by the warm-up thread
+                self._connection = get_shared_connection(uri)
+                self._client = self._connection.client
                 self._db = self._client[self.database_name]
 
                 return True
@@ -63,20 +127,46 @@ class DatabaseConfig:
             except ConnectionFailure as e:
                 st.error(f" Failed to connect to MongoDB: {str(e)}")
                 self._client = None
+                self._connection = None
                 return False
             except Exception as e:
                 st.error(f" Database connection error: {str(e)}")
                 self._client = None
+                self._connection = None
                 return False
 
         return True
 
+    def start_warm_up(self):
+        """Connect in the background and create indexes once the cluster answers"""
+        if self._connection is not None:
+            self._connection.start_warm_up(on_ready=self.create_indexes)
+
+    def is_ready(self):
+        """Fast readiness probe; never blocks on the network"""
+        return self._connection is not None and self._connection.ready.is_set()
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the warm-up ping succeeds or the timeout expires"""
+        if self._connection is None:
+            return False
+        return self._connection.ready.wait(timeout)
+
+    @property
+    def last_error(self):
+        """Most recent warm-up failure, if the cluster has not answered yet"""
+        if self._connection is None:
+            return None
+        return self._connection.last_error
+
     def disconnect(self):
         """Close database connection"""
         if self._client:
             self._client.close()
+            get_shared_connection.clear()
             self._client = None
             self._db = None
+            self._connection = None
 
     def get_database(self):
         """Get database instance"""
@@ -124,6 +214,31 @@ class DatabaseConfig:
                 portfolios.create_index("user_id")
                 portfolios.create_index("created_at")
                 portfolios.create_index("portfolio_name")
+                # Community feed: newest active portfolios, keyset paginated
+                portfolios.create_index([("is_active", 1), ("created_at", -1), ("_id", -1)])
+                # Multikey index from a held symbol back to its portfolios
+                portfolios.create_index([("stocks.symbol", 1), ("is_active", 1)])
+
+                # Create indexes for the materialized community leaderboard
+                leaderboard = db["community_leaderboard"]
+                leaderboard.create_index([("real_return_pct", -1)])
+                leaderboard.create_index([("predicted_value", -1)])
+                leaderboard.create_index([("symbols", 1), ("as_of", 1)])
+                leaderboard.create_index("stale")
+
+                # Create indexes for the audit trail
+                activity_logs = db["activity_logs"]
+                activity_logs.create_index("user_id")
+                activity_logs.create_index("timestamp")
+
+                security_events = db["security_events"]
+                security_events.create_index("user_id")
+                security_events.create_index("timestamp")
+
+                # Create indexes for server-side sessions; lookups use _id
+                sessions = db["sessions"]
+                sessions.create_index("expires_at", expireAfterSeconds=0)
+                sessions.create_index("user_id")
 
                 return True
         except Exception as e:
@@ -156,9 +271,34 @@ def get_portfolios_collection():
     return db_config.get_collection("portfolios")
 
 
+def get_leaderboard_collection():
+    """Get community leaderboard collection"""
+    return db_config.get_collection("community_leaderboard")
+
+
+def get_activity_logs_collection():
+    """Get activity logs collection"""
+    return db_config.get_collection("activity_logs")
+
+
+def get_security_events_collection():
+    """Get security events collection"""
+    return db_config.get_collection("security_events")
+
+
+def get_sessions_collection():
+    """Get sessions collection"""
+    return db_config.get_collection("sessions")
+
+
 def initialize_database():
     """Initialize database with indexes and basic setup"""
     if db_config.connect():
-        db_config.create_indexes()
+        db_config.start_warm_up()
         return True
     return False
+
+
+def is_database_ready():
+    """Check whether the background connection has been established"""
+    return db_config.is_ready()
@@ -0,0 +1,251 @@
+import threading
+import time
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+from database import get_leaderboard_collection, get_portfolios_collection
+
+# Sort keys the dashboard can rank community portfolios by
+LEADERBOARD_RANKINGS = {
+    "real_return": "real_return_pct",
+    "predicted_value": "predicted_value",
+}
+
+# Minimum seconds between background refreshes in this process
+REFRESH_INTERVAL = 60
+
+# Stale entries recomputed per refresh, so one pass stays short
+MAX_UPDATES_PER_REFRESH = 20
+
+_refresh_lock = threading.Lock()
+_last_refresh = 0.0
+_backfilled = False
+_noted_bars = {}
+
+# Every stale flag bumps the entry's version, so a refresh only clears the flag it read
+STALE_UPDATE = {"$set": {"stale": True}, "$inc": {"stale_version": 1}}
+
+
+def predict_one_year(closes):
+    """Linear-trend price one year out, matching the dashboard's regression"""
+    if len(closes) < 30:
+        return None
+    # Imported here so the login path, which reaches this module via login.py, skips numpy
+    import numpy as np
+    x = np.arange(len(closes))
+    slope, intercept = np.polyfit(x, closes.values, 1)
+    return float(slope * (len(closes) + 365) + intercept)
+
+
+def compute_entry(portfolio, load_closes):
+    """Build the leaderboard document for one portfolio"""
+    stocks = portfolio.get("stocks", [])
+    purchase_value = 0
+    current_value = 0
+    predicted_value = 0
+    as_of = None
+
+    for stock in stocks:
+        shares = stock.get("shares", 1)
+        purchase_price = stock.get("purchase_price", stock.get("price", 0))
+        current_price = purchase_price
+        predicted_price = purchase_price
+
+        try:
+            closes = load_closes(stock["symbol"])
+            if closes is not None and not closes.empty:
+                current_price = float(closes.iloc[-1])
+                predicted_price = predict_one_year(closes) or current_price
+                last_bar = closes.index[-1].to_pydatetime()
+                as_of = last_bar if as_of is None else max(as_of, last_bar)
+        except Exception:
+            pass
+
+        purchase_value += purchase_price * shares
+        current_value += current_price * shares
+        predicted_value += predicted_price * shares
+
+    real_return_pct = ((current_value - purchase_value) / purchase_value * 100) if purchase_value > 0 else 0
+    predicted_change_pct = ((predicted_value - purchase_value) / purchase_value * 100) if purchase_value > 0 else 0
+
+    return {
+        "user_id": portfolio.get("user_id"),
+        "portfolio_name": portfolio.get("portfolio_name"),
+        "countries": portfolio.get("countries", []),
+        "portfolio_created_at": portfolio.get("created_at"),
+        "symbols": [stock["symbol"] for stock in stocks],
+        "top_symbols": [stock["symbol"] for stock in stocks[:3]],
+        "stock_count": len(stocks),
+        "purchase_value": purchase_value,
+        "current_value": current_value,
+        "real_return_pct": real_return_pct,
+        "predicted_value": predicted_value,
+        "predicted_change_pct": predicted_change_pct,
+        "as_of": as_of,
+        "stale": False,
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def mark_stale(portfolio_id):
+    """Flag a portfolio's entry for recomputation after it changes"""
+    try:
+        leaderboard = get_leaderboard_collection()
+        if leaderboard is not None:
+            leaderboard.update_one(
+                {"_id": portfolio_id},
+                STALE_UPDATE,
+                upsert=True
+            )
+    except Exception:
+        # The next backfill picks the portfolio up again
+        pass
+
+
+def remove_entry(portfolio_id):
+    """Drop a deleted portfolio from the leaderboard"""
+    try:
+        leaderboard = get_leaderboard_collection()
+        if leaderboard is not None:
+            leaderboard.delete_one({"_id": portfolio_id})
+    except Exception:
+        pass
+
+
+def note_latest_bar(symbol, bar_date):
+    """Flag entries holding ``symbol`` whose prices predate a new daily bar"""
+    if _noted_bars.get(symbol) == bar_date:
+        return 0
+    leaderboard = get_leaderboard_collection()
+    if leaderboard is None:
+        return 0
+    result = leaderboard.update_many(
+        {"symbols": symbol, "as_of": {"$lt": bar_date}},
+        STALE_UPDATE
+    )
+    _noted_bars[symbol] = bar_date
+    return result.modified_count
+
+
+def backfill_entries():
+    """Create stale entries for active portfolios the leaderboard has never seen"""
+    leaderboard = get_leaderboard_collection()
+    portfolios = get_portfolios_collection()
+    if leaderboard is None or portfolios is None:
+        return 0
+
+    known_ids = {doc["_id"] for doc in leaderboard.find({}, {"_id": 1})}
+    operations = [
+        UpdateOne({"_id": doc["_id"]}, STALE_UPDATE, upsert=True)
+        for doc in portfolios.find({"is_active": True}, {"_id": 1})
+        if doc["_id"] not in known_ids
+    ]
+    if operations:
+        leaderboard.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def refresh_stale_entries(load_closes, max_updates=MAX_UPDATES_PER_REFRESH):
+    """Recompute a bounded number of stale entries"""
+    leaderboard = get_leaderboard_collection()
+    portfolios = get_portfolios_collection()
+    if leaderboard is None or portfolios is None:
+        return 0
+
+    stale_versions = {
+        doc["_id"]: doc.get("stale_version")
+        for doc in leaderboard.find({"stale": True}, {"_id": 1, "stale_version": 1}).limit(max_updates)
+    }
+    if not stale_versions:
+        return 0
+    stale_ids = list(stale_versions)
+
+    operations = []
+    found_ids = set()
+    for portfolio in portfolios.find({"_id": {"$in": stale_ids}, "is_active": True}):
+        found_ids.add(portfolio["_id"])
+        # A mark_stale landing while compute_entry runs bumps the version, so this
+        # write matches nothing and the entry stays stale for the next pass
+        operations.append(UpdateOne(
+            {"_id": portfolio["_id"], "stale_version": stale_versions[portfolio["_id"]]},
+            {"$set": compute_entry(portfolio, load_closes)}
+        ))
+
+    # Entries whose portfolio is gone or inactive are removed
+    missing_ids = [portfolio_id for portfolio_id in stale_ids if portfolio_id not in found_ids]
+    if missing_ids:
+        leaderboard.delete_many({"_id": {"$in": missing_ids}})
+
+    if operations:
+        leaderboard.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def refresh_leaderboard(load_closes):
+    """One incremental pass: pick up new bars, then recompute stale entries"""
+    global _backfilled
+    leaderboard = get_leaderboard_collection()
+    if leaderboard is None:
+        return 0
+
+    if not _backfilled:
+        backfill_entries()
+        _backfilled = True
+
+    for symbol in leaderboard.distinct("symbols"):
+        try:
+            closes = load_closes(symbol)
+            if closes is not None and not closes.empty:
+                note_latest_bar(symbol, closes.index[-1].to_pydatetime())
+        except Exception:
+            continue
+
+    return refresh_stale_entries(load_closes)
+
+
+def start_background_refresh(load_closes):
+    """Run refresh_leaderboard in a daemon thread unless one ran recently"""
+    global _last_refresh
+    if time.monotonic() - _last_refresh < REFRESH_INTERVAL:
+        return False
+    if not _refresh_lock.acquire(blocking=False):
+        return False
+    _last_refresh = time.monotonic()
+
+    def run():
+        try:
+            refresh_leaderboard(load_closes)
+        except Exception:
+            pass
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=run, name="leaderboard-refresh", daemon=True).start()
+    return True
+
+
+def get_leaderboard_page(username, rank_by="real_return", limit=5):
+    """Get the top-ranked community portfolios with one indexed query"""
+    try:
+        leaderboard = get_leaderboard_collection()
+        if leaderboard is None:
+            return []
+
+        sort_field = LEADERBOARD_RANKINGS.get(rank_by, LEADERBOARD_RANKINGS["real_return"])
+        return list(
+            leaderboard.find({sort_field: {"$exists": True}, "user_id": {"$ne": username}})
+            .sort(sort_field, -1)
+            .limit(limit)
+        )
+    except Exception:
+        return []
+
+
+def get_entries(portfolio_ids):
+    """Get leaderboard entries for specific portfolios, keyed by _id"""
+    try:
+        leaderboard = get_leaderboard_collection()
+        if leaderboard is None or not portfolio_ids:
+            return {}
+        return {doc["_id"]: doc for doc in leaderboard.find({"_id": {"$in": list(portfolio_ids)}})}
+    except Exception:
+        return {}
@@ -1,9 +1,74 @@
 import re
+import copy
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from pymongo import UpdateOne
 from pymongo.errors import DuplicateKeyError
 import streamlit as st
 from bson import ObjectId
 from database import get_users_collection, get_dashboard_collection, get_portfolios_collection
+import leaderboard
+import activity
+import passwords
+import throttle
+
+
+class PortfolioCache:
+    """In-process read-through cache of portfolio documents keyed by _id"""
+
+    def __init__(self, max_entries=256, revalidate_after=30):
+        self.max_entries = max_entries
+        self.revalidate_after = revalidate_after
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, portfolio_id):
+        """Return (document, is_fresh) for a cached portfolio, or (None, False)"""
+        with self._lock:
+            entry = self._entries.get(portfolio_id)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(portfolio_id)
+            document, checked_at = entry
+            is_fresh = time.monotonic() - checked_at < self.revalidate_after
+            return copy.deepcopy(document), is_fresh
+
+    def put(self, document):
+        """Store a document unless a newer version is already cached"""
+        portfolio_id = str(document["_id"])
+        with self._lock:
+            entry = self._entries.get(portfolio_id)
+            if entry is not None:
+                cached_at = entry[0].get("updated_at")
+                if cached_at and document.get("updated_at") and cached_at > document["updated_at"]:
+                    return
+            self._entries[portfolio_id] = (copy.deepcopy(document), time.monotonic())
+            self._entries.move_to_end(portfolio_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, portfolio_id):
+        """Mark a cached document as revalidated"""
+        with self._lock:
+            entry = self._entries.get(portfolio_id)
+            if entry is not None:
+                self._entries[portfolio_id] = (entry[0], time.monotonic())
+
+    def invalidate(self, portfolio_id):
+        """Drop a portfolio after it has been written"""
+        with self._lock:
+            self._entries.pop(str(portfolio_id), None)
+
+    def clear(self):
+        """Drop every cached portfolio"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every session in the process; writes below keep it consistent
+portfolio_cache = PortfolioCache()
 
 
 def get_collection_safely(collection_getter):
@@ -14,22 +79,75 @@ def get_collection_safely(collection_getter):
     return collection, None
 
 
-def verify_user(username, password):
+def verify_user(username, password, client_id=None):
     """Verify user credentials"""
     try:
+        # Throttled attempts are refused from memory, before any database access
+        if throttle.login_block_reason(username, client_id):
+            return False
+        throttle.record_attempt(client_id)
+
         users = get_users_collection()
         if users is None:
             return False
 
         user = users.find_one({"username": username})
         if user:
-            return password == user["password"]
+            locked_until = user.get("account_locked_until")
+            if locked_until is not None:
+                if locked_until.tzinfo is None:
+                    locked_until = locked_until.replace(tzinfo=timezone.utc)
+                if locked_until > datetime.now(timezone.utc):
+                    # Locked by another replica; remember it so retries stay off the database
+                    throttle.note_lock(username, locked_until.timestamp())
+                    return False
+
+            matches, needs_rehash = passwords.verify_password(password, user["password"])
+            if matches:
+                if needs_rehash:
+                    upgrade_password_hash(user["_id"], user["password"], password)
+                if user.get("failed_login_attempts") or locked_until is not None:
+                    users.update_one(
+                        {"_id": user["_id"]},
+                        {"$set": {"failed_login_attempts": 0, "account_locked_until": None}}
+                    )
+                throttle.clear_failures(username)
+                return True
+
+        record_failed_login(users, username, user is not None)
         return False
     except Exception as e:
         st.error(f"Authentication error: {str(e)}")
         return False
 
 
+def record_failed_login(users, username, user_found):
+    """Count a failed login and persist the lock only when the threshold is crossed"""
+    activity.log_security_event(username, "failed_login", severity="low")
+    if throttle.record_failure(username) and user_found:
+        locked_until = datetime.now(timezone.utc) + timedelta(seconds=throttle.LOCKOUT_SECONDS)
+        users.update_one(
+            {"username": username},
+            {"$set": {
+                "failed_login_attempts": throttle.MAX_FAILED_ATTEMPTS,
+                "account_locked_until": locked_until,
+            }}
+        )
+        activity.log_security_event(username, "account_locked", severity="high",
+                                    metadata={"locked_until": locked_until})
+
+
+def upgrade_password_hash(user_id, old_value, password):
+    """Replace a plaintext or outdated-cost password with a current hash in the background"""
+    def store(new_hash):
+        users = get_users_collection()
+        if users is not None:
+            # Matching the old value keeps a concurrent password change from being overwritten
+            users.update_one({"_id": user_id, "password": old_value}, {"$set": {"password": new_hash}})
+
+    passwords.rehash_in_background(password, store)
+
+
 def user_exists(username):
     """Check if username already exists"""
     try:
@@ -49,34 +167,40 @@ def validate_email(email):
     return re.match(pattern, email) is not None
 
 
+def duplicate_key_field(error):
+    """Work out which unique index a DuplicateKeyError was raised by"""
+    details = error.details or {}
+    key_pattern = details.get("keyPattern") or details.get("keyValue") or {}
+    if key_pattern:
+        return next(iter(key_pattern))
+
+    # Older servers only report the index name in the message
+    message = details.get("errmsg", str(error))
+    match = re.search(r"index: (\w+?)_\d", message)
+    return match.group(1) if match else None
+
+
 def register_user(username, password, email):
     """Register a new user with enhanced validation"""
     try:
-        users = get_users_collection()
-        if users is None:
-            return False, "Database connection error"
-
-        # Validate inputs
+        # Validate inputs locally before touching the database
         if not username or not password or not email:
             return False, "All fields are required"
 
         if len(username) < 3:
             return False, "Username must be at least 3 characters long"
 
-        if user_exists(username):
-            return False, "Username already exists"
-
         if not validate_email(email):
             return False, "Please enter a valid email address"
 
-        # Check if email already exists
-        if users.find_one({"email": email}):
-            return False, "Email already registered"
+        users = get_users_collection()
+        if users is None:
+            return False, "Database connection error"
 
         # Create user document
         user_doc = {
             "username": username,
-            "password": password,
+            "password": passwords.hash_password(password),
             "email": email.lower(),
             "role": "user",
             "created_at": datetime.now(timezone.utc),
@@ -84,10 +208,17 @@ def register_user(username, password, email):
             "is_active": True,
         }
 
+        # Uniqueness is enforced by the username/email indexes, so a single
+        # insert replaces the separate existence checks
         users.insert_one(user_doc)
         return True, "Registration successful"
 
-    except DuplicateKeyError:
+    except DuplicateKeyError as e:
+        field = duplicate_key_field(e)
+        if field == "username":
+            return False, "Username already exists"
+        if field == "email":
+            return False, "Email already registered"
         return False, "Username or email already exists"
     except Exception as e:
         st.error(f"Registration error: {str(e)}")
@@ -95,26 +226,32 @@ def register_user(username, password, email):
 
 
 def update_last_login(username):
-    """Update user's last login timestamp"""
+    """Queue the user's last login timestamp; written by the activity buffer"""
     try:
-        users = get_users_collection()
-        if users is not None:
-            users.update_one(
-                {"username": username},
-                {"$set": {"last_login": datetime.now(timezone.utc)}},
-            )
+        activity.record_login(username)
     except Exception as e:
         st.error(f"Error updating login time: {str(e)}")
 
 
+# Fields exposed by get_user_info; the password never leaves the database
+USER_PROFILE_PROJECTION = {
+    "_id": 0,
+    "username": 1,
+    "email": 1,
+    "role": 1,
+    "created_at": 1,
+    "last_login": 1,
+    "is_active": 1,
+}
+
+
 def get_user_info(username):
     """Get user information (excluding sensitive data)"""
     try:
         users = get_users_collection()
         if users is not None:
-            user = users.find_one({"username": username})
+            user = users.find_one({"username": username}, USER_PROFILE_PROJECTION)
             if user:
-                # Remove sensitive information
                 safe_user_info = {
                     "username": user["username"],
                     "email": user["email"],
@@ -130,6 +267,23 @@ def get_user_info(username):
         return None
 
 
+def get_session_profile(username, refresh=False):
+    """Get the user's profile, loaded once per session and kept in session state"""
+    profile = st.session_state.get("user_profile")
+    if refresh or profile is None or profile.get("username") != username:
+        profile = get_user_info(username)
+        if profile is None:
+            st.session_state.pop("user_profile", None)
+        else:
+            st.session_state["user_profile"] = profile
+    return profile
+
+
+def clear_session_profile():
+    """Forget the session's profile so the next read reloads it"""
+    st.session_state.pop("user_profile", None)
+
+
 def change_password(username, old_password, new_password):
     """Change user password"""
     try:
@@ -140,8 +294,10 @@ def change_password(username, old_password, new_password):
         if users is not None:
             users.update_one(
                 {"username": username},
-                {"$set": {"password": new_password}},
+                {"$set": {"password": passwords.hash_password(new_password)}},
             )
+            activity.log_security_event(username, "password_change", severity="medium")
+            clear_session_profile()
             return True, "Password changed successfully"
 
         return False, "Database error"
@@ -181,6 +337,7 @@ def create_portfolio(username, portfolio_data):
         
         result = portfolios.insert_one(portfolio_doc)
         if result.inserted_id:
+            leaderboard.mark_stale(result.inserted_id)
             return True, "Portfolio created successfully"
         else:
             return False, "Failed to create portfolio"
@@ -208,6 +365,48 @@ def get_user_portfolios(username):
         return []
 
 
+# Summary returned when the user has no active portfolios
+EMPTY_PORTFOLIO_SUMMARY = {"total_portfolios": 0, "total_stocks": 0, "total_invested": 0}
+
+
+def get_user_portfolio_summary(username):
+    """Get portfolio count, holding count and amount invested for a user"""
+    try:
+        portfolios = get_portfolios_collection()
+        if portfolios is None:
+            return dict(EMPTY_PORTFOLIO_SUMMARY)
+
+        stocks = {"$ifNull": ["$stocks", []]}
+        pipeline = [
+            {"$match": {"user_id": username, "is_active": True}},
+            {"$project": {
+                "stock_count": {"$size": stocks},
+                "invested": {"$sum": {"$map": {
+                    "input": stocks,
+                    "as": "stock",
+                    "in": {"$multiply": [
+                        {"$ifNull": ["$$stock.purchase_price", {"$ifNull": ["$$stock.price", 0]}]},
+                        {"$ifNull": ["$$stock.shares", 1]},
+                    ]},
+                }}},
+            }},
+            {"$group": {
+                "_id": None,
+                "total_portfolios": {"$sum": 1},
+                "total_stocks": {"$sum": "$stock_count"},
+                "total_invested": {"$sum": "$invested"},
+            }},
+            {"$project": {"_id": 0}},
+        ]
+
+        result = next(portfolios.aggregate(pipeline), None)
+        return result or dict(EMPTY_PORTFOLIO_SUMMARY)
+
+    except Exception as e:
+        st.error(f"Error fetching portfolio summary: {str(e)}")
+        return dict(EMPTY_PORTFOLIO_SUMMARY)
+
+
 def get_all_portfolios():
     """Get all portfolios from all users for media feed"""
     try:
@@ -226,15 +425,145 @@ def get_all_portfolios():
         return []
 
 
+# Fields needed to draw a community portfolio card
+COMMUNITY_CARD_PROJECTION = {
+    "user_id": 1,
+    "portfolio_name": 1,
+    "countries": 1,
+    "created_at": 1,
+    "stocks.symbol": 1,
+    "stocks.shares": 1,
+    "stocks.price": 1,
+    "stocks.purchase_price": 1,
+}
+
+
+def get_community_feed(username, limit=5, after=None):
+    """Get one page of other users' portfolios and the cursor for the next page"""
+    try:
+        portfolios = get_portfolios_collection()
+        if portfolios is None:
+            return [], None
+
+        query = {"is_active": True, "user_id": {"$ne": username}}
+        if after is not None:
+            # Keyset pagination on (created_at, _id) so later pages stay cheap
+            after_created_at, after_id = after
+            query["$or"] = [
+                {"created_at": {"$lt": after_created_at}},
+                {"created_at": after_created_at, "_id": {"$lt": after_id}},
+            ]
+
+        page = list(
+            portfolios.find(query, COMMUNITY_CARD_PROJECTION)
+            .sort([("created_at", -1), ("_id", -1)])
+            .limit(limit + 1)
+        )
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = (page[-1].get("created_at"), page[-1]["_id"])
+
+        return page, next_cursor
+
+    except Exception as e:
+        st.error(f"Error fetching community portfolios: {str(e)}")
+        return [], None
+
+
+def get_portfolios_holding(symbol, limit=10):
+    """Get active portfolios that hold a symbol, newest first"""
+    try:
+        portfolios = get_portfolios_collection()
+        if portfolios is None:
+            return []
+
+        # Served by the multikey index on stocks.symbol
+        return list(
+            portfolios.find(
+                {"stocks.symbol": symbol.upper(), "is_active": True},
+                COMMUNITY_CARD_PROJECTION
+            )
+            .sort("created_at", -1)
+            .limit(limit)
+        )
+
+    except Exception as e:
+        st.error(f"Error fetching portfolios holding {symbol}: {str(e)}")
+        return []
+
+
+def count_portfolios_holding(symbol):
+    """Count active portfolios that hold a symbol"""
+    try:
+        portfolios = get_portfolios_collection()
+        if portfolios is None:
+            return 0
+        return portfolios.count_documents({"stocks.symbol": symbol.upper(), "is_active": True})
+    except Exception:
+        return 0
+
+
+def get_symbol_popularity(limit=20):
+    """Get the most-held symbols with portfolio and holder counts"""
+    try:
+        portfolios = get_portfolios_collection()
+        if portfolios is None:
+            return []
+
+        pipeline = [
+            {"$match": {"is_active": True}},
+            {"$project": {"_id": 0, "user_id": 1, "stocks.symbol": 1}},
+            {"$unwind": "$stocks"},
+            {"$group": {
+                "_id": "$stocks.symbol",
+                "portfolios": {"$sum": 1},
+                "holders": {"$addToSet": "$user_id"},
+            }},
+            {"$project": {
+                "_id": 0,
+                "symbol": "$_id",
+                "portfolios": 1,
+                "holders": {"$size": "$holders"},
+            }},
+            {"$sort": {"holders": -1, "portfolios": -1, "symbol": 1}},
+            {"$limit": limit},
+        ]
+        # allowDiskUse lets the $group spill to disk on very large collections
+        return list(portfolios.aggregate(pipeline, allowDiskUse=True))
+
+    except Exception as e:
+        st.error(f"Error fetching symbol popularity: {str(e)}")
+        return []
+
+
 def get_portfolio_by_id(portfolio_id):
     """Get a specific portfolio by its ID"""
     try:
+        cache_key = str(portfolio_id)
+        cached, is_fresh = portfolio_cache.lookup(cache_key)
+        if cached is not None and is_fresh:
+            return cached
+        
         portfolios = get_portfolios_collection()
         if portfolios is None:
-            return None
+            return cached
+        
+        if cached is not None:
+            # Cheap revalidation: only the timestamp comes back over the wire
+            stamp = portfolios.find_one({"_id": ObjectId(portfolio_id)}, {"updated_at": 1})
+            if stamp is not None and stamp.get("updated_at") == cached.get("updated_at"):
+                portfolio_cache.touch(cache_key)
+                return cached
         
         portfolio = portfolios.find_one({"_id": ObjectId(portfolio_id)})
-        return portfolio
+        if portfolio is None:
+            portfolio_cache.invalidate(cache_key)
+            return None
+        
+        portfolio_cache.put(portfolio)
+        return copy.deepcopy(portfolio)
         
     except Exception as e:
         st.error(f"Error fetching portfolio: {str(e)}")
@@ -254,8 +583,10 @@ def update_portfolio(portfolio_id, update_data):
             {"_id": ObjectId(portfolio_id)},
             {"$set": update_data}
         )
+        portfolio_cache.invalidate(portfolio_id)
         
         if result.modified_count > 0:
+            leaderboard.mark_stale(ObjectId(portfolio_id))
             return True, "Portfolio updated successfully"
         else:
             return False, "No changes made to portfolio"
@@ -275,8 +606,10 @@ def delete_portfolio(portfolio_id, username):
             {"_id": ObjectId(portfolio_id), "user_id": username},
             {"$set": {"is_active": False, "updated_at": datetime.now(timezone.utc)}}
         )
+        portfolio_cache.invalidate(portfolio_id)
         
         if result.modified_count > 0:
+            leaderboard.remove_entry(ObjectId(portfolio_id))
             return True, "Portfolio deleted successfully"
         else:
             return False, "Portfolio not found or already deleted"
@@ -290,29 +623,29 @@ def add_stock_to_portfolio(portfolio_id, stock_data):
     try:
         portfolios, error = get_collection_safely(get_portfolios_collection)
         if error:
-            return False, error
+            return error
         
-        # Check if stock already exists in portfolio
-        portfolio = portfolios.find_one({"_id": ObjectId(portfolio_id)})
-        if portfolio:
-            existing_stocks = portfolio.get("stocks", [])
-            for stock in existing_stocks:
-                if stock["symbol"] == stock_data["symbol"]:
-                    return False, f"Stock {stock_data['symbol']} already exists in portfolio"
+        symbol = stock_data["symbol"]
         
-        # Add stock to portfolio
+        # The duplicate check lives in the filter, so the push only applies
+        # when no holding with this symbol exists yet
         result = portfolios.update_one(
-            {"_id": ObjectId(portfolio_id)},
+            {"_id": ObjectId(portfolio_id), "stocks.symbol": {"$ne": symbol}},
             {
                 "$push": {"stocks": stock_data},
                 "$set": {"updated_at": datetime.now(timezone.utc)}
             }
         )
+        portfolio_cache.invalidate(portfolio_id)
         
         if result.modified_count > 0:
-            return True, f"Stock {stock_data['symbol']} added to portfolio"
-        else:
-            return False, "Failed to add stock to portfolio"
+            leaderboard.mark_stale(ObjectId(portfolio_id))
+            return True, f"Stock {symbol} added to portfolio"
+        
+        # Only the failure path pays for a second lookup to explain why
+        if portfolios.find_one({"_id": ObjectId(portfolio_id)}, {"_id": 1}) is None:
+            return False, "Portfolio not found"
+        return False, f"Stock {symbol} already exists in portfolio"
             
     except Exception as e:
         return False, f"Error adding stock: {str(e)}"
@@ -332,11 +665,63 @@ def remove_stock_from_portfolio(portfolio_id, stock_symbol):
                 "$set": {"updated_at": datetime.now(timezone.utc)}
             }
         )
+        portfolio_cache.invalidate(portfolio_id)
         
         if result.modified_count > 0:
+            leaderboard.mark_stale(ObjectId(portfolio_id))
             return True, f"Stock {stock_symbol} removed from portfolio"
         else:
             return False, "Stock not found in portfolio"
             
     except Exception as e:
         return False, f"Error removing stock: {str(e)}"
+
+
+def update_portfolio_holdings(portfolio_id, share_changes):
+    """Apply changed share counts to a portfolio; a count of 0 removes the holding"""
+    try:
+        portfolios, error = get_collection_safely(get_portfolios_collection)
+        if error:
+            return error
+        
+        if not share_changes:
+            return False, "No changes to save"
+        
+        now = datetime.now(timezone.utc)
+        updated = {symbol: shares for symbol, shares in share_changes.items() if shares > 0}
+        removed = [symbol for symbol, shares in share_changes.items() if shares <= 0]
+        
+        operations = []
+        if updated:
+            # One array filter per changed holding so only those entries are rewritten
+            set_fields = {"updated_at": now}
+            array_filters = []
+            for idx, (symbol, shares) in enumerate(updated.items()):
+                set_fields[f"stocks.$[h{idx}].shares"] = shares
+                array_filters.append({f"h{idx}.symbol": symbol})
+            operations.append(UpdateOne(
+                {"_id": ObjectId(portfolio_id)},
+                {"$set": set_fields},
+                array_filters=array_filters
+            ))
+        if removed:
+            operations.append(UpdateOne(
+                {"_id": ObjectId(portfolio_id)},
+                {
+                    "$pull": {"stocks": {"symbol": {"$in": removed}}},
+                    "$set": {"updated_at": now}
+                }
+            ))
+        
+        result = portfolios.bulk_write(operations, ordered=True)
+        portfolio_cache.invalidate(portfolio_id)
+        
+        if result.matched_count == 0:
+            return False, "Portfolio not found"
+        leaderboard.mark_stale(ObjectId(portfolio_id))
+        return True, f"Updated {len(updated)} and removed {len(removed)} holdings"
+            
+    except Exception as e:
+        # An ordered bulk write can fail after applying its first operation
+        portfolio_cache.invalidate(portfolio_id)
+        return False, f"Error updating holdings: {str(e)}"
@@ -1,10 +1,9 @@
 import streamlit as st
 from login import (verify_user, register_user, get_user_info,
-                   change_password, update_last_login, create_portfolio,
-                   get_user_portfolios, get_all_portfolios, get_portfolio_by_id, update_portfolio,
-                   delete_portfolio, add_stock_to_portfolio, remove_stock_from_portfolio)
-from ui import login_page, register_page, dashboard_page, stock_analysis_page, portfolios_page, create_portfolio_page, my_stocks_page, stock_search_page, edit_portfolio_page, portfolio_details_page, portfolio_analytics_page, media_portfolio_view_page
-from database import initialize_database
+                   change_password, update_last_login)
+from views import load_page, resolve_page
+from database import initialize_database, is_database_ready
+from views.auth import restore_login, write_session_cookie
 
 # Page config
 st.set_page_config(
@@ -30,6 +29,9 @@ if "logged_in" not in st.session_state:
 if "username" not in st.session_state:
     st.session_state.username = ""
 
+# Restore a login from the session cookie after a reload or on another replica
+restore_login()
+
 # Navigation function
 def go_to(page):
     st.session_state.page = page
@@ -55,6 +57,9 @@ def main():
         border-radius: 15px;
         font-size: 12px;
     }
+    .status-indicator.degraded {
+        background: #f0ad4e;
+    }
     .positive-percentage {
         color: #28a745;
         font-weight: bold;
@@ -72,34 +77,22 @@ def main():
     
     # Add connection status indicator
     if st.session_state.get("db_initialized"):
-        st.markdown('<div class="status-indicator"> Connected</div>', unsafe_allow_html=True)
-    
-    # Route to appropriate page
-    if st.session_state.logged_in:
-        if st.session_state.page == "stock_analysis":
-            stock_analysis_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "portfolios":
-            portfolios_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "create_portfolio":
-            create_portfolio_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "my_stocks":
-            my_stocks_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "stock_search":
-            stock_search_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "edit_portfolio":
-            edit_portfolio_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "portfolio_details":
-            portfolio_details_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "portfolio_analytics":
-            portfolio_analytics_page(go_to, get_user_info, change_password)
-        elif st.session_state.page == "media_portfolio_view":
-            media_portfolio_view_page(go_to, get_user_info, change_password)
+        if is_database_ready():
+            st.markdown('<div class="status-indicator"> Connected</div>', unsafe_allow_html=True)
         else:
-            dashboard_page(go_to, get_user_info, change_password)
-    elif st.session_state.page == "register":
-        register_page(go_to, register_user)
+            st.markdown('<div class="status-indicator degraded"> Connecting...</div>', unsafe_allow_html=True)
+            st.warning("Still connecting to the database. Some data may be unavailable for a moment.")
+    
+    write_session_cookie()
+
+    # Route to appropriate page; page modules are imported on first use
+    page = resolve_page(st.session_state.page, st.session_state.logged_in)
+    if page == "login":
+        load_page(page)(go_to, verify_user, update_last_login)
+    elif page == "register":
+        load_page(page)(go_to, register_user)
     else:
-        login_page(go_to, verify_user, update_last_login)
+        load_page(page)(go_to, get_user_info, change_password)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
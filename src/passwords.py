@@ -0,0 +1,145 @@
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+
+# bcrypt cost bounds; each step doubles the work
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def get_hash_budget_ms():
+    """Target time for one password hash on this machine"""
+    try:
+        return max(1, int(os.getenv("PASSWORD_HASH_BUDGET_MS", "250")))
+    except ValueError:
+        return 250
+
+
+def get_worker_count():
+    """Hashing workers; bcrypt releases the GIL, so one per core is useful"""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+# Bounded pool so a burst of logins queues instead of oversubscribing the CPU
+_executor = ThreadPoolExecutor(max_workers=get_worker_count(), thread_name_prefix="password-hash")
+_rounds = None
+_rounds_lock = threading.Lock()
+
+
+def calibrate_rounds(budget_ms=None):
+    """Highest bcrypt cost whose hash time fits the latency budget"""
+    budget_ms = budget_ms or get_hash_budget_ms()
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(MIN_ROUNDS))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    rounds = MIN_ROUNDS
+    while rounds < MAX_ROUNDS and elapsed_ms * 2 <= budget_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+def get_rounds():
+    """Cost factor for new hashes, calibrated once per process"""
+    global _rounds
+    if _rounds is None:
+        with _rounds_lock:
+            if _rounds is None:
+                configured = os.getenv("BCRYPT_ROUNDS")
+                if configured and configured.isdigit():
+                    # gensalt rejects costs outside 4-31, so a bad setting cannot break registration
+                    _rounds = min(MAX_ROUNDS, max(MIN_ROUNDS, int(configured)))
+                else:
+                    _rounds = calibrate_rounds()
+    return _rounds
+
+
+def hash_rounds(password_hash):
+    """Cost factor a stored bcrypt hash was created with"""
+    try:
+        return int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def is_bcrypt_hash(stored):
+    return isinstance(stored, str) and stored.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check(password, stored):
+    if is_bcrypt_hash(stored):
+        return bcrypt.checkpw(password.encode("utf-8"), stored.encode("utf-8"))
+    # Accounts created before hashing still hold the plaintext password
+    return hmac.compare_digest(password.encode("utf-8"), str(stored).encode("utf-8"))
+
+
+def hash_password(password):
+    """Hash a password on the worker pool"""
+    return _executor.submit(_hash, password, get_rounds()).result()
+
+
+def verify_password(password, stored):
+    """Return (matches, needs_rehash) for a password against its stored value"""
+    if not password or not stored:
+        return False, False
+    matches = _executor.submit(_check, password, stored).result()
+    # Only upgrade weaker hashes: replicas calibrate different costs and must not undo each other
+    stored_rounds = hash_rounds(stored) if is_bcrypt_hash(stored) else None
+    needs_rehash = matches and (stored_rounds is None or stored_rounds < get_rounds())
+    return matches, needs_rehash
+
+
+def rehash_in_background(password, on_hashed):
+    """Hash with the current cost off the request path and hand the result to on_hashed"""
+    def run():
+        try:
+            on_hashed(_hash(password, get_rounds()))
+        except Exception:
+            # The next login retries the upgrade
+            pass
+
+    return _executor.submit(run)
+
+
+def benchmark(rounds=None, seconds=2.0):
+    """Measure hashes per second across the pool and per core"""
+    rounds = rounds or get_rounds()
+    workers = get_worker_count()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        count = 0
+        while time.perf_counter() < deadline:
+            _hash("benchmark-password", rounds)
+            count += 1
+        return count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        total = sum(pool.map(lambda _: worker(), range(workers)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rounds": rounds,
+        "workers": workers,
+        "hashes_per_second": total / elapsed,
+        "hashes_per_second_per_core": total / elapsed / workers,
+    }
+
+
+if __name__ == "__main__":
+    budget_ms = get_hash_budget_ms()
+    rounds = calibrate_rounds(budget_ms)
+    print(f"Latency budget: {budget_ms} ms -> bcrypt cost {rounds}")
+    results = benchmark(rounds)
+    print(f"Workers: {results['workers']}")
+    print(f"Hashes/second: {results['hashes_per_second']:.2f}")
+    print(f"Hashes/second per core: {results['hashes_per_second_per_core']:.2f}")
@@ -0,0 +1,70 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from database import get_sessions_collection
+
+# How long a login survives reloads without signing in again; a new token is only issued at login
+SESSION_LIFETIME = timedelta(hours=12)
+
+# Cookie holding the opaque session token in the browser
+SESSION_COOKIE = "session"
+
+
+def hash_token(token):
+    """Sessions are stored under a hash so a database leak exposes no usable tokens"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def create_session(username):
+    """Store a new session and return its opaque token, or None on failure"""
+    try:
+        sessions = get_sessions_collection()
+        if sessions is None:
+            return None
+
+        token = secrets.token_urlsafe(32)
+        now = datetime.now(timezone.utc)
+        sessions.insert_one({
+            "_id": hash_token(token),
+            "user_id": username,
+            "created_at": now,
+            # The TTL index on expires_at removes the document once this passes
+            "expires_at": now + SESSION_LIFETIME,
+            "session_data": {},
+            "is_active": True,
+        })
+        return token
+    except Exception:
+        return None
+
+
+def get_session_user(token):
+    """Username of a live session token, or None"""
+    if not token:
+        return None
+    try:
+        sessions = get_sessions_collection()
+        if sessions is None:
+            return None
+
+        # A single read on _id; restores never write, so tabs restoring the same token can't race.
+        # TTL deletion runs about once a minute, so expiry is also checked here
+        session = sessions.find_one(
+            {"_id": hash_token(token), "expires_at": {"$gt": datetime.now(timezone.utc)}},
+            projection={"user_id": 1}
+        )
+        return session["user_id"] if session else None
+    except Exception:
+        return None
+
+
+def end_session(token):
+    """Delete a session so its token stops working"""
+    if not token:
+        return
+    try:
+        sessions = get_sessions_collection()
+        if sessions is not None:
+            sessions.delete_one({"_id": hash_token(token)})
+    except Exception:
+        pass
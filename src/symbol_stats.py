@@ -0,0 +1,200 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Return horizons, in trading days, kept on every view
+RETURN_HORIZONS = {
+    "1 Day": 1,
+    "1 Week": 5,
+    "1 Month": 21,
+    "3 Months": 63,
+    "6 Months": 126,
+    "1 Year": 252,
+}
+
+# Symbols kept in this process; the least recently used is dropped first
+MAX_RECORDS = 500
+
+# Relative difference at which a stored close counts as revised (e.g. dividend back-adjustment)
+REVISION_TOLERANCE = 1e-6
+
+BAR_COLUMNS = ("Close", "High", "Low", "Volume")
+
+_records = OrderedDict()
+_records_lock = threading.Lock()
+
+
+def new_record(symbol):
+    return {
+        "symbol": symbol,
+        "dates": np.array([], dtype="datetime64[ns]"),
+        "close": np.array([], dtype=float),
+        "high": np.array([], dtype=float),
+        "low": np.array([], dtype=float),
+        "volume": np.array([], dtype=float),
+        # Window statistics, computed once per (window start, bar count) and then looked up
+        "views": {},
+    }
+
+
+def _bar_arrays(bars):
+    """Dates and float columns of the bars that have a close"""
+    values = bars.reindex(columns=list(BAR_COLUMNS)).to_numpy(dtype=float)
+    keep = ~np.isnan(values[:, 0])
+    dates = pd.DatetimeIndex(bars.index).tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    return dates[keep], values[keep]
+
+
+def _set_bars(record, dates, values, append=False):
+    for position, field in enumerate(("close", "high", "low", "volume")):
+        column = values[:, position]
+        record[field] = np.concatenate([record[field], column]) if append else column
+    record["dates"] = np.concatenate([record["dates"], dates]) if append else dates
+    record["views"] = {}
+
+
+def _revised(record, dates, values):
+    """True when the bars disagree with the record on the last bar they share"""
+    last = record["dates"][-1]
+    shared = np.flatnonzero(dates == last)
+    if not len(shared):
+        return False
+    stored, incoming = record["close"][-1], values[shared[0], 0]
+    return abs(incoming - stored) > REVISION_TOLERANCE * max(abs(stored), 1.0)
+
+
+def append_bars(record, bars):
+    """Fold daily OHLCV bars into the record: new bars are appended, revised history rebuilds it"""
+    dates, values = _bar_arrays(bars)
+    if not len(dates):
+        return record
+
+    # An empty record, an earlier start or a back-adjusted overlap means the stored bars are replaced
+    if not len(record["dates"]) or dates[0] < record["dates"][0] or _revised(record, dates, values):
+        _set_bars(record, dates, values)
+        return record
+
+    newer = dates > record["dates"][-1]
+    if newer.any():
+        _set_bars(record, dates[newer], values[newer], append=True)
+    return record
+
+
+def _max(values):
+    values = values[~np.isnan(values)]
+    return float(values.max()) if len(values) else None
+
+
+def _min(values):
+    values = values[~np.isnan(values)]
+    return float(values.min()) if len(values) else None
+
+
+def compute_view(record, start):
+    """Statistics over the record's bars from ``start`` to its last bar"""
+    first = int(np.searchsorted(record["dates"], np.datetime64(start, "ns"), side="left"))
+    dates = record["dates"][first:]
+    close = record["close"][first:]
+    if not len(close):
+        return None
+    high, low, volume = record["high"][first:], record["low"][first:], record["volume"][first:]
+
+    last_bar = pd.Timestamp(dates[-1])
+    first_close, last_close = float(close[0]), float(close[-1])
+
+    # True 52 weeks: bars from the calendar year up to the latest one
+    year_start = int(np.searchsorted(dates, np.datetime64(last_bar - pd.DateOffset(years=1), "ns"), side="right"))
+    year_close = close[year_start:]
+    previous = year_close[:-1]
+    daily = np.diff(year_close)[previous != 0] / previous[previous != 0]
+
+    volumes = volume[~np.isnan(volume)]
+    years = len(close) / TRADING_DAYS_PER_YEAR
+    growth = last_close / first_close if first_close > 0 else None
+
+    return {
+        "symbol": record["symbol"],
+        "first_bar": pd.Timestamp(dates[0]),
+        "last_bar": last_bar,
+        "bar_count": len(close),
+        "first_close": first_close,
+        "last_close": last_close,
+        "all_time_high": _max(high),
+        "all_time_low": _min(low),
+        "close_min": float(close.min()),
+        "close_max": float(close.max()),
+        "close_mean": float(close.mean()),
+        "close_median": float(np.median(close)),
+        "close_std": float(close.std(ddof=1)) if len(close) > 1 else 0.0,
+        "average_volume": float(volumes.mean()) if len(volumes) else None,
+        "high_52w": _max(high[year_start:]),
+        "low_52w": _min(low[year_start:]),
+        # Volatility: standard deviation of daily returns over the last year
+        "volatility": float(daily.std(ddof=1)) if len(daily) > 1 else None,
+        "returns": {
+            label: (last_close - float(close[-(days + 1)])) / float(close[-(days + 1)]) * 100
+            for label, days in RETURN_HORIZONS.items()
+            if len(close) > days and close[-(days + 1)]
+        },
+        "total_return": (growth - 1) * 100 if growth is not None else None,
+        "annualized_return": (growth ** (1 / years) - 1) * 100 if growth is not None else None,
+    }
+
+
+def get_symbol_stats(symbol, data):
+    """Statistics for the window ``data`` covers, from the symbol's incrementally updated record"""
+    if data is None or data.empty or "Close" not in data.columns:
+        return None
+
+    start = pd.Timestamp(data.index[0]).tz_localize(None)
+    with _records_lock:
+        record = _records.get(symbol)
+        if record is None:
+            record = _records[symbol] = new_record(symbol)
+        _records.move_to_end(symbol)
+        while len(_records) > MAX_RECORDS:
+            _records.popitem(last=False)
+
+        # Reruns pass the same cached frame; its last bar is checked before converting anything
+        last_close = data["Close"].iloc[-1]
+        unchanged = (
+            len(record["dates"]) and start >= pd.Timestamp(record["dates"][0])
+            and pd.Timestamp(data.index[-1]).tz_localize(None) == pd.Timestamp(record["dates"][-1])
+            and last_close == record["close"][-1]
+        )
+        if not unchanged:
+            append_bars(record, data)
+
+        # A rolling window (e.g. the last ten years) starts a day later each day; it is a view
+        # over the same record rather than a record of its own
+        key = (start, len(record["dates"]))
+        if key not in record["views"]:
+            record["views"][key] = compute_view(record, start)
+        return record["views"][key]
+
+
+def returns_table(view):
+    """Recent Performance rows from the view's horizon returns"""
+    return pd.DataFrame([
+        {'Period': label, 'Change (%)': f'{change:+.2f}%'}
+        for label, change in view["returns"].items()
+    ])
+
+
+def price_statistics_table(view):
+    """Price Statistics rows from the view's close statistics"""
+    return pd.DataFrame([
+        {'Metric': 'Average', 'Value': f"${view['close_mean']:.2f}"},
+        {'Metric': 'Median', 'Value': f"${view['close_median']:.2f}"},
+        {'Metric': 'Std Deviation', 'Value': f"${view['close_std']:.2f}"},
+        {'Metric': 'Range', 'Value': f"${view['close_max'] - view['close_min']:.2f}"}
+    ])
+
+
+def clear():
+    """Drop every record, e.g. between tests"""
+    with _records_lock:
+        _records.clear()
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Failed logins per username before the account is locked
+MAX_FAILED_ATTEMPTS = 5
+
+# Login attempts per client before further attempts are refused
+MAX_CLIENT_ATTEMPTS = 30
+
+# Sliding window for both limits, and the lockout length, in seconds
+ATTEMPT_WINDOW = 15 * 60
+LOCKOUT_SECONDS = 15 * 60
+
+
+class SlidingWindowLimiter:
+    """Per-key event counts over a sliding time window, held in memory"""
+
+    def __init__(self, limit, window, max_keys=100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._events = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _recent(self, key, now):
+        events = self._events.get(key)
+        if events is None:
+            return None
+        while events and now - events[0] >= self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+            return None
+        return events
+
+    def count(self, key):
+        """Events for ``key`` inside the window"""
+        with self._lock:
+            events = self._recent(key, time.monotonic())
+            return len(events) if events else 0
+
+    def is_limited(self, key):
+        return self.count(key) >= self.limit
+
+    def hit(self, key):
+        """Record an event and return the count inside the window"""
+        now = time.monotonic()
+        with self._lock:
+            events = self._recent(key, now)
+            if events is None:
+                events = self._events[key] = deque()
+            events.append(now)
+            self._events.move_to_end(key)
+            # Forget the least recently seen keys so a spray of usernames stays bounded
+            while len(self._events) > self.max_keys:
+                self._events.popitem(last=False)
+            return len(events)
+
+    def reset(self, key):
+        with self._lock:
+            self._events.pop(key, None)
+
+
+failure_limiter = SlidingWindowLimiter(MAX_FAILED_ATTEMPTS, ATTEMPT_WINDOW)
+client_limiter = SlidingWindowLimiter(MAX_CLIENT_ATTEMPTS, ATTEMPT_WINDOW)
+
+# Locks read back from users documents, so later attempts skip the database
+_known_locks = {}
+_known_locks_lock = threading.Lock()
+
+
+def login_block_reason(username, client_id=None):
+    """Message explaining why a login attempt is refused, or None if it may proceed"""
+    with _known_locks_lock:
+        locked_until = _known_locks.get(username)
+        if locked_until is not None and locked_until <= time.time():
+            del _known_locks[username]
+            locked_until = None
+    if locked_until is not None or failure_limiter.is_limited(username):
+        return "Account locked after too many failed attempts. Try again later."
+    if client_id and client_limiter.is_limited(client_id):
+        return "Too many login attempts. Try again later."
+    return None
+
+
+def record_attempt(client_id):
+    """Count a login attempt against the client"""
+    if client_id:
+        client_limiter.hit(client_id)
+
+
+def record_failure(username):
+    """Count a failed login; returns True exactly when the lockout threshold is crossed"""
+    return failure_limiter.hit(username) == MAX_FAILED_ATTEMPTS
+
+
+def note_lock(username, locked_until_timestamp):
+    """Remember a lock found on the users document"""
+    with _known_locks_lock:
+        _known_locks[username] = locked_until_timestamp
+
+
+def clear_failures(username):
+    failure_limiter.reset(username)
+    with _known_locks_lock:
+        _known_locks.pop(username, None)
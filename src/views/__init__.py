@@ -0,0 +1,55 @@
+import importlib
+import streamlit as st
+
+# Page name -> (module, function). Modules are imported the first time one of
+# their pages is shown, so the login page never loads the market-data stack.
+PAGES = {
+    "login": ("views.auth", "login_page"),
+    "register": ("views.auth", "register_page"),
+    "dashboard": ("views.dashboard", "dashboard_page"),
+    "stock_analysis": ("views.stocks", "stock_analysis_page"),
+    "my_stocks": ("views.stocks", "my_stocks_page"),
+    "stock_search": ("views.stocks", "stock_search_page"),
+    "portfolios": ("views.portfolios", "portfolios_page"),
+    "create_portfolio": ("views.portfolios", "create_portfolio_page"),
+    "edit_portfolio": ("views.portfolios", "edit_portfolio_page"),
+    "portfolio_details": ("views.portfolios", "portfolio_details_page"),
+    "portfolio_analytics": ("views.portfolios", "portfolio_analytics_page"),
+    "media_portfolio_view": ("views.portfolios", "media_portfolio_view_page"),
+}
+
+# Pages shown to visitors who are not logged in
+PUBLIC_PAGES = ("login", "register")
+
+DEFAULT_PAGE = "dashboard"
+
+
+def load_page(name):
+    """Page function for ``name``, importing its module on first use"""
+    module_name, function_name = PAGES[name]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def resolve_page(page, logged_in):
+    """Page to render for the requested page and login state"""
+    if not logged_in:
+        return "register" if page == "register" else "login"
+    if page in PUBLIC_PAGES or page not in PAGES:
+        return DEFAULT_PAGE
+    return page
+
+
+def set_page(page, state=None, clear=()):
+    """Button callback: switch page, and set or drop page state, before the next run"""
+    for key in clear:
+        st.session_state.pop(key, None)
+    for key, value in (state or {}).items():
+        st.session_state[key] = value
+    st.session_state["page"] = page
+
+
+def nav_button(label, page, state=None, clear=(), **kwargs):
+    """st.button that switches page in its on_click callback, so a click costs one run of the new page"""
+    # A click inside a fragment only reruns the fragment; callers there follow it with st.rerun()
+    return st.button(label, on_click=set_page, args=(page,),
+                     kwargs={"state": state, "clear": clear}, **kwargs)
@@ -0,0 +1,168 @@
+import os
+import streamlit as st
+import streamlit.components.v1 as components
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import activity
+import sessions
+import throttle
+from login import clear_session_profile, get_session_profile
+from views import nav_button
+
+# Sets or clears the session cookie from the browser; st.context can only read cookies
+SESSION_COOKIE_SCRIPT = """
+<script>
+const secure = window.parent.location.protocol === "https:" ? "; Secure" : "";
+window.parent.document.cookie = "{name}={value}; Max-Age={max_age}; Path=/; SameSite=Strict" + secure;
+</script>
+"""
+
+def queue_session_cookie(token):
+    """Write ``token`` to the session cookie on the next run; None clears it"""
+    st.session_state["session_cookie"] = token or ""
+
+def write_session_cookie():
+    """Emit a queued session cookie change, once"""
+    if "session_cookie" not in st.session_state:
+        return
+    token = st.session_state.pop("session_cookie")
+    max_age = int(sessions.SESSION_LIFETIME.total_seconds()) if token else 0
+    components.html(
+        SESSION_COOKIE_SCRIPT.format(name=sessions.SESSION_COOKIE, value=token, max_age=max_age),
+        height=0
+    )
+
+def restore_login():
+    """Sign in from the session cookie, once per browser session"""
+    if st.session_state.get("logged_in") or st.session_state.get("session_restore_checked"):
+        return
+    st.session_state["session_restore_checked"] = True
+    try:
+        token = st.context.cookies.get(sessions.SESSION_COOKIE)
+    except Exception:
+        return
+    if not token:
+        return
+
+    # A failed restore leaves the cookie alone: another tab may have just written it
+    session_user = sessions.get_session_user(token)
+    if session_user:
+        st.session_state["logged_in"] = True
+        st.session_state["username"] = session_user
+        st.session_state["session_token"] = token
+
+def handle_logout():
+    # Runs as the Logout button's on_click callback, so the next run already shows the login page
+    if st.session_state.get("username"):
+        activity.log_activity(st.session_state.username, "logout")
+    sessions.end_session(st.session_state.pop("session_token", None))
+    queue_session_cookie(None)
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+    st.session_state.page = "login"
+    st.session_state.pop("community_feed", None)
+    clear_session_profile()
+
+def get_trusted_proxy_hops():
+    """Reverse proxies in front of the app that append to X-Forwarded-For; 0 ignores the header"""
+    try:
+        return max(0, int(os.getenv("TRUSTED_PROXY_HOPS", "0")))
+    except ValueError:
+        return 0
+
+def get_remote_address():
+    """Peer address of this browser session's websocket connection"""
+    # st.context.ip_address only exists on newer Streamlit releases
+    ip_address = getattr(st.context, "ip_address", None)
+    if ip_address:
+        return ip_address
+    ctx = get_script_run_ctx()
+    if ctx is None or not runtime.exists():
+        return None
+    client = runtime.get_instance().get_client(ctx.session_id)
+    return getattr(getattr(client, "request", None), "remote_ip", None)
+
+def get_client_id():
+    """Best-effort client address for login throttling"""
+    try:
+        # Clients can write any X-Forwarded-For they like, so only the entries
+        # appended by our own proxies (counted from the right) are trusted
+        hops = get_trusted_proxy_hops()
+        forwarded = st.context.headers.get("X-Forwarded-For") if hops else None
+        if forwarded:
+            addresses = [address.strip() for address in forwarded.split(",") if address.strip()]
+            if len(addresses) >= hops:
+                return addresses[-hops]
+        return get_remote_address()
+    except Exception:
+        return None
+
+def login_page(go_to, verify_user, update_last_login):
+    st.title("Login")
+
+    username = st.text_input("Username")
+    password = st.text_input("Password", type="password")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("Login", type="primary", use_container_width=True):
+            if not username or not password:
+                st.error("Please enter both username and password")
+            else:
+                client_id = get_client_id()
+                block_reason = throttle.login_block_reason(username, client_id)
+                if block_reason:
+                    st.error(block_reason)
+                elif verify_user(username, password, client_id):
+                    st.session_state.logged_in = True
+                    st.session_state.username = username
+                    update_last_login(username)
+                    get_session_profile(username, refresh=True)
+                    token = sessions.create_session(username)
+                    if token:
+                        # Keeps the user signed in across reloads without putting the token in the URL
+                        st.session_state.session_token = token
+                        queue_session_cookie(token)
+                    st.success("Login successful!")
+                    go_to("dashboard")
+                else:
+                    st.error("Invalid credentials")
+
+    st.divider()
+
+    st.write("Don't have an account?")
+    nav_button("Register here", "register", use_container_width=True)
+
+def register_page(go_to, register_user):
+    st.title("Register")
+
+    username = st.text_input("Choose a username")
+    email = st.text_input("Email")
+    password = st.text_input(
+        "Choose a password",
+        type="password",
+        help="Must be at least 8 characters with uppercase, lowercase, number and special character",
+    )
+    confirm_password = st.text_input("Confirm password", type="password")
+
+    if password and confirm_password:
+        if password == confirm_password:
+            st.success("Passwords match")
+        else:
+            st.error("Passwords don't match")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("Register", type="primary", use_container_width=True):
+            success, message = register_user(username, password, email)
+            if success:
+                st.success(message)
+                st.balloons()  # Celebration animation
+                go_to("login")
+            else:
+                st.error(message)
+
+    with col2:
+        nav_button("Back to login", "login", use_container_width=True)
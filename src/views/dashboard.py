@@ -0,0 +1,373 @@
+import streamlit as st
+from datetime import datetime
+import time
+import pandas as pd
+import leaderboard
+from login import (
+    get_community_feed, get_session_profile, get_user_portfolio_summary, get_user_portfolios
+)
+from ui import (
+    COMMUNITY_FEED_PAGE_SIZE, COMMUNITY_FEED_TTL, COMMUNITY_RANKINGS, DASHBOARD_REFRESH_SECONDS,
+    POPULAR_HOLDINGS_SHOWN, STOCK_SYMBOLS_BY_COUNTRY, calculate_stock_prediction,
+    community_card, get_market_overview_data, get_market_overview_quotes, get_popular_holdings,
+    get_stock_data,
+    load_leaderboard_closes, prefetch_market_overview, prefetch_popular_symbols
+)
+from views import nav_button, set_page
+from views.auth import handle_logout
+
+def dashboard_page(go_to, get_user_info, change_password):
+    with st.sidebar:
+        st.header("Menu")
+        
+        st.subheader("Options")
+        
+        nav_button("Detailed Stock Analysis", "stock_analysis", use_container_width=True, key="sidebar_stock_analysis")
+        
+        nav_button("Portfolios", "portfolios", use_container_width=True)
+        
+        st.button("Logout", use_container_width=True, on_click=handle_logout)
+        
+        st.divider()
+        
+        st.subheader("Quick Info")
+    
+    prefetch_popular_symbols()
+
+    st.title("Dashboard")
+
+    # Loaded once per session; refreshed on login and password change
+    user_info = get_session_profile(st.session_state.username)
+
+    st.markdown(f"### Welcome back, **{st.session_state.username}**!")
+
+    if user_info and user_info.get("last_login"):
+        last_login = user_info["last_login"]
+        if isinstance(last_login, datetime):
+            last_login_formatted = last_login.strftime("%Y-%m-%d %H:%M:%S")
+
+    if user_info:
+        days_since = (
+            datetime.utcnow() - user_info.get("created_at", datetime.utcnow())
+        ).days
+
+    st.divider()
+
+    # Navigation stays outside the fragments: a click inside one reruns the fragment
+    # before the page can change, so every page change would cost two runs
+    # Aggregated once per full run for both sections; fragment reruns reuse the arguments
+    # of the last full run, and the summary only changes through actions that rerun the page
+    portfolio_summary = get_user_portfolio_summary(st.session_state.username)
+
+    dashboard_quick_actions(portfolio_summary)
+
+    st.divider()
+
+    dashboard_portfolios_section(go_to, portfolio_summary)
+
+    st.divider()
+
+    dashboard_community_section(go_to)
+
+    dashboard_community_details()
+
+    dashboard_popular_holdings()
+
+    st.divider()
+
+    dashboard_market_section()
+
+def dashboard_quick_actions(portfolio_summary):
+    st.subheader("Quick Actions")
+
+    if portfolio_summary["total_portfolios"] > 0:
+        action_col1, action_col2, action_col3 = st.columns(3)
+        with action_col1:
+            nav_button("Create New Portfolio", "create_portfolio", type="primary", use_container_width=True)
+        with action_col2:
+            nav_button("View All Portfolios", "portfolios", use_container_width=True)
+        with action_col3:
+            nav_button("Search Stocks", "stock_analysis", use_container_width=True)
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            nav_button("Create Your First Portfolio", "create_portfolio", type="primary", use_container_width=True)
+        with col2:
+            nav_button("Detailed Stock Analysis", "stock_analysis", use_container_width=True, key="dashboard_stock_analysis")
+
+def dashboard_community_details():
+    # Only offered when the community fragment listed portfolios to pick from
+    if st.session_state.get("community_card_owners"):
+        st.button("View Details", key="community_view_details", use_container_width=True,
+                  on_click=open_community_portfolio)
+
+def open_community_portfolio():
+    """View Details callback: open the community portfolio picked inside the community fragment"""
+    portfolio_id = st.session_state.get("community_selected")
+    owners = st.session_state.get("community_card_owners", {})
+    if portfolio_id in owners:
+        set_page("media_portfolio_view", state={
+            "media_portfolio_id": portfolio_id,
+            "media_portfolio_owner": owners[portfolio_id],
+        })
+
+@st.fragment(run_every=DASHBOARD_REFRESH_SECONDS["portfolios"])
+def dashboard_portfolios_section(go_to, portfolio_summary):
+    has_portfolios = portfolio_summary["total_portfolios"] > 0
+
+    st.subheader("Your Portfolios Summary")
+    
+    if has_portfolios:
+        # Totals come pre-aggregated from the database as one small document
+        total_portfolios = portfolio_summary["total_portfolios"]
+        total_stocks = portfolio_summary["total_stocks"]
+        total_invested = portfolio_summary["total_invested"]
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Portfolios", total_portfolios)
+        with col2:
+            st.metric("Total Stocks", total_stocks)
+        with col3:
+            st.metric("Total Invested", f"${total_invested:,.2f}")
+        with col4:
+            avg_portfolio_value = total_invested / total_portfolios if total_portfolios > 0 else 0
+            st.metric("Avg Portfolio", f"${avg_portfolio_value:,.2f}")
+        
+        st.divider()
+        
+        st.subheader("Portfolio Overview")
+        
+        user_portfolios = get_user_portfolios(st.session_state.username)
+        portfolio_data = []
+
+        for portfolio in user_portfolios:
+                stocks = portfolio.get('stocks', [])
+                stock_count = len(stocks)
+                countries = portfolio.get('countries', [])
+
+                invested = 0
+                for stock in stocks:
+                    purchase_price = stock.get('purchase_price', stock.get('price', 0))
+                    invested += purchase_price * stock.get('shares', 1)
+
+                predicted_value = 0
+                if stocks:
+                    for stock in stocks:
+                        try:
+                            # Two years of daily bars from the st.cache_data cache, so the
+                            # section's periodic reruns don't download history again
+                            hist_data = get_stock_data(stock['symbol'], 730)
+
+                            if not hist_data.empty and len(hist_data) >= 30:
+                                price_data = hist_data['Close'].dropna()
+
+                                prediction = calculate_stock_prediction(price_data, future_days=365)
+
+                                if prediction:
+                                    predicted_price = prediction['predicted_price']
+                                    shares = stock.get('shares', 1)
+                                    predicted_value += predicted_price * shares
+                                else:
+                                    current_price = stock.get('price', 0)
+                                    shares = stock.get('shares', 1)
+                                    predicted_value += current_price * shares
+                            else:
+                                current_price = stock.get('price', 0)
+                                shares = stock.get('shares', 1)
+                                predicted_value += current_price * shares
+                        except Exception as e:
+                            current_price = stock.get('price', 0)
+                            shares = stock.get('shares', 1)
+                            predicted_value += current_price * shares
+
+                predicted_change = predicted_value - invested
+                predicted_change_pct = (predicted_change / invested * 100) if invested > 0 else 0
+
+                top_holdings = []
+                for stock in stocks[:3]:
+                    purchase_price = stock.get('purchase_price', stock.get('price', 0))
+                    stock_value = purchase_price * stock.get('shares', 1)
+                    top_holdings.append(f"{stock.get('symbol', 'N/A')} ({stock.get('shares', 1)} shares)")
+
+                top_holdings_str = ", ".join(top_holdings) if top_holdings else "No stocks"
+                if len(stocks) > 3:
+                    top_holdings_str += f" + {len(stocks) - 3} more"
+
+                portfolio_data.append({
+                    "Portfolio Name": portfolio.get('portfolio_name', 'Unnamed Portfolio'),
+                    "Total Value": f"${invested:,.2f}",
+                    "Predicted Value (1Y)": f"${predicted_value:,.2f}",
+                    "Expected Change": f"{predicted_change_pct:+.1f}%",
+                    "Stocks": stock_count,
+                    "Markets": ", ".join(countries) if countries else "N/A",
+                    "Top Holdings": top_holdings_str
+                })
+        
+        if portfolio_data:
+            df = pd.DataFrame(portfolio_data)
+            st.dataframe(df, use_container_width=True, hide_index=True)
+                
+    else:
+        st.info("You don't have any portfolios yet. Create one to get started!")
+
+@st.fragment(run_every=DASHBOARD_REFRESH_SECONDS["community"])
+def dashboard_community_section(go_to):
+    st.subheader("Community Portfolios")
+
+    # Keeps the materialized leaderboard current without blocking this render
+    leaderboard.start_background_refresh(load_leaderboard_closes)
+
+    rank_by = st.radio(
+        "Rank by",
+        list(COMMUNITY_RANKINGS.keys()),
+        horizontal=True,
+        key="community_rank_by"
+    )
+    ranking = COMMUNITY_RANKINGS[rank_by]
+
+    if ranking is None:
+        community_feed = st.session_state.get("community_feed")
+        if community_feed is None or time.time() - community_feed["loaded_at"] > COMMUNITY_FEED_TTL:
+            items, cursor = get_community_feed(st.session_state.username, limit=COMMUNITY_FEED_PAGE_SIZE)
+            st.session_state.community_feed = {"items": items, "cursor": cursor, "loaded_at": time.time()}
+
+        community_feed = st.session_state.community_feed
+        entries = leaderboard.get_entries([p['_id'] for p in community_feed["items"]])
+        community_cards = [
+            community_card(portfolio, entries.get(portfolio['_id']))
+            for portfolio in community_feed["items"]
+        ]
+    else:
+        community_feed = None
+        community_cards = [
+            community_card(None, entry)
+            for entry in leaderboard.get_leaderboard_page(
+                st.session_state.username, rank_by=ranking, limit=COMMUNITY_FEED_PAGE_SIZE
+            )
+        ]
+
+    if community_cards:
+        for card in community_cards:
+            with st.container():
+                col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+
+                with col1:
+                    st.write(f"**{card['owner']}**")
+                    if card['created_at']:
+                        st.caption(f"Created: {card['created_at'].strftime('%Y-%m-%d')}")
+
+                with col2:
+                    if ranking == "real_return":
+                        st.metric("Current Value", f"${card['current_value']:,.2f}", f"{card['real_return_pct']:+.1f}%")
+                    else:
+                        st.metric("Purchase Value", f"${card['purchase_value']:,.2f}")
+
+                with col3:
+                    if card['ranked']:
+                        st.metric("Predicted Value (1Y)", f"${card['predicted_value']:,.2f}", f"{card['predicted_change_pct']:+.1f}%")
+                    else:
+                        st.metric("Predicted Value (1Y)", "Pending")
+
+                with col4:
+                    st.metric("Stocks", card['stock_count'])
+
+            if card['top_symbols']:
+                holdings_text = "Holdings: " + ", ".join(card['top_symbols'])
+                if card['stock_count'] > 3:
+                    holdings_text += f" +{card['stock_count'] - 3} more"
+                st.caption(holdings_text)
+
+            st.markdown("---")
+
+        if community_feed is not None and community_feed["cursor"] is not None:
+            if st.button("Load more", key="community_feed_more", use_container_width=True):
+                items, cursor = get_community_feed(
+                    st.session_state.username,
+                    limit=COMMUNITY_FEED_PAGE_SIZE,
+                    after=community_feed["cursor"]
+                )
+                community_feed["items"].extend(items)
+                community_feed["cursor"] = cursor
+                st.rerun(scope="fragment")
+
+        # Picking only reruns this fragment; the View Details button below it does the navigation
+        owners = {str(card['_id']): card['owner'] for card in community_cards}
+        st.session_state.community_card_owners = owners
+        st.selectbox(
+            "Community portfolio",
+            list(owners),
+            format_func=lambda portfolio_id: f"{owners[portfolio_id]} ({portfolio_id[-6:]})",
+            key="community_selected"
+        )
+    else:
+        st.session_state.community_card_owners = {}
+        st.info("No community portfolios to show yet.")
+
+def dashboard_popular_holdings():
+    st.subheader("Most Held by the Community")
+
+    popular_holdings = get_popular_holdings()[:POPULAR_HOLDINGS_SHOWN]
+    if popular_holdings:
+        popular_df = pd.DataFrame([
+            {"Symbol": item["symbol"], "Holders": item["holders"], "Portfolios": item["portfolios"]}
+            for item in popular_holdings
+        ])
+        st.dataframe(popular_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No holdings to rank yet.")
+
+@st.fragment(run_every=DASHBOARD_REFRESH_SECONDS["market"])
+def dashboard_market_section():
+    st.subheader("Global Stock Market Dashboard")
+
+    # Only the selected market is downloaded; the rest are prefetched afterwards
+    country = st.radio(
+        "Market",
+        list(STOCK_SYMBOLS_BY_COUNTRY.keys()),
+        horizontal=True,
+        key="market_overview_country",
+        label_visibility="collapsed"
+    )
+    # Daily history for the charts is cached for a day; prices come from the short-lived quotes
+    country_data = get_market_overview_data(country)
+    quotes = get_market_overview_quotes(country)
+
+    st.write(f"### {country} Stock Market")
+
+    if country_data:
+        cols = st.columns(3)  # 3 columns for the grid (6 stocks = 2 rows)
+        
+        for idx, (symbol, data) in enumerate(country_data.items()):
+            with cols[idx % 3]:  # Distribute across 3 columns
+                try:
+                    if isinstance(data, pd.DataFrame) and not data.empty:
+                        quote = quotes.get(symbol)
+                        if quote:
+                            price, prev_close = quote["price"], quote["previous_close"]
+                        else:
+                            price = float(data["Close"].iloc[-1])
+                            prev_close = float(data["Close"].iloc[-2]) if len(data) > 1 else price
+                        
+                        change = price - prev_close
+                        change_pct = (change / prev_close) * 100 if prev_close != 0 else 0
+                        
+                        with st.container():
+                            st.markdown(f"**{symbol}**")
+                            
+                            st.metric("Price", f"${price:.2f}", delta=f"{change_pct:+.2f}%")
+                            
+                            if 'Close' in data.columns and len(data) > 1:
+                                chart_data = data['Close'].tail(365).round(2)  # Show only last 365 days, rounded to 2dp
+                                st.line_chart(chart_data, height=150)
+                            
+                            st.markdown("---")
+                            
+                except Exception as e:
+                    with st.container():
+                        st.error(f"Error loading {symbol}: {str(e)}")
+                        st.markdown("---")
+    else:
+        st.warning(f"Unable to load {country} stock data. Please check your internet connection.")
+
+    prefetch_market_overview(exclude=country)
@@ -0,0 +1,840 @@
+import streamlit as st
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from login import (
+    create_portfolio, get_portfolio_by_id, get_user_portfolios, update_portfolio,
+    update_portfolio_holdings
+)
+from ui import (
+    calculate_stock_prediction, chart_points, render_holdings_layout, render_predictions_layout,
+    show_delete_confirmation_popup, stream_holding_quotes
+)
+from views import nav_button, set_page
+from views.auth import handle_logout
+
+def portfolios_page(go_to, get_user_info, change_password):
+    with st.sidebar:
+        st.header("Portfolio Manager")
+        
+        st.subheader("Actions")
+        
+        nav_button("Create New Portfolio", "create_portfolio", use_container_width=True)
+        
+        nav_button("Portfolio Analytics", "portfolio_analytics", use_container_width=True,
+                   clear=("analytics_portfolio_id",))
+
+        st.divider()
+        
+        nav_button("← Back to Dashboard", "dashboard", use_container_width=True)
+        
+        nav_button("Stock Analysis", "stock_analysis", use_container_width=True)
+        
+        st.button("Logout", use_container_width=True, on_click=handle_logout)
+    
+    st.title("Portfolio Management")
+    
+    st.header("Summary")
+
+    user_portfolios = get_user_portfolios(st.session_state.username)
+    
+    sample_portfolios = []
+    for portfolio in user_portfolios:
+        total_value = sum(stock.get('price', 0) * stock.get('shares', 1) for stock in portfolio.get('stocks', []))
+        
+        sample_portfolios.append({
+            "_id": str(portfolio['_id']),
+            "name": portfolio['portfolio_name'],
+            "created": portfolio['created_at'].strftime('%Y-%m-%d') if portfolio.get('created_at') else "Unknown",
+            "value": total_value,
+            "change": 0,  # Placeholder - would calculate from historical data
+            "change_pct": 0,  # Placeholder - would calculate from historical data
+            "stocks": [stock['symbol'] for stock in portfolio.get('stocks', [])]
+        })
+    
+    if sample_portfolios:
+        total_value = sum(p["value"] for p in sample_portfolios)
+        total_change = sum(p["change"] for p in sample_portfolios)
+        
+        denominator = total_value - total_change
+        if denominator != 0 and total_value != 0:
+            total_change_pct = (total_change / denominator) * 100
+        else:
+            total_change_pct = 0
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Portfolio Value", f"${total_value:,.2f}", f"{total_change:+.2f} ({total_change_pct:+.2f}%)")
+        with col2:
+            st.metric("Number of Portfolios", len(sample_portfolios))
+        with col3:
+            best_performer = max(sample_portfolios, key=lambda p: p["change_pct"])
+            st.metric("Best Performer", best_performer["name"], f"{best_performer['change_pct']:+.2f}%")
+        with col4:
+            st.metric("Active Portfolios", len([p for p in sample_portfolios if p.get('value', 0) > 0]))
+    else:
+        st.info("You don't have any portfolios yet. Create one to get started!")
+    
+    st.divider()
+    
+    st.header("My Portfolios")
+    
+    if sample_portfolios:
+        sorted_portfolios = sorted(sample_portfolios, key=lambda p: p['value'], reverse=True)
+        
+        for portfolio in sorted_portfolios:
+            with st.container():
+                col1, col2 = st.columns([3, 2])
+                
+                with col1:
+                    st.markdown(f"### {portfolio['name']}")
+                    st.write(f"**Created:** {portfolio['created']}")
+                    st.write(f"**Holdings:** {', '.join(portfolio['stocks'])}")
+                
+                with col2:
+                    st.metric(
+                        "Current Value",
+                        f"${portfolio['value']:.2f}",
+                        f"{portfolio['change']:+.2f} ({portfolio['change_pct']:+.2f}%)"
+                    )
+                
+                col_view, col_edit, col_share, col_delete = st.columns(4)
+                with col_view:
+                    nav_button(f"View", "portfolio_details", key=f"view_{portfolio['name']}",
+                               state={"view_portfolio_id": portfolio['_id'],
+                                      "view_portfolio_name": portfolio['name']})
+                
+                with col_edit:
+                    nav_button(f"Edit", "edit_portfolio", key=f"edit_{portfolio['name']}",
+                               state={"edit_portfolio_id": portfolio['_id'],
+                                      "edit_portfolio_name": portfolio['name']})
+                
+                with col_share:
+                    if st.button(f"Share", key=f"share_{portfolio['name']}"):
+                        st.session_state.share_portfolio = {
+                            '_id': portfolio['_id'],
+                            'name': portfolio['name'],
+                            'value': portfolio['value'],
+                            'stocks': portfolio['stocks']
+                        }
+                
+                with col_delete:
+                    if st.button(f"Delete", key=f"delete_{portfolio['name']}", type="secondary"):
+                        st.session_state.confirm_delete_portfolio = portfolio['_id']
+                        st.session_state.confirm_delete_name = portfolio['name']
+                        st.rerun()
+                
+                if st.session_state.get('share_portfolio') and st.session_state.share_portfolio['_id'] == portfolio['_id']:
+                    with st.expander(f"Share Portfolio: {portfolio['name']}", expanded=True):
+                        st.write("**Share your portfolio with others:**")
+                        
+                        share_data = st.session_state.share_portfolio
+                        
+                        portfolio_url = f"https://yourapp.com/shared-portfolio/{share_data['_id']}"
+                        
+                        share_text = f"""
+Investment Portfolio Template: "{share_data['name']}"
+
+Portfolio Composition:
+{len(share_data['stocks'])} stocks: {', '.join(share_data['stocks'])}
+
+Create your own version of this portfolio!
+View Template: {portfolio_url}
+                        """.strip()
+                        
+                        
+                        col_share_left, col_share_right = st.columns(2)
+                        
+                        with col_share_left:
+                            st.write("**Share Portfolio Template**")
+                            st.text_area("Portfolio Template Message", value=share_text, height=120, key=f"share_text_{share_data['_id']}")
+                            
+                            col_copy, col_close = st.columns(2)
+                            with col_copy:
+                                if st.button("Copy Template", key=f"copy_template_{share_data['_id']}", type="primary"):
+                                    st.success("Portfolio template copied to clipboard!")
+                            
+                            with col_close:
+                                if st.button("Close", key=f"close_share_{share_data['_id']}"):
+                                    del st.session_state.share_portfolio
+                                    st.rerun()
+                        
+                        with col_share_right:
+                            st.write("**Portfolio Composition**")
+                            st.write("**Stock Holdings:**")
+                            for stock in share_data['stocks']:
+                                st.write(f"• {stock}")
+                            
+                            st.write("---")
+                            st.write("**What others get:**")
+                            
+                            st.write("**Share URL:**")
+                            st.code(portfolio_url, language=None)
+                            
+                            if st.button("Generate Share Link", key=f"generate_link_{share_data['_id']}"):
+                                st.success("Shareable link generated!")
+                
+                st.markdown("---")
+    
+    if st.session_state.get('confirm_delete_portfolio'):
+        show_delete_confirmation_popup()
+    
+    if st.session_state.get("show_create_form", False):
+        st.subheader("Create New Portfolio")
+        
+        with st.form("create_portfolio"):
+            portfolio_name = st.text_input("Portfolio Name", placeholder="e.g., Tech Growth Portfolio")
+            portfolio_desc = st.text_area("Description (Optional)", placeholder="Brief description of your investment strategy")
+            
+            st.write("**Select Initial Stocks (Optional):**")
+            available_stocks = ["AAPL", "GOOGL", "AMZN", "MSFT", "TSLA", "META", "NFLX", "NVDA"]
+            selected_stocks = st.multiselect("Choose stocks to add", available_stocks)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.form_submit_button("Create Portfolio", type="primary"):
+                    if portfolio_name:
+                        st.success(f"Portfolio '{portfolio_name}' created successfully!")
+                        st.balloons()
+                        st.session_state.show_create_form = False
+                        st.rerun()
+                    else:
+                        st.error("Please enter a portfolio name")
+            
+            with col2:
+                if st.form_submit_button("Cancel"):
+                    st.session_state.show_create_form = False
+                    st.rerun()
+    
+    if st.session_state.get("show_analytics", False):
+        st.subheader("Portfolio Analytics & Predictions")
+
+        if not user_portfolios:
+            if st.button("Hide Analytics"):
+                st.session_state.show_analytics = False
+                st.rerun()
+        else:
+            all_stocks = []
+            for portfolio in user_portfolios:
+                for stock in portfolio.get('stocks', []):
+                    stock_info = {
+                        'symbol': stock['symbol'],
+                        'name': stock.get('name', stock['symbol']),
+                        'shares': stock.get('shares', 1),
+                        'purchase_price': stock.get('purchase_price', stock.get('price', 0)),
+                        'portfolio_name': portfolio['portfolio_name']
+                    }
+                    all_stocks.append(stock_info)
+
+            if not all_stocks:
+                if st.button("Hide Analytics"):
+                    st.session_state.show_analytics = False
+                    st.rerun()
+            else:
+                st.subheader("Overall Portfolio Value Prediction")
+
+                total_current_value = 0
+                total_predicted_value = 0
+                portfolio_predictions = []
+
+                for stock_info in all_stocks:
+                    try:
+                        ticker = yf.Ticker(stock_info['symbol'])
+                        hist_data = ticker.history(period="2y")
+
+                        if not hist_data.empty and len(hist_data) >= 30:
+                            price_data = hist_data['Close'].dropna()
+
+                            prediction = calculate_stock_prediction(price_data, future_days=365)
+
+                            if prediction:
+                                current_price = prediction['current_price']
+                                predicted_price = prediction['predicted_price']
+                                shares = stock_info['shares']
+
+                                current_stock_value = current_price * shares
+                                predicted_stock_value = predicted_price * shares
+
+                                total_current_value += current_stock_value
+                                total_predicted_value += predicted_stock_value
+
+                                portfolio_predictions.append({
+                                    'symbol': stock_info['symbol'],
+                                    'name': stock_info['name'],
+                                    'shares': shares,
+                                    'current_price': current_price,
+                                    'predicted_price': predicted_price,
+                                    'current_value': current_stock_value,
+                                    'predicted_value': predicted_stock_value,
+                                    'prediction': prediction
+                                })
+                    except Exception as e:
+                        st.warning(f"Could not analyze {stock_info['symbol']}: {str(e)}")
+                        continue
+
+                if portfolio_predictions:
+                    value_change = total_predicted_value - total_current_value
+                    value_change_pct = (value_change / total_current_value * 100) if total_current_value > 0 else 0
+
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Current Portfolio Value", f"${total_current_value:,.2f}")
+                    with col2:
+                        st.metric("Predicted Value (1 Year)", f"${total_predicted_value:,.2f}", f"{value_change:+,.2f} ({value_change_pct:+.2f}%)")
+                    with col3:
+                        trend = "Upward" if value_change > 0 else "Downward"
+                        st.metric("Trend", trend)
+
+                    st.divider()
+
+                    st.subheader("Individual Stock Predictions")
+
+                    for pred in portfolio_predictions:
+                        with st.expander(f"{pred['symbol']} - {pred['name']}", expanded=False):
+                            stock_change = pred['predicted_price'] - pred['current_price']
+                            stock_change_pct = (stock_change / pred['current_price'] * 100) if pred['current_price'] > 0 else 0
+
+                            col1, col2, col3 = st.columns(3)
+                            with col1:
+                                st.metric("Current Price", f"${pred['current_price']:.2f}")
+                            with col2:
+                                st.metric("Predicted Price (1 Year)", f"${pred['predicted_price']:.2f}", f"{stock_change:+.2f} ({stock_change_pct:+.2f}%)")
+                            with col3:
+                                st.metric("Total Value Change", f"${pred['predicted_value'] - pred['current_value']:+,.2f}")
+
+                            st.write("**Price Prediction Chart**")
+
+                            if 'prediction' in pred:
+                                st.line_chart(pd.DataFrame({
+                                    'Predicted Price': pred['prediction']['future_predictions']
+                                }), height=300)
+                else:
+                    st.warning("Could not generate predictions. Make sure your stocks have sufficient historical data.")
+
+                st.divider()
+
+                if st.button("Hide Analytics"):
+                    st.session_state.show_analytics = False
+                    st.rerun()
+
+def create_portfolio_page(go_to, get_user_info, change_password):
+    with st.sidebar:
+        st.header("Create New Portfolio")
+        
+        st.divider()
+        
+        nav_button("← Back to Portfolios", "portfolios", use_container_width=True)
+        
+        nav_button("Dashboard", "dashboard", use_container_width=True)
+        
+        st.button("Logout", use_container_width=True, on_click=handle_logout)
+    
+    st.title("Create New Portfolio")
+    st.markdown("### Let's build your investment portfolio step by step")
+    
+    st.divider()
+    
+    with st.form("create_portfolio_form", clear_on_submit=False):
+        
+        st.subheader("Which countries would you like to invest in?")
+        
+        countries = [
+            "United States", "Canada", "United Kingdom", "Germany", "France", 
+            "Japan", "Australia", "South Korea", "India", "China", 
+            "Brazil", "Netherlands", "Switzerland", "Sweden", "Denmark"
+        ]
+        
+        selected_countries = st.multiselect(
+            "Select countries/regions for investment",
+            options=countries,
+            default=["United States"],
+            help="Choose the countries where you'd like to invest. This will help us recommend appropriate stocks and ETFs."
+        )
+        
+        st.divider()
+        
+        st.subheader("Portfolio Details")
+        portfolio_name = st.text_input(
+            "Portfolio Name", 
+            placeholder="e.g., My Global Growth Portfolio",
+            help="Give your portfolio a memorable name"
+        )
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            submitted = st.form_submit_button("Create Portfolio", type="primary", use_container_width=True)
+        
+        with col2:
+            st.form_submit_button("Cancel", use_container_width=True, on_click=set_page, args=("portfolios",))
+    
+    if submitted:
+        if portfolio_name and selected_countries:
+
+            portfolio_data = {
+                'name': portfolio_name,
+                'countries': selected_countries,
+                'stocks': []
+            }
+            
+            success, message = create_portfolio(st.session_state.username, portfolio_data)
+            
+            if success:
+                st.success("Portfolio created successfully!")
+                st.balloons()
+                
+                st.subheader("Portfolio Summary")
+                st.write(f"**Name:** {portfolio_name}")
+                st.write(f"**Countries:** {', '.join(selected_countries)}")
+                
+
+                user_portfolios = get_user_portfolios(st.session_state.username)
+
+                if user_portfolios:
+                    latest_portfolio = user_portfolios[0]  # Sorted by created_at desc
+                    st.session_state.current_portfolio = portfolio_data
+                    st.session_state.current_portfolio['_id'] = str(latest_portfolio['_id'])
+                else:
+                    st.session_state.current_portfolio = portfolio_data
+                    st.session_state.current_portfolio['_id'] = 'temp_id'
+
+                go_to("my_stocks")
+            else:
+                st.error(f"{message}")
+            
+        else:
+            st.error("Please fill in all required fields (Portfolio name and at least one country)")
+
+def edit_portfolio_page(go_to, get_user_info, change_password):
+    if 'edit_portfolio_id' not in st.session_state:
+        st.error("No portfolio selected for editing")
+        go_to("portfolios")
+        return
+
+    portfolio_id = st.session_state.edit_portfolio_id
+    portfolio = get_portfolio_by_id(portfolio_id)
+    
+    if not portfolio:
+        st.error("Portfolio not found")
+        go_to("portfolios")
+        return
+    
+    with st.sidebar:
+        st.header("Edit Portfolio")
+        
+        st.write(f"**Portfolio:** {portfolio['portfolio_name']}")
+        
+        st.divider()
+        
+        st.subheader("Actions")
+        
+        search_portfolio = {
+            '_id': portfolio_id,
+            'name': portfolio['portfolio_name'],
+            'countries': portfolio['countries'],
+            'stocks': portfolio.get('stocks', [])
+        }
+        nav_button(" Add More Stocks", "stock_search", use_container_width=True, type="primary",
+                   state={"current_portfolio": search_portfolio})
+        
+        st.divider()
+        
+        nav_button("← Back to Portfolios", "portfolios", use_container_width=True)
+        
+        nav_button("Dashboard", "dashboard", use_container_width=True)
+    
+    st.title("Edit Portfolio")
+    
+    st.subheader("Portfolio Information")
+    
+    col_name, col_name_btn = st.columns([3, 1])
+    with col_name:
+        if st.session_state.get('editing_portfolio_name'):
+            new_portfolio_name = st.text_input(
+                "Portfolio Name",
+                value=portfolio['portfolio_name'],
+                key="portfolio_name_input",
+                help="Enter the new name for your portfolio"
+            )
+        else:
+            st.markdown(f"**Current Name:** {portfolio['portfolio_name']}")
+    
+    with col_name_btn:
+        st.write("") # Spacing
+        if st.session_state.get('editing_portfolio_name'):
+            col_save, col_cancel = st.columns(2)
+            with col_save:
+                if st.button("Save", key="save_name"):
+                    if 'portfolio_name_input' in st.session_state and st.session_state.portfolio_name_input.strip():
+                        success, message = update_portfolio(portfolio_id, {'portfolio_name': st.session_state.portfolio_name_input.strip()})
+                        
+                        if success:
+                            st.success(f"Portfolio name updated to '{st.session_state.portfolio_name_input}'!")
+                            st.session_state.editing_portfolio_name = False
+                            st.balloons()
+                            st.rerun()
+                        else:
+                            st.error(f"Failed to update name: {message}")
+                    else:
+                        st.error("Please enter a valid portfolio name")
+            
+            with col_cancel:
+                if st.button("Cancel", key="cancel_name"):
+                    st.session_state.editing_portfolio_name = False
+                    st.rerun()
+        else:
+            if st.button("Edit Name", key="edit_name"):
+                st.session_state.editing_portfolio_name = True
+                st.rerun()
+    
+    st.divider()
+    
+    st.subheader("Portfolio Summary")
+    total_value = sum(stock.get('price', 0) * stock.get('shares', 1) for stock in portfolio.get('stocks', []))
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Current Value", f"${total_value:.2f}")
+    with col2:
+        st.metric("Number of Stocks", len(portfolio.get('stocks', [])))
+    
+    st.divider()
+    
+    st.subheader("Manage Stocks")
+    
+    if portfolio.get('stocks'):
+        stocks = portfolio['stocks']
+        
+        if 'stock_changes' not in st.session_state:
+            st.session_state.stock_changes = {}
+        
+        for idx, stock in enumerate(stocks):
+            with st.container():
+                col1, col2, col3, col4, col5 = st.columns([3, 1.5, 1, 1.5, 1])
+                
+                with col1:
+                    st.write(f"**{stock['symbol']}**")
+                
+                with col2:
+                    st.write(f"${stock.get('price', 0):.2f}")
+                
+                with col3:
+                    current_shares = stock.get('shares', 1)
+                    new_shares = st.number_input(
+                        "Shares",
+                        min_value=0,
+                        max_value=10000,
+                        value=current_shares,
+                        key=f"shares_{stock['symbol']}_{idx}",
+                        help="Set to 0 to remove stock"
+                    )
+                    
+                    if new_shares != current_shares:
+                        st.session_state.stock_changes[stock['symbol']] = new_shares
+                    elif st.session_state.stock_changes.get(stock['symbol']):
+                        # Edited back to the stored count, so there is nothing to save
+                        del st.session_state.stock_changes[stock['symbol']]
+                
+                with col4:
+                    shares_to_use = st.session_state.stock_changes.get(stock['symbol'], current_shares)
+                    total_stock_value = stock.get('price', 0) * shares_to_use
+                    st.write(f"${total_stock_value:.2f}")
+                
+                with col5:
+                    if st.button("Remove", key=f"remove_{stock['symbol']}_{idx}"):
+                        st.session_state.stock_changes[stock['symbol']] = 0
+                
+                st.markdown("---")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Save Changes", type="primary", use_container_width=True):
+                # Only the edited holdings are sent, so concurrent additions survive
+                success, message = update_portfolio_holdings(portfolio_id, st.session_state.stock_changes)
+                
+                if success:
+                    st.success("Portfolio updated successfully!")
+                    st.session_state.stock_changes = {}  # Clear changes
+                    st.balloons()
+                else:
+                    st.error(f"Failed to update portfolio: {message}")
+        
+        with col2:
+            if st.button("Cancel Changes", use_container_width=True):
+                st.session_state.stock_changes = {}  # Clear changes
+    
+    else:
+        
+        search_portfolio = {
+            '_id': portfolio_id,
+            'name': portfolio['portfolio_name'],
+            'countries': portfolio['countries'],
+            'stocks': []
+        }
+        nav_button("Add Your First Stock", "stock_search", type="primary", use_container_width=True,
+                   state={"current_portfolio": search_portfolio})
+
+def portfolio_details_page(go_to, get_user_info, change_password):
+    """Render detailed portfolio view with stock performance analysis"""
+    
+    if 'view_portfolio_id' not in st.session_state:
+        st.error("No portfolio selected for viewing")
+        go_to("portfolios")
+        return
+    
+    portfolio_id = st.session_state.view_portfolio_id
+    portfolio = get_portfolio_by_id(portfolio_id)
+    
+    if not portfolio:
+        st.error("Portfolio not found")
+        go_to("portfolios")
+        return
+    
+    with st.sidebar:
+        st.header("Portfolio Details")
+        
+        st.write(f"**Portfolio:** {portfolio['portfolio_name']}")
+        st.write(f"**Created:** {portfolio['created_at'].strftime('%Y-%m-%d') if portfolio.get('created_at') else 'Unknown'}")
+        
+        st.divider()
+        
+        st.subheader("Actions")
+        
+        nav_button("Edit Portfolio", "edit_portfolio", use_container_width=True, type="primary",
+                   state={"edit_portfolio_id": portfolio_id,
+                          "edit_portfolio_name": portfolio['portfolio_name']})
+
+        nav_button(" Portfolio Analytics", "portfolio_analytics", use_container_width=True,
+                   state={"analytics_portfolio_id": portfolio_id})
+
+        st.divider()
+
+        nav_button("← Back to Portfolios", "portfolios", use_container_width=True)
+        
+        nav_button("Dashboard", "dashboard", use_container_width=True)
+    
+    st.title("Portfolio Details")
+    st.markdown(f"### {portfolio['portfolio_name']}")
+    
+    stocks = portfolio.get('stocks', [])
+    
+    if not stocks:
+        search_portfolio = {
+            '_id': portfolio_id,
+            'name': portfolio['portfolio_name'],
+            'countries': portfolio['countries'],
+            'stocks': []
+        }
+        nav_button("Add Stocks", "stock_search", type="primary",
+                   state={"current_portfolio": search_portfolio})
+        return
+    
+    slots = render_holdings_layout(stocks, history_buttons=True)
+
+    show_analytics = st.session_state.get("show_portfolio_details_analytics", False)
+    if show_analytics:
+        st.divider()
+        st.subheader("Portfolio Analytics & Predictions")
+        st.subheader("Overall Portfolio Value Prediction")
+        render_predictions_layout(stocks, slots)
+
+        if st.button("Hide Analytics"):
+            st.session_state.show_portfolio_details_analytics = False
+            st.rerun()
+
+    stream_holding_quotes(stocks, slots, with_predictions=show_analytics)
+
+def portfolio_analytics_page(go_to, get_user_info, change_password):
+    """Render portfolio analytics page with predictions"""
+
+    with st.sidebar:
+        st.header("Portfolio Analytics")
+
+        st.divider()
+
+        nav_button("← Back to Portfolios", "portfolios", use_container_width=True)
+
+        nav_button("Dashboard", "dashboard", use_container_width=True)
+
+        st.button("Logout", use_container_width=True, on_click=handle_logout)
+
+    st.title("Portfolio Analytics & Predictions")
+
+    if 'analytics_portfolio_id' in st.session_state:
+        portfolio_id = st.session_state.analytics_portfolio_id
+        portfolio = get_portfolio_by_id(portfolio_id)
+
+        if not portfolio:
+            st.error("Portfolio not found")
+            nav_button("Back to Portfolios", "portfolios")
+            return
+
+        st.markdown(f"### Analyzing: {portfolio['portfolio_name']}")
+        stocks = portfolio.get('stocks', [])
+
+    else:
+        st.markdown("### Analyzing: All Portfolios")
+        user_portfolios = get_user_portfolios(st.session_state.username)
+
+        if not user_portfolios:
+            return
+
+        stocks = []
+        for portfolio in user_portfolios:
+            for stock in portfolio.get('stocks', []):
+                stocks.append(stock)
+
+    if not stocks:
+        nav_button("Go to Stock Search", "stock_search")
+        return
+
+    st.subheader("Overall Portfolio Value Prediction")
+
+    total_current_value = 0
+    total_predicted_value = 0
+    portfolio_predictions = []
+
+    for stock in stocks:
+        try:
+            ticker = yf.Ticker(stock['symbol'])
+            hist_data = ticker.history(period="2y")
+
+            if not hist_data.empty and len(hist_data) >= 30:
+                price_data = hist_data['Close'].dropna()
+
+                X = np.arange(len(price_data)).reshape(-1, 1)
+                y = price_data.values
+                coefficients = np.polyfit(X.flatten(), y, 1)
+                slope = coefficients[0]
+                intercept = coefficients[1]
+
+                future_days = 365
+                future_X = len(price_data) + future_days
+                predicted_price = slope * future_X + intercept
+
+                current_price = price_data.iloc[-1]
+                shares = stock.get('shares', 1)
+
+                current_stock_value = current_price * shares
+                predicted_stock_value = predicted_price * shares
+
+                total_current_value += current_stock_value
+                total_predicted_value += predicted_stock_value
+
+                portfolio_predictions.append({
+                    'symbol': stock['symbol'],
+                    'name': stock.get('name', stock['symbol']),
+                    'shares': shares,
+                    'current_price': current_price,
+                    'predicted_price': predicted_price,
+                    'current_value': current_stock_value,
+                    'predicted_value': predicted_stock_value,
+                    'slope': slope,
+                    'historical_data': price_data
+                })
+        except Exception as e:
+            st.warning(f"Could not analyze {stock['symbol']}: {str(e)}")
+            continue
+
+    if portfolio_predictions:
+        value_change = total_predicted_value - total_current_value
+        value_change_pct = (value_change / total_current_value * 100) if total_current_value > 0 else 0
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Current Portfolio Value", f"${total_current_value:,.2f}")
+        with col2:
+            st.metric("Predicted Value (1 Year)", f"${total_predicted_value:,.2f}", f"{value_change:+,.2f} ({value_change_pct:+.2f}%)")
+        with col3:
+            trend = "Upward" if value_change > 0 else "Downward"
+            st.metric("Trend", trend)
+
+        st.divider()
+
+        st.subheader("Individual Stock Predictions")
+
+        for pred in portfolio_predictions:
+            with st.expander(f"{pred['symbol']} - {pred['name']}", expanded=False):
+                stock_change = pred['predicted_price'] - pred['current_price']
+                stock_change_pct = (stock_change / pred['current_price'] * 100) if pred['current_price'] > 0 else 0
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Current Price", f"${pred['current_price']:.2f}")
+                with col2:
+                    st.metric("Predicted Price (1 Year)", f"${pred['predicted_price']:.2f}",
+                             f"{stock_change:+.2f} ({stock_change_pct:+.2f}%)")
+                with col3:
+                    st.metric("Total Value Change", f"${pred['predicted_value'] - pred['current_value']:+,.2f}")
+
+                st.write("**Price Prediction Chart**")
+
+                lookback_days = min(365, len(pred['historical_data']))
+                recent_data = pred['historical_data'].tail(lookback_days)
+                recent_dates = recent_data.index
+
+                last_date = recent_dates[-1]
+                future_dates = pd.date_range(start=last_date + timedelta(days=1),
+                                             periods=365, freq='D')
+
+                future_X = np.arange(len(pred['historical_data']), len(pred['historical_data']) + 365)
+                coefficients_full = np.polyfit(np.arange(len(pred['historical_data'])), pred['historical_data'].values, 1)
+                future_predictions = coefficients_full[0] * future_X + coefficients_full[1]
+
+                combined_dates = list(recent_dates) + list(future_dates)
+                combined_actual = list(recent_data.values) + [None] * 365
+                combined_predicted = [None] * lookback_days + list(future_predictions)
+
+                chart_df = pd.DataFrame({
+                    'Historical Price': combined_actual,
+                    'Predicted Trend': combined_predicted
+                }, index=combined_dates)
+
+                st.line_chart(chart_points(chart_df), height=300)
+    else:
+        st.warning("Could not generate predictions. Make sure your stocks have sufficient historical data.")
+
+def media_portfolio_view_page(go_to, get_user_info, change_password):
+    """Render read-only view of community portfolio"""
+
+    if 'media_portfolio_id' not in st.session_state:
+        st.error("No portfolio selected for viewing")
+        go_to("dashboard")
+        return
+
+    portfolio_id = st.session_state.media_portfolio_id
+    portfolio = get_portfolio_by_id(portfolio_id)
+
+    if not portfolio:
+        st.error("Portfolio not found")
+        go_to("dashboard")
+        return
+
+    owner_username = st.session_state.get('media_portfolio_owner', portfolio.get('user_id', 'Unknown User'))
+
+    with st.sidebar:
+        st.header("Community Portfolio")
+
+        st.write(f"**Owner:** {owner_username}")
+        st.write(f"**Created:** {portfolio['created_at'].strftime('%Y-%m-%d') if portfolio.get('created_at') else 'Unknown'}")
+
+        st.divider()
+
+        nav_button("← Back to Dashboard", "dashboard", use_container_width=True)
+
+        st.button("Logout", use_container_width=True, on_click=handle_logout)
+
+    st.title(f"{owner_username}'s Portfolio")
+
+    stocks = portfolio.get('stocks', [])
+
+    if not stocks:
+        return
+
+    slots = render_holdings_layout(stocks)
+
+    st.divider()
+    st.subheader("Portfolio Prediction Analytics")
+    render_predictions_layout(stocks, slots)
+
+    stream_holding_quotes(stocks, slots, with_predictions=True)
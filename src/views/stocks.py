@@ -0,0 +1,580 @@
+import streamlit as st
+import pandas as pd
+import yfinance as yf
+import charts
+import analysis
+import symbol_stats
+from login import (
+    count_portfolios_holding, get_portfolio_by_id, get_portfolios_holding,
+    remove_stock_from_portfolio
+)
+from ui import (
+    STOCK_SYMBOLS_BY_COUNTRY, add_search_result_to_portfolio, calculate_stock_prediction,
+    chart_points, filter_search_results, format_percentage_with_color, format_stat,
+    get_company_news_link, get_stock_data, get_stocks_for_search, price_moving_average,
+    price_prediction, search_results_page, show_stock_historical_data
+)
+from views import nav_button
+from views.auth import handle_logout
+
+def stock_analysis_page(go_to, get_user_info, change_password):
+    with st.sidebar:
+        st.header("Stock Analysis")
+        
+        st.subheader("Stock Search")
+        
+        all_stock_symbols = []
+        for country, symbols in STOCK_SYMBOLS_BY_COUNTRY.items():
+            all_stock_symbols.extend(symbols)
+        
+        all_stock_symbols = sorted(list(set(all_stock_symbols)))
+        
+        search_query = st.text_input(
+            "Search Stock Symbol",
+            value="AAPL",
+            placeholder="Type to search (e.g., AAPL, GOOGL, TSLA...)",
+            help="Search from all available stocks across US, UK, Australia, Hong Kong, and China markets"
+        )
+        
+        if search_query:
+            filtered_stocks = [stock for stock in all_stock_symbols if search_query.upper() in stock.upper()]
+            
+            if filtered_stocks:
+                if len(filtered_stocks) > 10:
+                    display_stocks = filtered_stocks[:10]
+                else:
+                    display_stocks = filtered_stocks
+                
+                cols = st.columns(2)
+                for idx, stock in enumerate(display_stocks):
+                    with cols[idx % 2]:
+                        if st.button(stock, key=f"search_{stock}", use_container_width=True):
+                            st.session_state.selected_stock_symbol = stock
+                            search_query = stock
+                            st.rerun()
+                
+                selected_stock = search_query.upper() if search_query.upper() in [s.upper() for s in all_stock_symbols] else filtered_stocks[0]
+            else:
+                st.warning("No stocks found matching your search. Try different keywords.")
+                selected_stock = "AAPL"  # Default fallback
+        else:
+            selected_stock = "AAPL"  # Default when no search
+        
+        if hasattr(st.session_state, 'selected_stock_symbol'):
+            selected_stock = st.session_state.selected_stock_symbol
+        
+
+        st.subheader("Analysis Tools")
+        show_volume = st.checkbox("Show Volume", value=True)
+        show_moving_avg = st.checkbox("Show Moving Average", value=False)
+        
+        st.divider()
+        
+        nav_button("← Back to Dashboard", "dashboard", use_container_width=True)
+        
+        nav_button("Portfolios", "portfolios", use_container_width=True)
+        
+        st.button("Logout", use_container_width=True, on_click=handle_logout)
+    
+    st.title(f"{selected_stock} - Detailed Analysis")
+    
+    analysis_days = 3650  # 10 years (10 * 365)
+    data = get_stock_data(selected_stock, analysis_days)
+    
+    if isinstance(data, pd.DataFrame) and not data.empty:
+        version = analysis.data_version(selected_stock, data)
+        # Empty when the history has no closes
+        stats = symbol_stats.get_symbol_stats(selected_stock, data) or {}
+        latest = data.iloc[-1]
+        previous = data.iloc[-2] if len(data) > 1 else latest
+        
+        change = float(latest["Close"]) - float(previous["Close"])
+        prev_close = float(previous["Close"])
+        change_pct = (change / prev_close) * 100 if prev_close != 0 else 0
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.markdown("**Current Price**")
+            st.markdown(f"${float(latest['Close']):.2f}")
+            st.markdown(f"{change:+.2f} ({format_percentage_with_color(change_pct)})", unsafe_allow_html=True)
+        with col2:
+            st.metric("52-Week High", format_stat(stats.get('high_52w'), "${:.2f}"))
+        with col3:
+            st.metric("52-Week Low", format_stat(stats.get('low_52w'), "${:.2f}"))
+        with col4:
+            try:
+                volume = int(float(latest['Volume']))
+                st.metric("Volume", f"{volume:,}")
+            except Exception:
+                st.metric("Volume", "N/A")
+        
+        st.divider()
+        
+        col1, col2 = st.columns([3, 2])
+        
+        with col1:
+            st.subheader(f"{selected_stock} Price Chart")
+            
+            try:
+                if 'Close' in data.columns:
+                    chart_data = pd.DataFrame({'Close': data['Close']})
+                    moving_avg = price_moving_average(data, version) if show_moving_avg else None
+                    if moving_avg is not None:
+                        chart_data['20-Day MA'] = moving_avg
+                    
+                    st.line_chart(chart_points(chart_data), height=400)
+                else:
+                    st.error("Close price data not available")
+            except Exception as e:
+                st.error(f"Error creating price chart: {str(e)}")
+        
+        with col2:
+            try:
+                if show_volume and 'Volume' in data.columns:
+                    st.subheader("Volume Chart")
+                    volume_data = pd.DataFrame({'Volume': data['Volume']})
+                    st.bar_chart(chart_points(volume_data, charts.NARROW_CHART_MAX_POINTS), height=400)
+                elif 'High' in data.columns and 'Low' in data.columns:
+                    st.subheader("High-Low Range")
+                    high_low_data = pd.DataFrame({
+                        'High': data['High'],
+                        'Low': data['Low']
+                    })
+                    st.line_chart(chart_points(high_low_data, charts.NARROW_CHART_MAX_POINTS), height=400)
+                else:
+                    st.error("Chart data not available")
+            except Exception as e:
+                st.error(f"Error creating secondary chart: {str(e)}")
+        
+        st.divider()
+        
+        col1, col2 = st.columns([2, 3])
+        
+        with col1:
+            st.subheader("Recent Performance")
+            
+            if stats.get('returns'):
+                st.table(symbol_stats.returns_table(stats))
+        
+        with col2:
+            st.subheader("Price Statistics")
+            if stats:
+                st.table(symbol_stats.price_statistics_table(stats))
+
+        st.divider()
+        st.subheader("Price Prediction Using Linear Regression")
+
+        price_data = data['Close'].dropna()
+
+        if len(price_data) >= 30:  # Need at least 30 days of data
+            prediction, combined_df = price_prediction(price_data, version, future_days=365)
+
+            if prediction:
+                current_price = prediction['current_price']
+                predicted_1year = prediction['predicted_price']
+                predicted_change = predicted_1year - current_price
+                predicted_change_pct = (predicted_change / current_price) * 100
+
+                pred_col1, pred_col2, pred_col3 = st.columns(3)
+
+                with pred_col1:
+                    st.metric("Current Price", f"${current_price:.2f}")
+                with pred_col2:
+                    st.metric("Predicted Price (1 Year)", f"${predicted_1year:.2f}", f"{predicted_change:+.2f} ({predicted_change_pct:+.2f}%)")
+                with pred_col3:
+                    st.metric("Model R² Score", f"{prediction['r_squared']:.4f}")
+
+                st.subheader("Prediction Visualization")
+
+                st.line_chart(chart_points(combined_df), height=400)
+
+                with st.expander("View Model Details"):
+                    st.write(f"**Regression Equation:** Price = {prediction['slope']:.4f} × Days + {prediction['intercept']:.2f}")
+                    st.write(f"**Daily Trend:** {'Upward ↗' if prediction['slope'] > 0 else 'Downward ↘'} (${prediction['slope']:.4f} per day)")
+                    st.write(f"**Training Data Points:** {len(price_data)} days")
+                    st.write(f"**Prediction Period:** 365 days (1 year)")
+            else:
+                st.warning("Unable to generate prediction with available data.")
+        else:
+            st.warning("Not enough historical data for regression analysis. Need at least 30 days.")
+
+        st.divider()
+        st.subheader("Community Holders")
+
+        holder_count = count_portfolios_holding(selected_stock)
+        if holder_count > 0:
+            st.write(f"{selected_stock} is held in **{holder_count}** community portfolio{'s' if holder_count != 1 else ''}.")
+            with st.expander("Who holds this stock"):
+                for holder in get_portfolios_holding(selected_stock, limit=10):
+                    st.write(f"**{holder.get('portfolio_name', 'Unnamed Portfolio')}** by {holder.get('user_id', 'Unknown')}")
+        else:
+            st.info(f"No community portfolios hold {selected_stock} yet.")
+
+        st.divider()
+        st.subheader(" Company News")
+        
+        news_info = get_company_news_link(selected_stock)
+        
+        if news_info:
+            st.write(f"**Company:** {news_info['company_name']}")
+            st.write(f"**Stock Symbol:** {news_info['symbol']}")
+            st.write(f"**Search Query:** {news_info['search_query']}")
+            
+            st.link_button(
+                f"View {news_info['company_name']} News on Google", 
+                news_info['news_url'],
+                use_container_width=True
+            )
+            
+        else:
+            st.info("News link unavailable for this stock.")
+        
+    else:
+        st.error(f"Unable to load data for {selected_stock}")
+
+def my_stocks_page(go_to, get_user_info, change_password):
+    with st.sidebar:
+        st.header("My Stocks")
+        
+        if 'current_portfolio' in st.session_state:
+            portfolio = st.session_state.current_portfolio
+            st.write(f"**Portfolio:** {portfolio['name']}")
+            st.write(f"**Countries:** {', '.join(portfolio['countries'])}")
+        
+        st.divider()
+        
+        st.subheader("Actions")
+        
+        nav_button("Add Stock", "stock_search", use_container_width=True, type="primary")
+        
+        analytics_state = None
+        if 'current_portfolio' in st.session_state:
+            analytics_state = {"analytics_portfolio_id": st.session_state.current_portfolio.get('_id')}
+        nav_button(" Portfolio Analytics", "portfolio_analytics", use_container_width=True, state=analytics_state)
+
+        st.divider()
+        
+        nav_button("← Back to Portfolios", "portfolios", use_container_width=True)
+        
+        nav_button("Dashboard", "dashboard", use_container_width=True)
+        
+        st.button("Logout", use_container_width=True, on_click=handle_logout)
+    
+    st.title("My Portfolio")
+    
+    portfolio = None
+    if 'current_portfolio' in st.session_state:
+        portfolio_id = st.session_state.current_portfolio.get('_id')
+        if portfolio_id and portfolio_id != 'temp_id':
+            portfolio = get_portfolio_by_id(portfolio_id)
+        
+        if not portfolio:
+            portfolio = st.session_state.current_portfolio
+    
+    if portfolio:
+        portfolio_name = portfolio.get('portfolio_name', portfolio.get('name', 'Unknown Portfolio'))
+        st.markdown(f"### Portfolio: **{portfolio_name}**")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Stocks Added", len(portfolio.get('stocks', [])))
+        with col2:
+            total_value = sum(stock.get('price', 0) * stock.get('shares', 1) for stock in portfolio.get('stocks', []))
+            st.metric("Total Value", f"${total_value:,.2f}")
+    
+    st.divider()
+    
+    st.subheader("Stock Holdings")
+    
+    if portfolio and portfolio.get('stocks'):
+        stocks = portfolio['stocks']  # Use database stocks
+        
+        for idx, stock in enumerate(stocks):
+            with st.container():
+                col1, col2, col3, col4, col5 = st.columns([3, 1.5, 1, 1.5, 1])
+                
+                with col1:
+                    st.write(f"**{stock['symbol']}**")
+                
+                with col2:
+                    st.write(f"${stock.get('price', 0):.2f}")
+                
+                with col3:
+                    st.write(f"{stock.get('shares', 0)}")
+                
+                with col4:
+                    value = stock.get('price', 0) * stock.get('shares', 0)
+                    st.write(f"${value:.2f}")
+                
+                with col5:
+                    if st.button("Remove", key=f"remove_{idx}"):
+                        portfolio_id = st.session_state.current_portfolio.get('_id')
+                        if portfolio_id and portfolio_id != 'temp_id':
+                            success, message = remove_stock_from_portfolio(portfolio_id, stock['symbol'])
+                            if success:
+                                st.success(f"Removed {stock['symbol']} from portfolio")
+                                st.rerun()
+                            else:
+                                st.error(f"Failed to remove: {message}")
+                        else:
+                            st.session_state.current_portfolio['stocks'].pop(idx)
+                            st.rerun()
+                
+                st.markdown("---")
+    
+    else:
+        st.info("No stocks in this portfolio yet.")
+
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            nav_button("Add Your First Stock", "stock_search", type="primary", use_container_width=True)
+
+    if st.session_state.get("show_my_stocks_analytics", False):
+        st.divider()
+        st.subheader("Portfolio Analytics & Predictions")
+
+        if portfolio and portfolio.get('stocks'):
+            all_stocks = portfolio['stocks']
+
+            st.subheader("Overall Portfolio Value Prediction")
+
+            total_current_value = 0
+            total_predicted_value = 0
+            portfolio_predictions = []
+
+            for stock in all_stocks:
+                try:
+                    ticker = yf.Ticker(stock['symbol'])
+                    hist_data = ticker.history(period="2y")
+
+                    if not hist_data.empty and len(hist_data) >= 30:
+                        price_data = hist_data['Close'].dropna()
+
+                        prediction = calculate_stock_prediction(price_data, future_days=365)
+
+                        if prediction:
+                            current_price = prediction['current_price']
+                            predicted_price = prediction['predicted_price']
+                            shares = stock.get('shares', 1)
+
+                            current_stock_value = current_price * shares
+                            predicted_stock_value = predicted_price * shares
+
+                            total_current_value += current_stock_value
+                            total_predicted_value += predicted_stock_value
+
+                            portfolio_predictions.append({
+                                'symbol': stock['symbol'],
+                                'name': stock.get('name', stock['symbol']),
+                                'shares': shares,
+                                'current_price': current_price,
+                                'predicted_price': predicted_price,
+                                'current_value': current_stock_value,
+                                'predicted_value': predicted_stock_value,
+                                'prediction': prediction
+                            })
+                except Exception as e:
+                    st.warning(f"Could not analyze {stock['symbol']}: {str(e)}")
+                    continue
+
+            if portfolio_predictions:
+                value_change = total_predicted_value - total_current_value
+                value_change_pct = (value_change / total_current_value * 100) if total_current_value > 0 else 0
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Current Portfolio Value", f"${total_current_value:,.2f}")
+                with col2:
+                    st.metric("Predicted Value (1 Year)", f"${total_predicted_value:,.2f}", f"{value_change:+,.2f} ({value_change_pct:+.2f}%)")
+                with col3:
+                    trend = "Upward" if value_change > 0 else "Downward"
+                    st.metric("Trend", trend)
+
+                st.divider()
+
+                st.subheader("Individual Stock Predictions")
+
+                for pred in portfolio_predictions:
+                    with st.expander(f"{pred['symbol']} - {pred['name']}", expanded=False):
+                        stock_change = pred['predicted_price'] - pred['current_price']
+                        stock_change_pct = (stock_change / pred['current_price'] * 100) if pred['current_price'] > 0 else 0
+
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Current Price", f"${pred['current_price']:.2f}")
+                        with col2:
+                            st.metric("Predicted Price (1 Year)", f"${pred['predicted_price']:.2f}", f"{stock_change:+.2f} ({stock_change_pct:+.2f}%)")
+                        with col3:
+                            st.metric("Total Value Change", f"${pred['predicted_value'] - pred['current_value']:+,.2f}")
+
+                        st.write("**Price Prediction Chart**")
+
+                        if 'prediction' in pred:
+                            st.line_chart(pd.DataFrame({
+                                'Predicted Price': pred['prediction']['future_predictions']
+                            }), height=300)
+            else:
+                st.warning("Could not generate predictions. Make sure your stocks have sufficient historical data.")
+        else:
+            st.info("Add stocks to this portfolio to see analytics.")
+
+        if st.button("Hide Analytics"):
+            st.session_state.show_my_stocks_analytics = False
+            st.rerun()
+
+def stock_search_page(go_to, get_user_info, change_password):
+    with st.sidebar:
+        st.header("Stock Search")
+        
+        st.subheader("Filters")
+        
+        available_countries = ["All", "United States", "United Kingdom", "Australia", "Hong Kong", "China"]
+        if 'current_portfolio' in st.session_state:
+            portfolio_countries = st.session_state.current_portfolio.get('countries', [])
+            country_options = ["All"] + portfolio_countries + [c for c in available_countries[1:] if c not in portfolio_countries]
+        else:
+            country_options = available_countries
+            
+        selected_country = st.selectbox("Country", country_options)
+        
+        st.divider()
+        
+        nav_button("← Back to My Stocks", "my_stocks", use_container_width=True)
+        
+        nav_button("Dashboard", "dashboard", use_container_width=True)
+    
+    st.title("Stock Search")
+    st.markdown("### Find and add stocks to your portfolio")
+
+    if 'current_portfolio' in st.session_state:
+        portfolio_name = st.session_state.current_portfolio.get('name', 'Unknown')
+        portfolio_id = st.session_state.current_portfolio.get('_id', 'None')
+    else:
+        st.warning("No portfolio selected. Please select a portfolio first.")
+        nav_button("Go to Portfolios", "portfolios")
+        st.stop()
+    
+    search_query = st.text_input("Search for stocks (symbol or company name)", placeholder="e.g., AAPL, Apple, Tesla")
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        search_button = st.button("Search", type="primary")
+    
+    st.divider()
+
+    # Selecting a row or changing page reruns the script, so browsing must outlive the button click
+    if search_button:
+        st.session_state.search_browsing = True
+
+    if search_query or st.session_state.get("search_browsing"):
+        st.subheader(f"Search Results for '{search_query or 'Popular Stocks'}'")
+        
+        if selected_country != "All":
+            all_stocks = get_stocks_for_search(selected_country)
+        else:
+            all_stocks = []
+            for country in STOCK_SYMBOLS_BY_COUNTRY.keys():
+                country_stocks = get_stocks_for_search(country)
+                all_stocks.extend(country_stocks)
+
+        filtered_stocks = filter_search_results(all_stocks, search_query)
+
+        if selected_country != "All":
+            st.caption(f"Showing {len(filtered_stocks)} stocks from {selected_country}")
+        else:
+            st.caption(f"Showing {len(filtered_stocks)} stocks from all markets")
+
+        if not filtered_stocks:
+            st.info("No stocks found. Try a different search term or country.")
+            return
+
+        # A new query or country starts again from the first page
+        search_key = f"{selected_country}|{search_query}"
+        if st.session_state.get("search_results_key") != search_key:
+            st.session_state.search_results_key = search_key
+            st.session_state.search_results_page = 0
+
+        page_stocks, page, page_count = search_results_page(
+            filtered_stocks, st.session_state.get("search_results_page", 0)
+        )
+
+        results_df = pd.DataFrame([{
+            'Symbol': stock['symbol'],
+            'Company Name': stock['name'],
+            'Country': stock['country'],
+            'Price': stock['price'],
+            'Change': stock['change']
+        } for stock in page_stocks])
+
+        selection = st.dataframe(
+            results_df,
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=f"search_results_{search_key}_{page}",
+            column_config={
+                'Price': st.column_config.NumberColumn(format="$%.2f"),
+                'Change': st.column_config.NumberColumn(format="%+.2f"),
+            }
+        )
+
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("← Previous", disabled=page == 0, use_container_width=True):
+                st.session_state.search_results_page = page - 1
+                st.rerun()
+        with page_col:
+            st.caption(f"Page {page + 1} of {page_count}")
+        with next_col:
+            if st.button("Next →", disabled=page >= page_count - 1, use_container_width=True):
+                st.session_state.search_results_page = page + 1
+                st.rerun()
+
+        selected_rows = selection.selection.rows
+        if not selected_rows:
+            st.info("Select a stock in the table to add it to your portfolio or view its history.")
+            return
+
+        stock = page_stocks[selected_rows[0]]
+
+        st.divider()
+        st.subheader(f"{stock['symbol']} - {stock['name']}")
+
+        with st.form(key="add_search_result_form"):
+            form_col1, form_col2 = st.columns(2)
+            with form_col1:
+                shares = st.number_input(
+                    "Shares",
+                    min_value=1,
+                    max_value=10000,
+                    value=1,
+                    help="Number of shares you purchased",
+                    key=f"add_shares_{stock['symbol']}"
+                )
+            with form_col2:
+                purchase_price = st.number_input(
+                    "Purchase Price/Share ($)",
+                    min_value=0.01,
+                    max_value=100000.0,
+                    value=float(stock['price']),
+                    step=0.01,
+                    help="Price you paid per share",
+                    key=f"add_price_{stock['symbol']}"
+                )
+
+            submitted = st.form_submit_button(f"Add {stock['symbol']}", type="primary")
+
+        if submitted:
+            success, message = add_search_result_to_portfolio(stock, shares, purchase_price)
+            if success:
+                st.success(message)
+            else:
+                st.error(message)
+
+        if st.button("History", key="search_result_history"):
+            show_stock_historical_data(stock['symbol'], stock['name'])
+
+    else:
+        st.info("Enter a search term or press Search to browse popular stocks.")
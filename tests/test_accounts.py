@@ -0,0 +1,276 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import login
+import passwords
+import throttle
+import activity
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+
+# setUp patches passwords.get_rounds to a cheap cost; the clamping test needs the original
+REAL_GET_ROUNDS = passwords.get_rounds
+
+
+class TestRegisterUser(unittest.TestCase):
+    """Test cases for single-write user registration"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_collection = MagicMock()
+        patcher = patch.object(login, 'get_users_collection', return_value=self.mock_collection)
+        self.mock_get_users = patcher.start()
+        self.addCleanup(patcher.stop)
+        # Minimum bcrypt cost keeps the tests fast
+        rounds_patcher = patch.object(passwords, 'get_rounds', return_value=4)
+        rounds_patcher.start()
+        self.addCleanup(rounds_patcher.stop)
+
+    def test_register_user_single_insert(self):
+        """Test registration is one insert with no existence lookups"""
+        success, message = login.register_user("newuser", "StrongPass123!", "Test@Example.com")
+
+        self.assertTrue(success)
+        self.assertEqual(message, "Registration successful")
+        self.mock_collection.find_one.assert_not_called()
+        self.mock_collection.insert_one.assert_called_once()
+        self.assertEqual(self.mock_collection.insert_one.call_args[0][0]["email"], "test@example.com")
+
+    def test_register_user_stores_hash(self):
+        """Test the stored password is a bcrypt hash of the input"""
+        login.register_user("newuser", "StrongPass123!", "test@example.com")
+
+        stored = self.mock_collection.insert_one.call_args[0][0]["password"]
+        self.assertNotEqual(stored, "StrongPass123!")
+        self.assertEqual(passwords.verify_password("StrongPass123!", stored), (True, False))
+
+    def test_register_user_validation_skips_database(self):
+        """Test invalid input is rejected before the collection is fetched"""
+        success, message = login.register_user("ab", "StrongPass123!", "test@example.com")
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Username must be at least 3 characters long")
+        self.mock_get_users.assert_not_called()
+
+    def test_register_user_duplicate_username(self):
+        """Test a username index violation maps to the username message"""
+        self.mock_collection.insert_one.side_effect = DuplicateKeyError(
+            "E11000 duplicate key error", 11000,
+            {"keyPattern": {"username": 1}, "keyValue": {"username": "newuser"}}
+        )
+
+        success, message = login.register_user("newuser", "StrongPass123!", "test@example.com")
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Username already exists")
+
+    def test_register_user_duplicate_email(self):
+        """Test an email index violation maps to the email message"""
+        self.mock_collection.insert_one.side_effect = DuplicateKeyError(
+            "E11000 duplicate key error", 11000,
+            {"keyPattern": {"email": 1}, "keyValue": {"email": "test@example.com"}}
+        )
+
+        success, message = login.register_user("newuser", "StrongPass123!", "test@example.com")
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Email already registered")
+
+    def test_register_user_duplicate_from_message(self):
+        """Test the index name is read from the message when details are sparse"""
+        self.mock_collection.insert_one.side_effect = DuplicateKeyError(
+            "E11000 duplicate key error collection: IA.users index: email_1 dup key", 11000,
+            {"errmsg": "E11000 duplicate key error collection: IA.users index: email_1 dup key"}
+        )
+
+        success, message = login.register_user("newuser", "StrongPass123!", "test@example.com")
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Email already registered")
+
+
+class TestPasswords(unittest.TestCase):
+    """Test cases for bcrypt hashing and transparent rehashing"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        patcher = patch.object(passwords, 'get_rounds', return_value=4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_calibration_respects_bounds(self):
+        """Test the calibrated cost stays inside the allowed range"""
+        self.assertEqual(passwords.calibrate_rounds(budget_ms=1), passwords.MIN_ROUNDS)
+        self.assertLessEqual(passwords.calibrate_rounds(budget_ms=10 ** 9), passwords.MAX_ROUNDS)
+
+    def test_wrong_password_rejected(self):
+        """Test a wrong password does not match a stored hash"""
+        stored = passwords.hash_password("correct")
+
+        self.assertEqual(passwords.verify_password("wrong", stored), (False, False))
+
+    def test_lower_cost_needs_rehash(self):
+        """Test a hash with a lower cost than the current one is flagged for rehashing"""
+        stored = passwords._hash("secret", 4)
+
+        with patch.object(passwords, 'get_rounds', return_value=5):
+            self.assertEqual(passwords.verify_password("secret", stored), (True, True))
+
+    def test_higher_cost_kept(self):
+        """Test a hash from a replica with a higher calibrated cost is not downgraded"""
+        stored = passwords._hash("secret", 5)
+
+        self.assertEqual(passwords.verify_password("secret", stored), (True, False))
+
+    def test_configured_rounds_clamped(self):
+        """Test an out-of-range BCRYPT_ROUNDS setting is clamped to the allowed costs"""
+        self.addCleanup(setattr, passwords, '_rounds', passwords._rounds)
+        for configured, expected in (("2", passwords.MIN_ROUNDS), ("40", passwords.MAX_ROUNDS)):
+            with self.subTest(configured=configured):
+                passwords._rounds = None
+                with patch.dict(os.environ, {"BCRYPT_ROUNDS": configured}):
+                    self.assertEqual(REAL_GET_ROUNDS(), expected)
+
+    def test_legacy_plaintext_needs_rehash(self):
+        """Test plaintext passwords still verify and are flagged for migration"""
+        self.assertEqual(passwords.verify_password("secret", "secret"), (True, True))
+
+    def test_login_upgrades_legacy_password(self):
+        """Test a successful login replaces a plaintext password with a hash"""
+        mock_collection = MagicMock()
+        mock_collection.find_one.return_value = {"_id": "user-id", "username": "alice", "password": "secret"}
+
+        # Run the background rehash inline so the write can be inspected
+        inline_rehash = lambda password, on_hashed: on_hashed(passwords._hash(password, 4))
+
+        with patch.object(login, 'get_users_collection', return_value=mock_collection), \
+                patch.object(passwords, 'rehash_in_background', side_effect=inline_rehash):
+            self.assertTrue(login.verify_user("alice", "secret"))
+
+        query, update = mock_collection.update_one.call_args[0]
+        self.assertEqual(query, {"_id": "user-id", "password": "secret"})
+        self.assertTrue(passwords.is_bcrypt_hash(update["$set"]["password"]))
+
+
+class TestLoginThrottle(unittest.TestCase):
+    """Test cases for the in-memory login throttle"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_collection = MagicMock()
+        self.mock_collection.find_one.return_value = {
+            "_id": "user-id", "username": "alice", "password": passwords._hash("secret", 4)
+        }
+        patchers = [
+            patch.object(login, 'get_users_collection', return_value=self.mock_collection),
+            patch.object(passwords, 'get_rounds', return_value=4),
+            patch.object(throttle, 'failure_limiter',
+                         throttle.SlidingWindowLimiter(throttle.MAX_FAILED_ATTEMPTS, throttle.ATTEMPT_WINDOW)),
+            patch.object(throttle, 'client_limiter',
+                         throttle.SlidingWindowLimiter(throttle.MAX_CLIENT_ATTEMPTS, throttle.ATTEMPT_WINDOW)),
+            patch.dict(throttle._known_locks, clear=True),
+            patch.object(activity, 'activity_buffer', MagicMock()),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_lock_persisted_once_at_threshold(self):
+        """Test the users document is only written when the limit is crossed"""
+        for _ in range(throttle.MAX_FAILED_ATTEMPTS):
+            self.assertFalse(login.verify_user("alice", "wrong"))
+
+        self.mock_collection.update_one.assert_called_once()
+        update = self.mock_collection.update_one.call_args[0][1]["$set"]
+        self.assertEqual(update["failed_login_attempts"], throttle.MAX_FAILED_ATTEMPTS)
+        self.assertIn("account_locked_until", update)
+
+    def test_locked_attempts_skip_database(self):
+        """Test attempts past the limit are refused without a lookup"""
+        for _ in range(throttle.MAX_FAILED_ATTEMPTS):
+            login.verify_user("alice", "wrong")
+        self.mock_collection.find_one.reset_mock()
+
+        self.assertFalse(login.verify_user("alice", "secret"))
+        self.mock_collection.find_one.assert_not_called()
+        self.assertIsNotNone(throttle.login_block_reason("alice"))
+
+    def test_client_limit(self):
+        """Test one client is limited across many usernames"""
+        for attempt in range(throttle.MAX_CLIENT_ATTEMPTS):
+            login.verify_user(f"user{attempt}", "wrong", client_id="10.0.0.1")
+        self.mock_collection.find_one.reset_mock()
+
+        self.assertFalse(login.verify_user("alice", "secret", client_id="10.0.0.1"))
+        self.mock_collection.find_one.assert_not_called()
+
+    def test_lock_from_database_is_honoured(self):
+        """Test a lock written by another process refuses the login"""
+        self.mock_collection.find_one.return_value["account_locked_until"] = datetime.utcnow() + timedelta(minutes=5)
+
+        self.assertFalse(login.verify_user("alice", "secret"))
+        self.assertIsNotNone(throttle.login_block_reason("alice"))
+
+    def test_success_clears_failures(self):
+        """Test a successful login resets the failure window"""
+        login.verify_user("alice", "wrong")
+
+        self.assertTrue(login.verify_user("alice", "secret"))
+        self.assertEqual(throttle.failure_limiter.count("alice"), 0)
+
+
+class TestSessionProfile(unittest.TestCase):
+    """Test cases for the session-scoped user profile"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_collection = MagicMock()
+        self.mock_collection.find_one.return_value = {
+            "username": "alice", "email": "alice@example.com", "created_at": datetime(2024, 1, 1)
+        }
+        self.session_state = {}
+        patchers = [
+            patch.object(login, 'get_users_collection', return_value=self.mock_collection),
+            patch.object(login.st, 'session_state', self.session_state),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_profile_loaded_once_with_projection(self):
+        """Test reruns reuse the profile and the password is never fetched"""
+        first = login.get_session_profile("alice")
+        second = login.get_session_profile("alice")
+
+        self.assertEqual(first, second)
+        self.mock_collection.find_one.assert_called_once()
+        projection = self.mock_collection.find_one.call_args[0][1]
+        self.assertNotIn("password", projection)
+
+    def test_refresh_reloads(self):
+        """Test an explicit refresh goes back to the database"""
+        login.get_session_profile("alice")
+        login.get_session_profile("alice", refresh=True)
+
+        self.assertEqual(self.mock_collection.find_one.call_count, 2)
+
+    def test_password_change_clears_profile(self):
+        """Test a password change drops the cached profile"""
+        login.get_session_profile("alice")
+
+        with patch.object(login, 'verify_user', return_value=True), \
+                patch.object(passwords, 'hash_password', return_value="hashed"), \
+                patch.object(activity, 'activity_buffer', MagicMock()):
+            success, message = login.change_password("alice", "old", "new")
+
+        self.assertTrue(success)
+        self.assertNotIn("user_profile", self.session_state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import activity
+import login
+
+
+class TestActivityBuffer(unittest.TestCase):
+    """Test cases for the buffered audit writer"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.collections = {name: MagicMock() for name in activity.COLLECTION_GETTERS}
+        patcher = patch.dict(activity.COLLECTION_GETTERS, {
+            name: (lambda collection=collection: collection)
+            for name, collection in self.collections.items()
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Large interval so only explicit flushes write during the test
+        self.buffer = activity.ActivityBuffer(flush_interval=3600, batch_size=1000, max_queued=3)
+
+    def test_flush_groups_writes_per_collection(self):
+        """Test queued writes go out as one unordered bulk write per collection"""
+        with patch.object(activity, 'activity_buffer', self.buffer):
+            activity.record_login("alice")
+            activity.log_security_event("alice", "failed_login")
+
+        written = self.buffer.flush()
+
+        self.assertEqual(written, 3)
+        self.assertEqual(self.buffer.pending(), 0)
+        for name in ("users", "activity_logs", "security_events"):
+            self.collections[name].bulk_write.assert_called_once()
+            self.assertEqual(self.collections[name].bulk_write.call_args[1], {"ordered": False})
+
+    def test_last_login_uses_max(self):
+        """Test out-of-order flushes cannot move last_login backwards"""
+        with patch.object(activity, 'activity_buffer', self.buffer):
+            activity.record_login("alice")
+        self.buffer.flush()
+
+        operation = self.collections["users"].bulk_write.call_args[0][0][0]
+        self.assertIn("$max", operation._doc)
+
+    def test_full_buffer_drops_new_events(self):
+        """Test the queue is bounded and overflow is counted"""
+        results = [self.buffer.put("activity_logs", MagicMock()) for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(self.buffer.dropped, 1)
+
+    def test_failed_bulk_write_does_not_raise(self):
+        """Test a database error is absorbed by the flush"""
+        self.collections["activity_logs"].bulk_write.side_effect = Exception("down")
+        self.buffer.put("activity_logs", MagicMock())
+
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.dropped, 1)
+
+    def test_update_last_login_does_not_write(self):
+        """Test the login path only queues the timestamp"""
+        with patch.object(login, 'get_users_collection') as mock_get_users, \
+                patch.object(activity, 'activity_buffer', self.buffer):
+            login.update_last_login("alice")
+
+        mock_get_users.assert_not_called()
+        self.assertEqual(self.buffer.pending(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
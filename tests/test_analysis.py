@@ -0,0 +1,135 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import analysis
+import charts
+import ui
+
+
+def make_prices(length=120):
+    """Daily OHLCV frame with a steady upward close"""
+    index = pd.bdate_range("2024-01-01", periods=length)
+    close = np.arange(length, dtype=float) + 100
+    return pd.DataFrame({
+        "Open": close,
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": np.full(length, 1000),
+    }, index=index)
+
+
+class TestAnalysisArtifacts(unittest.TestCase):
+    """Test cases for the stock analysis derived tables and frames"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.data = make_prices()
+
+    def test_data_version_tracks_last_bar(self):
+        """Test the version changes when a bar is added but not for a copy"""
+        version = analysis.data_version("AAPL", self.data)
+
+        self.assertEqual(analysis.data_version("AAPL", self.data.copy()), version)
+        self.assertNotEqual(analysis.data_version("AAPL", self.data.iloc[:-1]), version)
+        self.assertNotEqual(analysis.data_version("MSFT", self.data), version)
+
+    def test_data_version_tracks_revised_closes(self):
+        """Test a back-adjusted history with the same length and last bar gets a new version"""
+        version = analysis.data_version("AAPL", self.data)
+        adjusted = self.data.copy()
+        adjusted.loc[adjusted.index[:-1], "Close"] *= 0.5
+        requoted = self.data.copy()
+        requoted.loc[requoted.index[-1], "Close"] += 0.25
+
+        self.assertNotEqual(analysis.data_version("AAPL", adjusted), version)
+        self.assertNotEqual(analysis.data_version("AAPL", requoted), version)
+
+    def test_moving_average_needs_window(self):
+        """Test the rolling mean is skipped for histories shorter than the window"""
+        self.assertIsNone(analysis.moving_average(self.data.head(10)))
+        self.assertAlmostEqual(analysis.moving_average(self.data).iloc[-1], 209.5)
+
+    def test_prediction_frame_layout(self):
+        """Test history is followed by the forecast on consecutive future dates"""
+        closes = self.data["Close"]
+        prediction = ui.calculate_stock_prediction(closes, future_days=365)
+
+        frame = analysis.prediction_frame(closes, prediction)
+
+        self.assertEqual(len(frame), len(closes) + 365)
+        self.assertTrue(frame["Historical Price"].iloc[:len(closes)].notna().all())
+        self.assertTrue(frame["Predicted Trend"].iloc[len(closes):].notna().all())
+        self.assertEqual(frame.index[len(closes)], closes.index[-1] + pd.Timedelta(days=1))
+
+
+class TestAnalysisMemo(unittest.TestCase):
+    """Test cases for the memoized stock analysis view-model"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        ui.price_moving_average.clear()
+        ui.chart_points.clear()
+        self.data = make_prices()
+        self.version = analysis.data_version("TEST", self.data)
+
+    def test_moving_average_reused_across_copies(self):
+        """Test a fresh copy of the same data reuses the computed moving average"""
+        with patch.object(analysis, 'moving_average', wraps=analysis.moving_average) as mock_average:
+            ui.price_moving_average(self.data, self.version)
+            ui.price_moving_average(self.data.copy(), self.version)
+
+        mock_average.assert_called_once()
+
+    def test_new_data_version_recomputes(self):
+        """Test a new bar produces a new version and fresh artifacts"""
+        ui.price_moving_average(self.data, self.version)
+        longer = make_prices(121)
+
+        result = ui.price_moving_average(longer, analysis.data_version("TEST", longer))
+
+        self.assertAlmostEqual(result.iloc[-1], 210.5)
+
+    def test_back_adjusted_history_recomputes(self):
+        """Test a back-adjusted history does not reuse the moving average of the old closes"""
+        ui.price_moving_average(self.data, self.version)
+        adjusted = self.data.copy()
+        adjusted["Close"] *= 0.5
+
+        result = ui.price_moving_average(adjusted, analysis.data_version("TEST", adjusted))
+
+        self.assertAlmostEqual(result.iloc[-1], 104.75)
+
+    def test_chart_points_follow_revised_data(self):
+        """Test a chart of data revised in place, same length and last bar, is redrawn"""
+        data = make_prices(2000)
+        ui.chart_points(data, 100)
+        revised = data.copy()
+        revised.loc[revised.index[-1], "Close"] = 5000.0
+
+        self.assertEqual(ui.chart_points(revised, 100)["Close"].iloc[-1], 5000.0)
+
+    def test_chart_cache_bounded(self):
+        """Test charts of ever-new frames evict the oldest instead of growing the cache"""
+        frames = [make_prices(150 + offset) for offset in range(ui.CHART_CACHE_ENTRIES + 1)]
+        for frame in frames:
+            ui.chart_points(frame, 100)
+
+        with patch.object(charts, 'downsample', wraps=charts.downsample) as mock_downsample:
+            ui.chart_points(frames[-1], 100)
+            mock_downsample.assert_not_called()
+            ui.chart_points(frames[0], 100)
+
+        mock_downsample.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
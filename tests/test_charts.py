@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import charts
+
+
+def make_series(length=5000):
+    """Noisy daily series with a known spike and dip"""
+    rng = np.random.default_rng(42)
+    values = np.cumsum(rng.normal(0, 1, length)) + 500
+    values[length // 4] = 2000
+    values[length - length // 5] = -100
+    index = pd.date_range("2000-01-01", periods=length, freq="D")
+    return pd.Series(values, index=index, name="Close")
+
+
+class TestLttb(unittest.TestCase):
+    """Test cases for Largest-Triangle-Three-Buckets selection"""
+
+    def test_keeps_endpoints_and_count(self):
+        """Test the first and last points are kept and the count matches"""
+        y = np.sin(np.linspace(0, 20, 1000))
+        indices = charts.lttb_indices(np.arange(1000.0), y, 100)
+
+        self.assertEqual(len(indices), 100)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 999)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_short_input_unchanged(self):
+        """Test inputs already under the threshold are returned whole"""
+        self.assertEqual(list(charts.lttb_indices(np.arange(5.0), np.arange(5.0), 10)), [0, 1, 2, 3, 4])
+
+
+class TestDownsample(unittest.TestCase):
+    """Test cases for chart downsampling"""
+
+    def test_series_reduced_with_extremes(self):
+        """Test a long series shrinks to about the point budget and keeps its extremes"""
+        series = make_series()
+
+        result = charts.downsample(series, max_points=500)
+
+        self.assertLessEqual(len(result), 502)
+        self.assertEqual(result.max(), series.max())
+        self.assertEqual(result.min(), series.min())
+        self.assertEqual(result.index[0], series.index[0])
+        self.assertEqual(result.index[-1], series.index[-1])
+
+    def test_small_data_untouched(self):
+        """Test data under the budget is returned as is"""
+        series = make_series(100)
+
+        self.assertIs(charts.downsample(series, max_points=500), series)
+
+    def test_frame_with_gaps(self):
+        """Test columns with missing values, like prediction overlays, are handled"""
+        series = make_series(3000)
+        frame = pd.DataFrame({
+            "Historical Price": list(series.values[:2000]) + [None] * 1000,
+            "Predicted Trend": [None] * 2000 + list(np.linspace(600, 700, 1000)),
+        }, index=series.index)
+
+        result = charts.downsample(frame, max_points=400)
+
+        self.assertLess(len(result), 450)
+        self.assertTrue(result["Historical Price"].notna().any())
+        self.assertTrue(result["Predicted Trend"].notna().any())
+
+
+class TestResampleOhlcv(unittest.TestCase):
+    """Test cases for daily to weekly/monthly bar aggregation"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        index = pd.bdate_range("2024-01-01", "2024-03-29")
+        close = np.arange(len(index), dtype=float) + 100
+        self.daily = pd.DataFrame({
+            "Open": close - 0.5,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": np.full(len(index), 10),
+        }, index=index)
+
+    def test_weekly_semantics(self):
+        """Test open is first, high is max, low is min, close is last and volume sums"""
+        bars = charts.resample_ohlcv(self.daily, "W-MON")
+        first_week = self.daily.loc["2024-01-01":"2024-01-05"]
+
+        self.assertEqual(len(bars), 13)
+        self.assertEqual(bars.index[0], pd.Timestamp("2024-01-01"))
+        self.assertEqual(bars["Open"].iloc[0], first_week["Open"].iloc[0])
+        self.assertEqual(bars["High"].iloc[0], first_week["High"].max())
+        self.assertEqual(bars["Low"].iloc[0], first_week["Low"].min())
+        self.assertEqual(bars["Close"].iloc[0], first_week["Close"].iloc[-1])
+        self.assertEqual(bars["Volume"].iloc[0], 50)
+
+    def test_monthly_bars(self):
+        """Test monthly bars cover the whole range"""
+        bars = charts.resample_ohlcv(self.daily, "MS")
+
+        self.assertEqual(len(bars), 3)
+        self.assertEqual(bars["Volume"].sum(), self.daily["Volume"].sum())
+
+    def test_daily_rule_untouched(self):
+        """Test the daily timeframe keeps the original bars"""
+        self.assertIs(charts.resample_ohlcv(self.daily, None), self.daily)
+
+    def test_candlestick_chart_builds(self):
+        """Test the candlestick layers serialize from resampled bars"""
+        chart = charts.candlestick_chart(charts.resample_ohlcv(self.daily, "W-MON"))
+
+        self.assertEqual(len(chart.to_dict()["layer"]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,340 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import importlib
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ui
+from views import dashboard
+
+
+class TestPopularHoldings(unittest.TestCase):
+    """Test cases for the cached "Most held by the community" panel"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        ui._popular_holdings.update(items=None, loaded_at=0.0)
+        self.addCleanup(ui._popular_holdings.update, items=None, loaded_at=0.0)
+        self.items = [{"symbol": "AAPL", "holders": 3, "portfolios": 4}]
+        patcher = patch.object(ui, 'get_symbol_popularity', return_value=self.items)
+        self.mock_popularity = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_first_read_loads_once(self):
+        """Test the aggregation runs once and later reads come from memory"""
+        first = ui.get_popular_holdings()
+        second = ui.get_popular_holdings()
+
+        self.assertEqual(first, self.items)
+        self.assertEqual(second, self.items)
+        self.mock_popularity.assert_called_once()
+
+    def test_expired_result_served_while_refreshing(self):
+        """Test an expired result is returned immediately and refreshed in the background"""
+        ui.get_popular_holdings()
+        ui._popular_holdings["loaded_at"] = time.monotonic() - ui.POPULAR_HOLDINGS_TTL - 1
+        self.mock_popularity.return_value = [{"symbol": "MSFT", "holders": 5, "portfolios": 5}]
+
+        stale = ui.get_popular_holdings()
+
+        self.assertEqual(stale, self.items)
+        with ui._popular_holdings_lock:
+            pass
+        self.assertEqual(ui.get_popular_holdings()[0]["symbol"], "MSFT")
+
+
+class TestMarketOverview(unittest.TestCase):
+    """Test cases for the lazily loaded market overview"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        patcher = patch.object(ui, 'get_multiple_stocks_data', return_value={})
+        self.mock_get_data = patcher.start()
+        self.addCleanup(patcher.stop)
+        ui._last_market_prefetch = 0.0
+
+    def test_selected_market_only(self):
+        """Test one market's leading symbols are fetched for the selected tab"""
+        ui.get_market_overview_data("United States")
+
+        self.mock_get_data.assert_called_once_with(
+            ui.STOCK_SYMBOLS_BY_COUNTRY["United States"][:ui.MARKET_OVERVIEW_SYMBOLS], ui.MARKET_OVERVIEW_DAYS
+        )
+
+    def test_prefetch_skips_selected_market(self):
+        """Test the background prefetch warms every other market once"""
+        self.assertTrue(ui.prefetch_market_overview(exclude="United States"))
+        with ui._market_prefetch_lock:
+            pass
+
+        fetched = [call[0][0] for call in self.mock_get_data.call_args_list]
+        self.assertEqual(len(fetched), len(ui.STOCK_SYMBOLS_BY_COUNTRY) - 1)
+        self.assertNotIn(ui.STOCK_SYMBOLS_BY_COUNTRY["United States"][:ui.MARKET_OVERVIEW_SYMBOLS], fetched)
+        self.assertFalse(ui.prefetch_market_overview(exclude="United States"))
+
+
+class TestMarketQuotes(unittest.TestCase):
+    """Test cases for the market section's short-lived quotes"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        ui.get_market_quotes.clear()
+        self.addCleanup(ui.get_market_quotes.clear)
+
+    def test_quotes_from_one_batched_download(self):
+        """Test every symbol's latest price and previous close come from a single request"""
+        index = pd.bdate_range("2024-06-24", periods=3)
+        columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Close"]])
+        data = pd.DataFrame([[100.0, 300.0], [101.0, 301.0], [102.5, np.nan]], index=index, columns=columns)
+
+        with patch.object(ui.yf, 'download', return_value=data) as mock_download:
+            quotes = ui.get_market_quotes(("AAPL", "MSFT", "NVDA"))
+
+        mock_download.assert_called_once()
+        self.assertEqual(quotes["AAPL"], {"price": 102.5, "previous_close": 101.0})
+        self.assertEqual(quotes["MSFT"], {"price": 301.0, "previous_close": 300.0})
+        self.assertNotIn("NVDA", quotes)
+
+    def test_failed_download_returns_nothing(self):
+        """Test a failed download leaves the section on its daily history"""
+        with patch.object(ui.yf, 'download', side_effect=Exception("offline")):
+            self.assertEqual(ui.get_market_quotes(("AAPL",)), {})
+
+
+class SessionState(dict):
+    """Dict with the attribute access st.session_state also allows"""
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+class TestDashboardFragments(unittest.TestCase):
+    """Test cases for the independently refreshing dashboard sections"""
+
+    def test_sections_rerun_on_their_own_intervals(self):
+        """Test each section is a fragment with its configured refresh interval"""
+        intervals = {}
+
+        def record_fragment(run_every=None):
+            def register(func):
+                intervals[func.__name__] = run_every
+                return func
+            return register
+
+        with patch('streamlit.fragment', record_fragment):
+            importlib.reload(dashboard)
+        importlib.reload(dashboard)
+
+        self.assertEqual(intervals, {
+            "dashboard_portfolios_section": ui.DASHBOARD_REFRESH_SECONDS["portfolios"],
+            "dashboard_community_section": ui.DASHBOARD_REFRESH_SECONDS["community"],
+            "dashboard_market_section": ui.DASHBOARD_REFRESH_SECONDS["market"],
+        })
+
+    @patch.object(dashboard, 'calculate_stock_prediction', return_value={"predicted_price": 120.0})
+    @patch.object(dashboard, 'get_stock_data')
+    @patch.object(dashboard, 'get_user_portfolios')
+    def test_portfolio_predictions_use_cached_history(self, mock_portfolios, mock_stock_data, mock_predict):
+        """Test the periodically rerun portfolio section reads history through the cached helper"""
+        summary = {"total_portfolios": 1, "total_stocks": 2, "total_invested": 300.0}
+        mock_portfolios.return_value = [{"portfolio_name": "Core", "stocks": [
+            {"symbol": "AAPL", "shares": 1, "purchase_price": 100.0},
+            {"symbol": "MSFT", "shares": 2, "purchase_price": 100.0},
+        ]}]
+        mock_stock_data.return_value = pd.DataFrame({"Close": np.linspace(90, 110, 60)})
+
+        with patch.object(dashboard.st, 'session_state', SessionState(username="alice")), \
+                patch('yfinance.Ticker') as mock_ticker:
+            # The fragment wrapper only runs its body inside a script run
+            dashboard.dashboard_portfolios_section.__wrapped__(MagicMock(), summary)
+
+        mock_ticker.assert_not_called()
+        self.assertEqual(
+            [call.args for call in mock_stock_data.call_args_list],
+            [("AAPL", 730), ("MSFT", 730)]
+        )
+
+
+class TestDashboardNavigation(unittest.TestCase):
+    """Test cases for dashboard navigation kept outside the fragments"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.session_state = SessionState(page="dashboard", username="alice")
+        patcher = patch.object(dashboard.st, 'session_state', self.session_state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_quick_actions_navigate_in_callbacks(self):
+        """Test quick actions only register callbacks and never rerun mid-page"""
+        summary = {"total_portfolios": 2, "total_stocks": 5, "total_invested": 100.0}
+        with patch.object(dashboard, 'nav_button', return_value=False) as mock_nav_button, \
+                patch.object(dashboard.st, 'columns', return_value=[MagicMock(), MagicMock(), MagicMock()]), \
+                patch.object(dashboard.st, 'subheader'), \
+                patch.object(dashboard.st, 'rerun') as mock_rerun:
+            dashboard.dashboard_quick_actions(summary)
+
+        pages = [call[0][1] for call in mock_nav_button.call_args_list]
+        self.assertEqual(pages, ["create_portfolio", "portfolios", "stock_analysis"])
+        mock_rerun.assert_not_called()
+
+    def test_summary_aggregated_once_per_run(self):
+        """Test the page computes the portfolio summary once and hands it to both sections"""
+        summary = {"total_portfolios": 0, "total_stocks": 0, "total_invested": 0}
+        sections = ('dashboard_quick_actions', 'dashboard_portfolios_section', 'dashboard_community_section',
+                    'dashboard_community_details', 'dashboard_popular_holdings', 'dashboard_market_section',
+                    'prefetch_popular_symbols', 'nav_button')
+        patchers = [patch.object(dashboard, name) for name in sections]
+        mocks = dict(zip(sections, (patcher.start() for patcher in patchers)))
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+        with patch.object(dashboard, 'get_user_portfolio_summary', return_value=summary) as mock_summary, \
+                patch.object(dashboard, 'get_session_profile', return_value=None):
+            dashboard.dashboard_page(MagicMock(), MagicMock(), MagicMock())
+
+        mock_summary.assert_called_once_with("alice")
+        mocks['dashboard_quick_actions'].assert_called_once_with(summary)
+        self.assertIs(mocks['dashboard_portfolios_section'].call_args[0][1], summary)
+
+    def test_view_details_hidden_without_portfolios(self):
+        """Test View Details is only rendered when the community section listed portfolios"""
+        with patch.object(dashboard.st, 'button') as mock_button:
+            self.session_state["community_card_owners"] = {}
+            dashboard.dashboard_community_details()
+            mock_button.assert_not_called()
+
+            self.session_state["community_card_owners"] = {"p1": "bob"}
+            dashboard.dashboard_community_details()
+
+        self.assertIs(mock_button.call_args[1]["on_click"], dashboard.open_community_portfolio)
+
+    def test_view_details_opens_picked_portfolio(self):
+        """Test the View Details callback opens the portfolio picked in the community fragment"""
+        self.session_state.update({
+            "community_selected": "p2",
+            "community_card_owners": {"p1": "bob", "p2": "carol"},
+        })
+
+        dashboard.open_community_portfolio()
+
+        self.assertEqual(self.session_state["page"], "media_portfolio_view")
+        self.assertEqual(self.session_state["media_portfolio_id"], "p2")
+        self.assertEqual(self.session_state["media_portfolio_owner"], "carol")
+
+    def test_view_details_without_pick_stays(self):
+        """Test the callback does nothing when no community portfolio is shown"""
+        dashboard.open_community_portfolio()
+
+        self.assertEqual(self.session_state["page"], "dashboard")
+
+
+class TestHoldingFetches(unittest.TestCase):
+    """Test cases for the concurrent per-holding fetches on the portfolio pages"""
+
+    def test_every_symbol_and_period_yielded(self):
+        """Test each symbol/period pair is fetched once, duplicates included"""
+        with patch.object(ui, 'fetch_holding_closes', side_effect=lambda symbol, period: f"{symbol}-{period}") as mock_fetch:
+            results = list(ui.iter_holding_closes(["AAPL", "MSFT", "AAPL"], ("1d", "1mo")))
+
+        self.assertEqual(mock_fetch.call_count, 4)
+        self.assertEqual(
+            sorted(results),
+            sorted((symbol, period, f"{symbol}-{period}") for symbol in ("AAPL", "MSFT") for period in ("1d", "1mo"))
+        )
+
+    def test_slow_fetch_reported_unavailable(self):
+        """Test fetches still running at the timeout are yielded as None"""
+        def fetch(symbol, period):
+            if symbol == "SLOW":
+                time.sleep(0.5)
+            return symbol
+
+        with patch.object(ui, 'fetch_holding_closes', side_effect=fetch):
+            results = dict(((symbol, period), closes) for symbol, period, closes in
+                           ui.iter_holding_closes(["FAST", "SLOW"], ("1d",), timeout=0.2))
+
+        self.assertEqual(results, {("FAST", "1d"): "FAST", ("SLOW", "1d"): None})
+
+    def test_prices_fall_back_to_stored_values(self):
+        """Test table rows are built from purchase data before any quote arrives"""
+        stocks = [{"symbol": "AAPL", "shares": 2, "purchase_price": 100.0}]
+
+        rows = ui.holding_rows(stocks, {})
+        live_rows = ui.holding_rows(stocks, {"AAPL": 150.0})
+
+        self.assertEqual(rows[0]["Current Average Price"], "$100.00 (est.)")
+        self.assertEqual(live_rows[0]["Current Value"], "$300.00")
+
+    def test_prediction_needs_history(self):
+        """Test predictions need at least 30 closes and scale by shares"""
+        closes = pd.Series(np.arange(60, dtype=float) + 100, index=pd.bdate_range("2024-01-01", periods=60))
+        stock = {"symbol": "AAPL", "shares": 2}
+
+        self.assertIsNone(ui.holding_prediction(stock, closes.head(10)))
+        self.assertIsNone(ui.holding_prediction(stock, None))
+        pred = ui.holding_prediction(stock, closes)
+        self.assertAlmostEqual(pred["predicted_price"], 100.0 + 60 + 365)
+        self.assertAlmostEqual(pred["predicted_value"], pred["predicted_price"] * 2)
+
+
+class TestStockSearch(unittest.TestCase):
+    """Test cases for paginated stock search and the shared add form"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.results = [{"symbol": f"S{i}", "name": f"Stock {i}", "price": 10.0, "change": 0.5, "country": "United States"}
+                        for i in range(60)]
+        self.session_state = {}
+        patcher = patch.object(ui.st, 'session_state', self.session_state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_page_size_and_clamping(self):
+        """Test pages hold at most the page size and out-of-range pages are clamped"""
+        rows, page, page_count = ui.search_results_page(self.results, 0, page_size=25)
+        last_rows, last_page, _ = ui.search_results_page(self.results, 10, page_size=25)
+
+        self.assertEqual((len(rows), page, page_count), (25, 0, 3))
+        self.assertEqual((len(last_rows), last_page), (10, 2))
+        self.assertEqual(ui.search_results_page([], 3)[1:], (0, 1))
+
+    def test_filter_by_symbol_or_name(self):
+        """Test queries match symbols case-insensitively and company names"""
+        self.assertEqual([s["symbol"] for s in ui.filter_search_results(self.results, "s59")], ["S59"])
+        self.assertEqual(len(ui.filter_search_results(self.results, "stock 5")), 11)
+        self.assertIs(ui.filter_search_results(self.results, ""), self.results)
+
+    def test_add_selected_result(self):
+        """Test the selected row is saved once and duplicates are refused"""
+        self.session_state["current_portfolio"] = {"_id": "p1", "stocks": []}
+        with patch.object(ui, 'add_stock_to_portfolio', return_value=(True, "ok")) as mock_add:
+            success, _ = ui.add_search_result_to_portfolio(self.results[0], 3, 12.5)
+            duplicate, message = ui.add_search_result_to_portfolio(self.results[0], 1, 12.5)
+
+        self.assertTrue(success)
+        self.assertFalse(duplicate)
+        self.assertIn("already", message)
+        mock_add.assert_called_once()
+        self.assertEqual(mock_add.call_args[0][1]["purchase_value"], 37.5)
+        self.assertEqual(len(self.session_state["current_portfolio"]["stocks"]), 1)
+
+    def test_failed_save_not_kept(self):
+        """Test a failed database write leaves the session portfolio unchanged"""
+        self.session_state["current_portfolio"] = {"_id": "p1", "stocks": []}
+        with patch.object(ui, 'add_stock_to_portfolio', return_value=(False, "boom")):
+            success, message = ui.add_search_result_to_portfolio(self.results[0], 1, 10.0)
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Failed to save: boom")
+        self.assertEqual(self.session_state["current_portfolio"]["stocks"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,9 @@ import os
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from database import DatabaseConfig, db_config, get_db, get_users_collection, get_dashboard_collection, initialize_database
+import database
+from database import (DatabaseConfig, SharedConnection, db_config, get_db, get_users_collection,
+                      get_dashboard_collection, get_pool_sizes, get_shared_connection, initialize_database)
 from pymongo.errors import ConnectionFailure
 
 
@@ -42,10 +44,11 @@ class TestDatabaseConfig(unittest.TestCase):
         uri = self.db_config.connection_string
         self.assertEqual(uri, 'mongodb://localhost:27017/test')
 
-    @patch('pymongo.MongoClient')
+    @patch.object(database, 'MongoClient')
     @patch.dict(os.environ, {'MONGODB_URI': 'mongodb://localhost:27017/test'})
     def test_successful_connection(self, mock_mongo_client):
-        """Test successful database connection"""
+        """Test successful database connection does not block on the cluster"""
+        get_shared_connection.clear()
         mock_client = MagicMock()
         mock_mongo_client.return_value = mock_client
         
@@ -53,12 +56,43 @@ class TestDatabaseConfig(unittest.TestCase):
         
         self.assertTrue(result)
         mock_mongo_client.assert_called_once()
-        mock_client.server_info.assert_called_once()
+        mock_client.server_info.assert_not_called()
+        self.assertFalse(self.db_config.is_ready())
 
-    @patch('pymongo.MongoClient')
+    @patch.object(database, 'MongoClient')
+    @patch.dict(os.environ, {'MONGODB_URI': 'mongodb://localhost:27017/test'})
+    def test_client_shared_across_configs(self, mock_mongo_client):
+        """Test that every DatabaseConfig reuses the process-wide client"""
+        get_shared_connection.clear()
+        mock_mongo_client.return_value = MagicMock()
+        other_config = DatabaseConfig()
+        
+        self.db_config.connect()
+        other_config.connect()
+        
+        mock_mongo_client.assert_called_once()
+        self.assertIs(self.db_config._client, other_config._client)
+
+    @patch.dict(os.environ, {'EXPECTED_CONCURRENT_SESSIONS': '40'})
+    def test_pool_sizes_follow_expected_concurrency(self):
+        """Test pool bounds are derived from the expected session count"""
+        min_pool_size, max_pool_size = get_pool_sizes()
+        
+        self.assertEqual(max_pool_size, 80)
+        self.assertEqual(min_pool_size, 10)
+
+    @patch.dict(os.environ, {'EXPECTED_CONCURRENT_SESSIONS': 'lots'})
+    def test_pool_sizes_invalid_env_var(self):
+        """Test pool bounds fall back to defaults on a bad value"""
+        min_pool_size, max_pool_size = get_pool_sizes()
+        
+        self.assertEqual((min_pool_size, max_pool_size), (5, 40))
+
+    @patch.object(database, 'MongoClient')
     @patch.dict(os.environ, {'MONGODB_URI': 'mongodb://localhost:27017/test'})
     def test_connection_failure(self, mock_mongo_client):
         """Test database connection failure"""
+        get_shared_connection.clear()
         mock_mongo_client.side_effect = ConnectionFailure("Connection failed")
         
         with patch('streamlit.error'):
@@ -167,6 +201,45 @@ class TestDatabaseConfig(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestSharedConnection(unittest.TestCase):
+    """Test cases for the background warm-up of the shared client"""
+
+    def test_warm_up_sets_ready(self):
+        """Test warm-up pings the cluster and runs the ready callback"""
+        mock_client = MagicMock()
+        on_ready = Mock()
+        connection = SharedConnection(mock_client)
+        
+        connection.start_warm_up(on_ready=on_ready)
+        
+        self.assertTrue(connection.ready.wait(2))
+        mock_client.admin.command.assert_called_with("ping")
+        on_ready.assert_called_once()
+
+    def test_warm_up_retries_after_failure(self):
+        """Test warm-up records the error and retries until the ping succeeds"""
+        mock_client = MagicMock()
+        mock_client.admin.command.side_effect = [ConnectionFailure("down"), {"ok": 1}]
+        connection = SharedConnection(mock_client)
+        
+        connection.start_warm_up(retry_interval=0.01)
+        
+        self.assertTrue(connection.ready.wait(2))
+        self.assertEqual(mock_client.admin.command.call_count, 2)
+        self.assertIsNone(connection.last_error)
+
+    def test_warm_up_started_once(self):
+        """Test repeated calls do not spawn extra warm-up threads"""
+        mock_client = MagicMock()
+        connection = SharedConnection(mock_client)
+        
+        connection.start_warm_up()
+        connection.ready.wait(2)
+        connection.start_warm_up()
+        
+        self.assertEqual(mock_client.admin.command.call_count, 1)
+
+
 class TestGlobalFunctions(unittest.TestCase):
     """Test cases for global database functions"""
 
@@ -207,13 +280,12 @@ class TestGlobalFunctions(unittest.TestCase):
     def test_initialize_database_success(self, mock_db_config):
         """Test successful database initialization"""
         mock_db_config.connect.return_value = True
-        mock_db_config.create_indexes.return_value = True
         
         result = initialize_database()
         
         self.assertTrue(result)
         mock_db_config.connect.assert_called_once()
-        mock_db_config.create_indexes.assert_called_once()
+        mock_db_config.start_warm_up.assert_called_once()
 
     @patch('database.db_config')
     def test_initialize_database_failure(self, mock_db_config):
@@ -224,7 +296,7 @@ class TestGlobalFunctions(unittest.TestCase):
         
         self.assertFalse(result)
         mock_db_config.connect.assert_called_once()
-        mock_db_config.create_indexes.assert_not_called()
+        mock_db_config.start_warm_up.assert_not_called()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+from datetime import datetime
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import leaderboard
+from bson import ObjectId
+
+
+def make_closes(start, step, days=60):
+    """Daily closes on a straight line"""
+    index = pd.date_range(end=datetime(2024, 6, 28), periods=days, freq='D')
+    return pd.Series([start + step * i for i in range(days)], index=index)
+
+
+class TestComputeEntry(unittest.TestCase):
+    """Test cases for building leaderboard documents"""
+
+    def test_compute_entry_values(self):
+        """Test real return and prediction are derived from closes"""
+        portfolio = {
+            "_id": ObjectId(),
+            "user_id": "alice",
+            "portfolio_name": "Growth",
+            "stocks": [{"symbol": "AAPL", "shares": 2, "purchase_price": 100.0}],
+        }
+        closes = make_closes(100.0, 1.0)
+
+        entry = leaderboard.compute_entry(portfolio, lambda symbol: closes)
+
+        self.assertEqual(entry["purchase_value"], 200.0)
+        self.assertAlmostEqual(entry["current_value"], 2 * 159.0)
+        self.assertAlmostEqual(entry["real_return_pct"], 59.0)
+        self.assertAlmostEqual(entry["predicted_value"], 2 * (100.0 + 60 + 365))
+        self.assertEqual(entry["symbols"], ["AAPL"])
+        self.assertEqual(entry["as_of"], datetime(2024, 6, 28))
+        self.assertFalse(entry["stale"])
+
+    def test_compute_entry_missing_prices(self):
+        """Test holdings without price data fall back to the purchase price"""
+        portfolio = {"stocks": [{"symbol": "XXXX", "shares": 1, "price": 50.0}]}
+
+        entry = leaderboard.compute_entry(portfolio, lambda symbol: None)
+
+        self.assertEqual(entry["current_value"], 50.0)
+        self.assertEqual(entry["predicted_value"], 50.0)
+        self.assertEqual(entry["real_return_pct"], 0)
+        self.assertIsNone(entry["as_of"])
+
+
+class TestLeaderboardStorage(unittest.TestCase):
+    """Test cases for the leaderboard collection operations"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_leaderboard = MagicMock()
+        self.mock_portfolios = MagicMock()
+        for name, value in (('get_leaderboard_collection', self.mock_leaderboard),
+                            ('get_portfolios_collection', self.mock_portfolios)):
+            patcher = patch.object(leaderboard, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        leaderboard._noted_bars.clear()
+
+    def test_mark_stale_upserts(self):
+        """Test a portfolio change flags its entry"""
+        portfolio_id = ObjectId()
+
+        leaderboard.mark_stale(portfolio_id)
+
+        self.mock_leaderboard.update_one.assert_called_once_with(
+            {"_id": portfolio_id}, {"$set": {"stale": True}, "$inc": {"stale_version": 1}}, upsert=True
+        )
+
+    def test_note_latest_bar_once_per_date(self):
+        """Test a new bar flags holders once per symbol and date"""
+        bar_date = datetime(2024, 6, 28)
+
+        leaderboard.note_latest_bar("AAPL", bar_date)
+        leaderboard.note_latest_bar("AAPL", bar_date)
+
+        self.mock_leaderboard.update_many.assert_called_once_with(
+            {"symbols": "AAPL", "as_of": {"$lt": bar_date}},
+            {"$set": {"stale": True}, "$inc": {"stale_version": 1}}
+        )
+
+    def test_leaderboard_page_is_single_sorted_query(self):
+        """Test reading a ranking is one indexed find"""
+        leaderboard.get_leaderboard_page("me", rank_by="predicted_value", limit=5)
+
+        query = self.mock_leaderboard.find.call_args[0][0]
+        self.assertEqual(query["user_id"], {"$ne": "me"})
+        self.mock_leaderboard.find.return_value.sort.assert_called_once_with("predicted_value", -1)
+        self.mock_leaderboard.find.return_value.sort.return_value.limit.assert_called_once_with(5)
+
+    def test_refresh_stale_entries(self):
+        """Test only stale entries are recomputed and orphans removed"""
+        live_id, gone_id = ObjectId(), ObjectId()
+        self.mock_leaderboard.find.return_value.limit.return_value = [{"_id": live_id}, {"_id": gone_id}]
+        self.mock_portfolios.find.return_value = [
+            {"_id": live_id, "stocks": [{"symbol": "AAPL", "shares": 1, "price": 10.0}]}
+        ]
+
+        updated = leaderboard.refresh_stale_entries(lambda symbol: make_closes(10.0, 0.5))
+
+        self.assertEqual(updated, 1)
+        self.mock_leaderboard.delete_many.assert_called_once_with({"_id": {"$in": [gone_id]}})
+        operations = self.mock_leaderboard.bulk_write.call_args[0][0]
+        self.assertEqual(len(operations), 1)
+
+    def test_refresh_write_conditional_on_stale_version(self):
+        """Test the recomputed entry is only written if it was not re-flagged meanwhile"""
+        portfolio_id = ObjectId()
+        self.mock_leaderboard.find.return_value.limit.return_value = [{"_id": portfolio_id, "stale_version": 3}]
+        self.mock_portfolios.find.return_value = [
+            {"_id": portfolio_id, "stocks": [{"symbol": "AAPL", "shares": 1, "price": 10.0}]}
+        ]
+
+        leaderboard.refresh_stale_entries(lambda symbol: make_closes(10.0, 0.5))
+
+        operation = self.mock_leaderboard.bulk_write.call_args[0][0][0]
+        self.assertEqual(operation._filter, {"_id": portfolio_id, "stale_version": 3})
+        self.assertFalse(operation._doc["$set"]["stale"])
+
+
+if __name__ == '__main__':
+    unittest.main()
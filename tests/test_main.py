@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import patch, MagicMock, Mock
+import importlib
 import sys
 import os
 
@@ -64,62 +65,59 @@ class TestMainApplication(unittest.TestCase):
         mock_error.assert_called_with("Failed to initialize database. Please check your MongoDB connection.")
         mock_stop.assert_called_once()
 
-    @patch('streamlit.set_page_config')
-    @patch('main.initialize_database')
-    @patch('streamlit.session_state')
-    @patch('streamlit.markdown')
-    @patch('main.login_page')
-    def test_main_login_page_route(self, mock_login_page, mock_markdown, 
-                                  mock_session_state, mock_init_db, mock_set_page_config):
+    def run_route(self, session_state):
+        """Run main() with the given session state; returns the mocked load_page and the module"""
+        mock_session_state = MagicMock(**session_state)
+        mock_session_state.__contains__.side_effect = lambda key: key in session_state
+        mock_session_state.get.side_effect = lambda key, default=None: session_state.get(key, default)
+
+        with patch('streamlit.session_state', mock_session_state), \
+                patch('streamlit.markdown'), \
+                patch('main.is_database_ready', return_value=True), \
+                patch('main.write_session_cookie'), \
+                patch('main.load_page') as mock_load_page:
+            # conftest's clean_imports drops cached modules, so patch() above imported a
+            # fresh main; run that one rather than the function imported at the top
+            app = importlib.import_module('main')
+            app.main()
+
+        return mock_load_page, app
+
+    def test_main_login_page_route(self):
         """Test main function routing to login page"""
-        mock_init_db.return_value = True
-        mock_session_state.__contains__.side_effect = lambda key: key in self.default_session_state
-        mock_session_state.__getitem__.side_effect = lambda key: self.default_session_state[key]
-        mock_session_state.get.side_effect = lambda key, default=None: self.default_session_state.get(key, default)
-        
-        main()
-        
-        mock_login_page.assert_called_once()
+        mock_load_page, app = self.run_route(self.default_session_state)
 
-    @patch('streamlit.set_page_config')
-    @patch('main.initialize_database')
-    @patch('streamlit.session_state')
-    @patch('streamlit.markdown')
-    @patch('main.register_page')
-    def test_main_register_page_route(self, mock_register_page, mock_markdown, 
-                                     mock_session_state, mock_init_db, mock_set_page_config):
+        mock_load_page.assert_called_once_with("login")
+        mock_load_page.return_value.assert_called_once_with(app.go_to, app.verify_user, app.update_last_login)
+
+    def test_main_register_page_route(self):
         """Test main function routing to register page"""
-        mock_init_db.return_value = True
         session_state = self.default_session_state.copy()
         session_state["page"] = "register"
-        
-        mock_session_state.__contains__.side_effect = lambda key: key in session_state
-        mock_session_state.__getitem__.side_effect = lambda key: session_state[key]
-        mock_session_state.get.side_effect = lambda key, default=None: session_state.get(key, default)
-        
-        main()
-        
-        mock_register_page.assert_called_once()
 
-    @patch('streamlit.set_page_config')
-    @patch('main.initialize_database')
-    @patch('streamlit.session_state')
-    @patch('streamlit.markdown')
-    @patch('main.dashboard_page')
-    def test_main_dashboard_page_route(self, mock_dashboard_page, mock_markdown, 
-                                      mock_session_state, mock_init_db, mock_set_page_config):
+        mock_load_page, app = self.run_route(session_state)
+
+        mock_load_page.assert_called_once_with("register")
+        mock_load_page.return_value.assert_called_once_with(app.go_to, app.register_user)
+
+    def test_main_dashboard_page_route(self):
         """Test main function routing to dashboard page"""
-        mock_init_db.return_value = True
         session_state = self.default_session_state.copy()
         session_state["logged_in"] = True
-        
-        mock_session_state.__contains__.side_effect = lambda key: key in session_state
-        mock_session_state.__getitem__.side_effect = lambda key: session_state[key]
-        mock_session_state.get.side_effect = lambda key, default=None: session_state.get(key, default)
-        
-        main()
-        
-        mock_dashboard_page.assert_called_once()
+
+        mock_load_page, app = self.run_route(session_state)
+
+        mock_load_page.assert_called_once_with("dashboard")
+        mock_load_page.return_value.assert_called_once_with(app.go_to, app.get_user_info, app.change_password)
+
+    def test_logged_out_page_request_routes_to_login(self):
+        """Test a logged-out visitor asking for a private page is sent to login by the dispatch table"""
+        session_state = self.default_session_state.copy()
+        session_state["page"] = "portfolio_details"
+
+        mock_load_page, _ = self.run_route(session_state)
+
+        mock_load_page.assert_called_once_with("login")
 
     @patch('streamlit.set_page_config')
     @patch('main.initialize_database')
@@ -201,8 +199,8 @@ class TestSessionStateInitialization(unittest.TestCase):
     @patch('main.initialize_database')
     @patch('streamlit.session_state', new_callable=dict)
     @patch('streamlit.markdown')
-    @patch('main.login_page')
-    def test_session_state_initialization(self, mock_login_page, mock_markdown, 
+    @patch('main.load_page')
+    def test_session_state_initialization(self, mock_load_page, mock_markdown, 
                                         mock_session_state, mock_init_db, mock_set_page_config):
         """Test that session state is properly initialized"""
         mock_init_db.return_value = True
@@ -218,8 +216,8 @@ class TestSessionStateInitialization(unittest.TestCase):
     @patch('main.initialize_database')
     @patch('streamlit.session_state')
     @patch('streamlit.markdown')
-    @patch('main.login_page')
-    def test_session_state_preservation(self, mock_login_page, mock_markdown, 
+    @patch('main.load_page')
+    def test_session_state_preservation(self, mock_load_page, mock_markdown, 
                                       mock_session_state, mock_init_db, mock_set_page_config):
         """Test that existing session state is preserved"""
         mock_init_db.return_value = True
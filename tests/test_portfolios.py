@@ -0,0 +1,317 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import login
+from bson import ObjectId
+from datetime import datetime, timezone
+
+
+class TestAddStockToPortfolio(unittest.TestCase):
+    """Test cases for add_stock_to_portfolio"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.portfolio_id = str(ObjectId())
+        self.stock = {"symbol": "AAPL", "shares": 2, "price": 150.0}
+        self.mock_collection = MagicMock()
+        patcher = patch.object(login, 'get_portfolios_collection', return_value=self.mock_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_add_stock_single_round_trip(self):
+        """Test a new holding is pushed with one conditional update"""
+        self.mock_collection.update_one.return_value.modified_count = 1
+
+        success, message = login.add_stock_to_portfolio(self.portfolio_id, self.stock)
+
+        self.assertTrue(success)
+        self.assertIn("AAPL", message)
+        self.mock_collection.find_one.assert_not_called()
+        query, update = self.mock_collection.update_one.call_args[0]
+        self.assertEqual(query["stocks.symbol"], {"$ne": "AAPL"})
+        self.assertEqual(update["$push"], {"stocks": self.stock})
+
+    def test_add_stock_duplicate(self):
+        """Test a duplicate symbol is reported as already existing"""
+        self.mock_collection.update_one.return_value.modified_count = 0
+        self.mock_collection.find_one.return_value = {"_id": ObjectId(self.portfolio_id)}
+
+        success, message = login.add_stock_to_portfolio(self.portfolio_id, self.stock)
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Stock AAPL already exists in portfolio")
+
+    def test_add_stock_missing_portfolio(self):
+        """Test a missing portfolio is distinguished from a duplicate"""
+        self.mock_collection.update_one.return_value.modified_count = 0
+        self.mock_collection.find_one.return_value = None
+
+        success, message = login.add_stock_to_portfolio(self.portfolio_id, self.stock)
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Portfolio not found")
+
+    def test_add_stock_no_database(self):
+        """Test a missing connection returns a flat error tuple"""
+        with patch.object(login, 'get_portfolios_collection', return_value=None):
+            result = login.add_stock_to_portfolio(self.portfolio_id, self.stock)
+
+        self.assertEqual(result, (False, "Database connection failed"))
+
+
+class TestUpdatePortfolioHoldings(unittest.TestCase):
+    """Test cases for diff-based holdings updates"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.portfolio_id = str(ObjectId())
+        self.mock_collection = MagicMock()
+        self.mock_collection.bulk_write.return_value.matched_count = 1
+        patcher = patch.object(login, 'get_portfolios_collection', return_value=self.mock_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_share_changes_use_array_filters(self):
+        """Test changed share counts are targeted with arrayFilters"""
+        success, message = login.update_portfolio_holdings(self.portfolio_id, {"AAPL": 5, "MSFT": 3})
+
+        self.assertTrue(success)
+        operations = self.mock_collection.bulk_write.call_args[0][0]
+        self.assertEqual(len(operations), 1)
+        update = operations[0]._doc["$set"]
+        self.assertEqual(update["stocks.$[h0].shares"], 5)
+        self.assertEqual(update["stocks.$[h1].shares"], 3)
+        self.assertEqual(operations[0]._array_filters, [{"h0.symbol": "AAPL"}, {"h1.symbol": "MSFT"}])
+        self.assertNotIn("stocks", update)
+
+    def test_zero_shares_pulls_holding(self):
+        """Test a zero share count becomes a $pull in the same bulk write"""
+        success, message = login.update_portfolio_holdings(self.portfolio_id, {"AAPL": 5, "TSLA": 0})
+
+        self.assertTrue(success)
+        self.mock_collection.bulk_write.assert_called_once()
+        operations = self.mock_collection.bulk_write.call_args[0][0]
+        self.assertEqual(len(operations), 2)
+        self.assertEqual(operations[1]._doc["$pull"], {"stocks": {"symbol": {"$in": ["TSLA"]}}})
+
+    def test_no_changes(self):
+        """Test an empty change set does not hit the database"""
+        success, message = login.update_portfolio_holdings(self.portfolio_id, {})
+
+        self.assertFalse(success)
+        self.mock_collection.bulk_write.assert_not_called()
+
+    def test_missing_portfolio(self):
+        """Test a portfolio that matched nothing is reported"""
+        self.mock_collection.bulk_write.return_value.matched_count = 0
+
+        success, message = login.update_portfolio_holdings(self.portfolio_id, {"AAPL": 1})
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Portfolio not found")
+
+
+class TestPortfolioCache(unittest.TestCase):
+    """Test cases for the read-through portfolio cache"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        login.portfolio_cache.clear()
+        self.addCleanup(login.portfolio_cache.clear)
+        self.portfolio_id = ObjectId()
+        self.document = {
+            "_id": self.portfolio_id,
+            "portfolio_name": "Growth",
+            "stocks": [{"symbol": "AAPL", "shares": 1}],
+            "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc)
+        }
+        self.mock_collection = MagicMock()
+        self.mock_collection.find_one.return_value = self.document
+        patcher = patch.object(login, 'get_portfolios_collection', return_value=self.mock_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_reads_hit_cache(self):
+        """Test a second read within the window costs no round trip"""
+        first = login.get_portfolio_by_id(str(self.portfolio_id))
+        second = login.get_portfolio_by_id(str(self.portfolio_id))
+
+        self.assertEqual(first, second)
+        self.mock_collection.find_one.assert_called_once()
+
+    def test_cached_documents_are_copies(self):
+        """Test callers mutating a result do not corrupt the cache"""
+        first = login.get_portfolio_by_id(str(self.portfolio_id))
+        first["stocks"].append({"symbol": "TSLA"})
+
+        second = login.get_portfolio_by_id(str(self.portfolio_id))
+
+        self.assertEqual(len(second["stocks"]), 1)
+
+    def test_write_invalidates_cache(self):
+        """Test a write forces the next read back to the database"""
+        login.get_portfolio_by_id(str(self.portfolio_id))
+        self.mock_collection.update_one.return_value.modified_count = 1
+
+        login.remove_stock_from_portfolio(str(self.portfolio_id), "AAPL")
+        login.get_portfolio_by_id(str(self.portfolio_id))
+
+        self.assertEqual(self.mock_collection.find_one.call_count, 2)
+
+    def test_stale_entry_revalidated_by_updated_at(self):
+        """Test an expired entry with an unchanged updated_at is reused"""
+        login.get_portfolio_by_id(str(self.portfolio_id))
+        self.mock_collection.find_one.return_value = {"_id": self.portfolio_id,
+                                                      "updated_at": self.document["updated_at"]}
+
+        with patch.object(login.portfolio_cache, 'revalidate_after', 0):
+            portfolio = login.get_portfolio_by_id(str(self.portfolio_id))
+
+        self.assertEqual(portfolio["portfolio_name"], "Growth")
+        self.assertEqual(self.mock_collection.find_one.call_args[0][1], {"updated_at": 1})
+
+    def test_older_document_does_not_replace_newer(self):
+        """Test put keeps the entry with the newest updated_at"""
+        login.portfolio_cache.put(self.document)
+        older = dict(self.document, portfolio_name="Old",
+                     updated_at=datetime(2023, 1, 1, tzinfo=timezone.utc))
+
+        login.portfolio_cache.put(older)
+        cached, is_fresh = login.portfolio_cache.lookup(str(self.portfolio_id))
+
+        self.assertEqual(cached["portfolio_name"], "Growth")
+
+
+class TestCommunityFeed(unittest.TestCase):
+    """Test cases for the keyset-paginated community feed"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_collection = MagicMock()
+        self.cursor = self.mock_collection.find.return_value.sort.return_value.limit.return_value
+        patcher = patch.object(login, 'get_portfolios_collection', return_value=self.mock_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_portfolios(self, count):
+        return [{"_id": ObjectId(), "user_id": "other",
+                 "created_at": datetime(2024, 1, 10 - idx, tzinfo=timezone.utc)}
+                for idx in range(count)]
+
+    def test_first_page_excludes_owner_server_side(self):
+        """Test the owner filter, projection and limit are sent to the server"""
+        self.cursor.__iter__.return_value = iter(self.make_portfolios(6))
+
+        page, next_cursor = login.get_community_feed("me", limit=5)
+
+        query, projection = self.mock_collection.find.call_args[0]
+        self.assertEqual(query["user_id"], {"$ne": "me"})
+        self.assertNotIn("stocks", projection)
+        self.assertIn("stocks.symbol", projection)
+        self.mock_collection.find.return_value.sort.return_value.limit.assert_called_once_with(6)
+        self.assertEqual(len(page), 5)
+        self.assertEqual(next_cursor, (page[-1]["created_at"], page[-1]["_id"]))
+
+    def test_last_page_has_no_cursor(self):
+        """Test a short page ends the feed"""
+        self.cursor.__iter__.return_value = iter(self.make_portfolios(2))
+
+        page, next_cursor = login.get_community_feed("me", limit=5)
+
+        self.assertEqual(len(page), 2)
+        self.assertIsNone(next_cursor)
+
+    def test_next_page_uses_keyset(self):
+        """Test the cursor becomes a (created_at, _id) range condition"""
+        self.cursor.__iter__.return_value = iter([])
+        created_at = datetime(2024, 1, 5, tzinfo=timezone.utc)
+        last_id = ObjectId()
+
+        login.get_community_feed("me", limit=5, after=(created_at, last_id))
+
+        query = self.mock_collection.find.call_args[0][0]
+        self.assertEqual(query["$or"], [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": last_id}},
+        ])
+
+
+class TestPortfolioSummary(unittest.TestCase):
+    """Test cases for the dashboard summary aggregation"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_collection = MagicMock()
+        patcher = patch.object(login, 'get_portfolios_collection', return_value=self.mock_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_summary_is_one_aggregation(self):
+        """Test totals come back as one document without fetching portfolios"""
+        summary = {"total_portfolios": 2, "total_stocks": 5, "total_invested": 1200.0}
+        self.mock_collection.aggregate.return_value = iter([summary])
+
+        result = login.get_user_portfolio_summary("alice")
+
+        self.assertEqual(result, summary)
+        self.mock_collection.find.assert_not_called()
+        pipeline = self.mock_collection.aggregate.call_args[0][0]
+        self.assertEqual(pipeline[0], {"$match": {"user_id": "alice", "is_active": True}})
+
+    def test_summary_without_portfolios(self):
+        """Test a user with no portfolios gets zero totals"""
+        self.mock_collection.aggregate.return_value = iter([])
+
+        result = login.get_user_portfolio_summary("alice")
+
+        self.assertEqual(result, {"total_portfolios": 0, "total_stocks": 0, "total_invested": 0})
+
+
+class TestSymbolHoldings(unittest.TestCase):
+    """Test cases for symbol-to-portfolio lookups"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_collection = MagicMock()
+        patcher = patch.object(login, 'get_portfolios_collection', return_value=self.mock_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_portfolios_holding_queries_symbol(self):
+        """Test the holder lookup filters on stocks.symbol"""
+        login.get_portfolios_holding("tsla", limit=3)
+
+        query, projection = self.mock_collection.find.call_args[0]
+        self.assertEqual(query, {"stocks.symbol": "TSLA", "is_active": True})
+        self.assertEqual(projection, login.COMMUNITY_CARD_PROJECTION)
+        self.mock_collection.find.return_value.sort.return_value.limit.assert_called_once_with(3)
+
+    def test_count_portfolios_holding(self):
+        """Test holder counts use count_documents on the same filter"""
+        self.mock_collection.count_documents.return_value = 4
+
+        self.assertEqual(login.count_portfolios_holding("TSLA"), 4)
+        self.mock_collection.count_documents.assert_called_once_with(
+            {"stocks.symbol": "TSLA", "is_active": True}
+        )
+
+    def test_symbol_popularity_aggregation(self):
+        """Test popularity is grouped per symbol, sorted by holders and limited"""
+        self.mock_collection.aggregate.return_value = [{"symbol": "AAPL", "portfolios": 3, "holders": 2}]
+
+        result = login.get_symbol_popularity(limit=5)
+
+        self.assertEqual(result[0]["symbol"], "AAPL")
+        pipeline = self.mock_collection.aggregate.call_args[0][0]
+        stages = [next(iter(stage)) for stage in pipeline]
+        self.assertEqual(stages, ["$match", "$project", "$unwind", "$group", "$project", "$sort", "$limit"])
+        self.assertEqual(pipeline[-1], {"$limit": 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
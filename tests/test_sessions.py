@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import sessions
+
+
+class TestSessions(unittest.TestCase):
+    """Test cases for the server-side session store"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_collection = MagicMock()
+        patcher = patch.object(sessions, 'get_sessions_collection', return_value=self.mock_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_create_session_stores_hash(self):
+        """Test only the token hash is stored, with an expiry for the TTL index"""
+        token = sessions.create_session("alice")
+
+        document = self.mock_collection.insert_one.call_args[0][0]
+        self.assertEqual(document["_id"], sessions.hash_token(token))
+        self.assertNotEqual(document["_id"], token)
+        self.assertEqual(document["user_id"], "alice")
+        self.assertEqual(document["expires_at"] - document["created_at"], sessions.SESSION_LIFETIME)
+
+    def test_restore_is_single_read(self):
+        """Test a restore looks up the live token hash without writing"""
+        self.mock_collection.find_one.return_value = {"user_id": "alice"}
+
+        self.assertEqual(sessions.get_session_user("token"), "alice")
+
+        query = self.mock_collection.find_one.call_args[0][0]
+        self.assertEqual(query["_id"], sessions.hash_token("token"))
+        self.assertIn("$gt", query["expires_at"])
+        self.mock_collection.insert_one.assert_not_called()
+        self.mock_collection.find_one_and_delete.assert_not_called()
+        self.mock_collection.delete_one.assert_not_called()
+
+    def test_two_restores_of_same_token(self):
+        """Test two tabs restoring the same token both get the user"""
+        self.mock_collection.find_one.return_value = {"user_id": "alice"}
+
+        self.assertEqual(sessions.get_session_user("token"), "alice")
+        self.assertEqual(sessions.get_session_user("token"), "alice")
+
+    def test_unknown_or_missing_token(self):
+        """Test expired, unknown and empty tokens resolve to no user"""
+        self.mock_collection.find_one.return_value = None
+
+        self.assertIsNone(sessions.get_session_user("expired"))
+        self.assertIsNone(sessions.get_session_user(None))
+
+    def test_end_session_deletes(self):
+        """Test logging out removes the stored session"""
+        sessions.end_session("token")
+
+        self.mock_collection.delete_one.assert_called_once_with({"_id": sessions.hash_token("token")})
+
+    def test_create_session_without_database(self):
+        """Test no token is issued when the database is unavailable"""
+        with patch.object(sessions, 'get_sessions_collection', return_value=None):
+            self.assertIsNone(sessions.create_session("alice"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import symbol_stats
+
+
+def make_bars(length=600, start="2022-01-03"):
+    """Daily OHLCV frame with a noisy close and an early spike"""
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range(start, periods=length)
+    close = np.cumsum(rng.normal(0, 1, length)) + 200
+    high = close + 2
+    high[10] = 1000
+    return pd.DataFrame({
+        "Open": close,
+        "High": high,
+        "Low": close - 2,
+        "Close": close,
+        "Volume": rng.integers(1000, 5000, length),
+    }, index=index)
+
+
+class TestSymbolStats(unittest.TestCase):
+    """Test cases for the per-symbol statistics record"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        symbol_stats.clear()
+        self.data = make_bars()
+
+    def test_52_week_window(self):
+        """Test the 52-week range covers the last year rather than the whole history"""
+        stats = symbol_stats.get_symbol_stats("AAPL", self.data)
+        last_year = self.data[self.data.index > self.data.index[-1] - pd.DateOffset(years=1)]
+
+        self.assertEqual(stats["high_52w"], last_year["High"].max())
+        self.assertEqual(stats["low_52w"], last_year["Low"].min())
+        self.assertEqual(stats["all_time_high"], 1000)
+
+    def test_matches_full_scan(self):
+        """Test the window statistics agree with pandas over the full series"""
+        stats = symbol_stats.get_symbol_stats("AAPL", self.data)
+        close = self.data["Close"]
+
+        self.assertAlmostEqual(stats["close_mean"], close.mean())
+        self.assertAlmostEqual(stats["close_median"], close.median())
+        self.assertAlmostEqual(stats["close_std"], close.std())
+        self.assertAlmostEqual(stats["average_volume"], self.data["Volume"].mean())
+        self.assertEqual(stats["close_max"] - stats["close_min"], close.max() - close.min())
+
+    def test_horizon_returns(self):
+        """Test returns are measured the horizon's trading days back"""
+        stats = symbol_stats.get_symbol_stats("AAPL", self.data)
+        close = self.data["Close"]
+
+        self.assertAlmostEqual(stats["returns"]["1 Day"], (close.iloc[-1] - close.iloc[-2]) / close.iloc[-2] * 100)
+        self.assertAlmostEqual(stats["returns"]["1 Year"], (close.iloc[-1] - close.iloc[-253]) / close.iloc[-253] * 100)
+        self.assertEqual(list(symbol_stats.returns_table(stats)["Period"]), list(symbol_stats.RETURN_HORIZONS))
+
+    def test_short_history_skips_long_horizons(self):
+        """Test horizons longer than the history are left out"""
+        stats = symbol_stats.get_symbol_stats("AAPL", self.data.head(30))
+
+        self.assertIn("1 Month", stats["returns"])
+        self.assertNotIn("3 Months", stats["returns"])
+
+    def test_incremental_append_matches_rebuild(self):
+        """Test appending new bars gives the same statistics as building the record in one pass"""
+        symbol_stats.get_symbol_stats("AAPL", self.data.iloc[:400])
+        incremental = symbol_stats.get_symbol_stats("AAPL", self.data)
+        rebuilt = symbol_stats.compute_view(
+            symbol_stats.append_bars(symbol_stats.new_record("AAPL"), self.data), self.data.index[0]
+        )
+
+        self.assertEqual(incremental["bar_count"], len(self.data))
+        for field in ("high_52w", "low_52w", "close_median", "total_return", "returns"):
+            self.assertEqual(incremental[field], rebuilt[field])
+        for field in ("close_mean", "close_std", "volatility", "average_volume"):
+            self.assertAlmostEqual(incremental[field], rebuilt[field])
+
+    def test_rolling_window_is_view_of_one_record(self):
+        """Test a window that starts a day later reuses the symbol's record instead of rebuilding"""
+        full = symbol_stats.get_symbol_stats("AAPL", self.data)
+        record = symbol_stats._records["AAPL"]
+
+        with patch.object(symbol_stats, 'append_bars', wraps=symbol_stats.append_bars) as mock_append:
+            window = symbol_stats.get_symbol_stats("AAPL", self.data.iloc[1:])
+
+        mock_append.assert_not_called()
+        self.assertEqual(list(symbol_stats._records), ["AAPL"])
+        self.assertIs(symbol_stats._records["AAPL"], record)
+        self.assertEqual(window["bar_count"], full["bar_count"] - 1)
+        self.assertAlmostEqual(window["close_mean"], self.data["Close"].iloc[1:].mean())
+
+    def test_rolling_window_appends_new_bar(self):
+        """Test the next day's window appends one bar to the stored history"""
+        symbol_stats.get_symbol_stats("AAPL", self.data.iloc[:-1])
+
+        window = symbol_stats.get_symbol_stats("AAPL", self.data.iloc[1:])
+
+        self.assertEqual(len(symbol_stats._records["AAPL"]["dates"]), len(self.data))
+        self.assertEqual(window["last_close"], self.data["Close"].iloc[-1])
+        self.assertEqual(window["first_bar"], self.data.index[1])
+
+    def test_back_adjusted_history_rebuilds(self):
+        """Test a revised close on an overlapping bar replaces the stored history"""
+        symbol_stats.get_symbol_stats("AAPL", self.data.iloc[:-1])
+        adjusted = make_bars()
+        adjusted[["Close", "High", "Low"]] *= 0.98
+
+        stats = symbol_stats.get_symbol_stats("AAPL", adjusted)
+
+        self.assertAlmostEqual(stats["close_mean"], adjusted["Close"].mean())
+        self.assertAlmostEqual(stats["all_time_high"], adjusted["High"].max())
+
+    def test_missing_values_reported_as_none(self):
+        """Test statistics without inputs are None rather than raising"""
+        data = self.data.head(30).copy()
+        data["High"] = np.nan
+        data.iloc[0, data.columns.get_loc("Close")] = 0.0
+
+        stats = symbol_stats.get_symbol_stats("AAPL", data)
+
+        self.assertIsNone(stats["high_52w"])
+        self.assertIsNone(stats["all_time_high"])
+        self.assertIsNone(stats["total_return"])
+        self.assertIsNone(stats["annualized_return"])
+
+    def test_empty_history(self):
+        """Test no record is built for missing data"""
+        self.assertIsNone(symbol_stats.get_symbol_stats("AAPL", pd.DataFrame()))
+        self.assertIsNone(symbol_stats.get_symbol_stats("AAPL", None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import subprocess
+import sys
+import os
+
+# Add src directory to path for imports
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import views
+from views import auth
+
+
+class TestPageDispatch(unittest.TestCase):
+    """Test cases for the page dispatch table in views"""
+
+    def test_every_page_resolves(self):
+        """Test each registered page loads a callable from its module"""
+        for name in views.PAGES:
+            with self.subTest(page=name):
+                self.assertTrue(callable(views.load_page(name)))
+
+    def test_logged_out_visitors_see_public_pages(self):
+        """Test visitors who are not logged in only reach login or register"""
+        self.assertEqual(views.resolve_page("register", False), "register")
+        self.assertEqual(views.resolve_page("dashboard", False), "login")
+        self.assertEqual(views.resolve_page("portfolio_details", False), "login")
+
+    def test_logged_in_routing(self):
+        """Test known pages route to themselves and others fall back to the dashboard"""
+        self.assertEqual(views.resolve_page("stock_search", True), "stock_search")
+        self.assertEqual(views.resolve_page("login", True), "dashboard")
+        self.assertEqual(views.resolve_page("no_such_page", True), "dashboard")
+
+    def test_login_page_skips_market_data_stack(self):
+        """Test loading the login page does not import yfinance, pandas or numpy"""
+        script = (
+            "import sys, views; views.load_page('login'); views.load_page('register'); "
+            "print(','.join(m for m in ('yfinance', 'pandas', 'numpy', 'altair') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=SRC_DIR,
+                                capture_output=True, text=True, timeout=60)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+class TestNavigation(unittest.TestCase):
+    """Test cases for callback-based navigation buttons"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.session_state = {"page": "portfolios", "analytics_portfolio_id": "old"}
+        patcher = patch.object(views.st, 'session_state', self.session_state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_set_page_updates_state(self):
+        """Test the callback switches page, sets page state and drops stale keys"""
+        views.set_page("portfolio_details", state={"view_portfolio_id": "p1"}, clear=("analytics_portfolio_id",))
+
+        self.assertEqual(self.session_state, {"page": "portfolio_details", "view_portfolio_id": "p1"})
+
+    def test_nav_button_navigates_in_callback(self):
+        """Test the button registers set_page as its on_click callback instead of rerunning"""
+        with patch.object(views.st, 'button', return_value=False) as mock_button:
+            views.nav_button("Dashboard", "dashboard", use_container_width=True)
+
+        _, kwargs = mock_button.call_args
+        self.assertIs(kwargs["on_click"], views.set_page)
+        self.assertEqual(kwargs["args"], ("dashboard",))
+        self.assertTrue(kwargs["use_container_width"])
+
+        kwargs["on_click"](*kwargs["args"], **kwargs["kwargs"])
+        self.assertEqual(self.session_state["page"], "dashboard")
+
+
+class TestSessionCookie(unittest.TestCase):
+    """Test cases for restoring logins from the session cookie"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.session_state = {"logged_in": False, "username": ""}
+        for name, value in (('session_state', self.session_state),
+                            ('context', MagicMock(cookies={"session": "old-token"}))):
+            patcher = patch.object(auth.st, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch('views.auth.sessions.get_session_user', return_value="alice")
+    def test_restore_keeps_token(self, mock_lookup):
+        """Test a valid cookie signs the user in without replacing the cookie"""
+        auth.restore_login()
+
+        mock_lookup.assert_called_once_with("old-token")
+        self.assertTrue(self.session_state["logged_in"])
+        self.assertEqual(self.session_state["username"], "alice")
+        self.assertEqual(self.session_state["session_token"], "old-token")
+        self.assertNotIn("session_cookie", self.session_state)
+
+    @patch('views.auth.sessions.get_session_user', return_value=None)
+    def test_restore_checked_once(self, mock_lookup):
+        """Test a rejected cookie is left in place and not looked up again on later runs"""
+        auth.restore_login()
+        auth.restore_login()
+
+        mock_lookup.assert_called_once()
+        self.assertFalse(self.session_state["logged_in"])
+        self.assertNotIn("session_cookie", self.session_state)
+
+    @patch('views.auth.sessions.get_session_user', return_value="alice")
+    def test_two_tabs_restore_same_token(self, mock_lookup):
+        """Test a second tab restoring the same cookie is signed in too"""
+        auth.restore_login()
+        second_tab = {"logged_in": False, "username": ""}
+        with patch.object(auth.st, 'session_state', second_tab):
+            auth.restore_login()
+
+        self.assertTrue(second_tab["logged_in"])
+        self.assertEqual(second_tab["username"], "alice")
+        self.assertEqual(mock_lookup.call_count, 2)
+
+    @patch('views.auth.components.html')
+    def test_cookie_written_once(self, mock_html):
+        """Test a queued cookie is written by the next run and then dropped"""
+        auth.queue_session_cookie("new-token")
+
+        auth.write_session_cookie()
+        auth.write_session_cookie()
+
+        mock_html.assert_called_once()
+        script = mock_html.call_args[0][0]
+        self.assertIn("session=new-token", script)
+
+
+class TestClientId(unittest.TestCase):
+    """Test cases for the client address used by login throttling"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # The pinned Streamlit's st.context has headers and cookies but no ip_address
+        context = MagicMock(spec=["headers", "cookies"], headers={"X-Forwarded-For": "6.6.6.6, 203.0.113.7"})
+        self.get_instance = MagicMock()
+        self.get_instance.return_value.get_client.return_value.request.remote_ip = "10.0.0.9"
+        for patcher in (patch.object(auth.st, 'context', context),
+                        patch('views.auth.get_script_run_ctx', return_value=MagicMock(session_id="s1")),
+                        patch('views.auth.runtime.exists', return_value=True),
+                        patch('views.auth.runtime.get_instance', self.get_instance)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_socket_address_without_context_ip(self):
+        """Test the websocket peer address is used when st.context has no ip_address"""
+        with patch.dict(os.environ, {"TRUSTED_PROXY_HOPS": "0"}):
+            self.assertEqual(auth.get_client_id(), "10.0.0.9")
+
+        self.get_instance.return_value.get_client.assert_called_with("s1")
+
+    def test_context_ip_preferred(self):
+        """Test st.context.ip_address is used where the Streamlit release provides it"""
+        with patch.object(auth.st, 'context', MagicMock(ip_address="192.0.2.5", headers={})):
+            self.assertEqual(auth.get_client_id(), "192.0.2.5")
+
+    def test_no_script_context(self):
+        """Test no client id outside a script run rather than an error"""
+        with patch('views.auth.get_script_run_ctx', return_value=None):
+            self.assertIsNone(auth.get_client_id())
+
+    def test_forwarded_header_ignored_without_proxy(self):
+        """Test a client-supplied X-Forwarded-For is ignored unless a trusted proxy is configured"""
+        with patch.dict(os.environ, {"TRUSTED_PROXY_HOPS": "0"}):
+            self.assertEqual(auth.get_client_id(), "10.0.0.9")
+
+    def test_rightmost_trusted_hop_used(self):
+        """Test the address appended by the trusted proxy is used, not the spoofable leftmost one"""
+        with patch.dict(os.environ, {"TRUSTED_PROXY_HOPS": "1"}):
+            self.assertEqual(auth.get_client_id(), "203.0.113.7")
+
+    def test_short_header_falls_back(self):
+        """Test a header with fewer entries than trusted hops falls back to the socket address"""
+        with patch.dict(os.environ, {"TRUSTED_PROXY_HOPS": "3"}):
+            self.assertEqual(auth.get_client_id(), "10.0.0.9")
+
+
+if __name__ == '__main__':
+    unittest.main()